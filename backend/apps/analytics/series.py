@@ -0,0 +1,226 @@
+"""
+Admin Analytics Time Series
+
+Submission and certificate counts bucketed by day, week or month. Counting
+and bucketing happen in the database (Trunc + GROUP BY, and a LAG window
+for status transition durations); Python only lays the aggregated rows out
+as column-oriented arrays the dashboard can chart directly:
+
+    {"buckets": ["2025-01-06", ...], "by_iso_standard": {"ISO_9001": [3, 0, ...], ...}}
+
+Results are cached for ANALYTICS_CACHE_TIMEOUT seconds.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, DateField, DurationField, ExpressionWrapper, F, Q, Window
+from django.db.models.functions import Lag, Trunc
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from apps.certificates.models import Certificate
+from apps.forms.models import FormSubmission, FormSubmissionLog
+
+ANALYTICS_CACHE_PREFIX = 'analytics'
+
+# Period -> default number of days covered when no range is given
+PERIODS = {
+    'day': 30,
+    'week': 182,
+    'month': 365,
+}
+MAX_BUCKETS = 1000
+
+SUBMISSION_GROUPS = {
+    'iso_standard': 'form_template__iso_standard',
+    'language': 'language',
+    'status': 'status',
+}
+
+
+class AnalyticsError(ValueError):
+    """Raised for analytics parameters that cannot be served"""
+
+
+def parse_range(params, ahead=False):
+    """
+    Read period, since and until from query parameters.
+
+    Without since/until the range ends today (or, with ahead, extends the
+    same span past today, for curves such as upcoming expiries).
+    """
+    period = params.get('period', 'day')
+    if period not in PERIODS:
+        raise AnalyticsError(f"period must be one of: {', '.join(PERIODS)}")
+
+    today = timezone.localdate()
+    span = timedelta(days=PERIODS[period] - 1)
+    since = _parse_param(params, 'since')
+    until = _parse_param(params, 'until')
+    if since is None and until is None:
+        since = today - span
+        until = today + span if ahead else today
+    elif since is None:
+        since = until - span
+    elif until is None:
+        until = since + span
+    if since > until:
+        raise AnalyticsError('since must not be after until')
+
+    if len(bucket_axis(period, since, until)) > MAX_BUCKETS:
+        raise AnalyticsError(f'Range covers more than {MAX_BUCKETS} {period} buckets')
+    return period, since, until
+
+
+def _parse_param(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise AnalyticsError(f'{name} must be a date (YYYY-MM-DD)')
+    return parsed
+
+
+def bucket_axis(period, since, until):
+    """Start date of every bucket between since and until"""
+    if period == 'week':
+        start = since - timedelta(days=since.weekday())
+    elif period == 'month':
+        start = since.replace(day=1)
+    else:
+        start = since
+
+    axis = []
+    while start <= until and len(axis) <= MAX_BUCKETS:
+        axis.append(start)
+        if period == 'month':
+            start = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+        else:
+            start += timedelta(days=7 if period == 'week' else 1)
+    return axis
+
+
+def _bucket(period, field):
+    return Trunc(field, period, output_field=DateField())
+
+
+def _pivot(rows, axis, group):
+    """Lay (bucket, group, count) rows out as one count array per group"""
+    index = {bucket: position for position, bucket in enumerate(axis)}
+    series = {}
+    for row in rows:
+        counts = series.setdefault(row[group] or '', [0] * len(axis))
+        position = index.get(row['bucket'])
+        if position is not None:
+            counts[position] += row['count']
+    return dict(sorted(series.items()))
+
+
+def _axis_labels(axis):
+    return [bucket.isoformat() for bucket in axis]
+
+
+def _datetime_range(since, until):
+    """Aware datetimes covering since..until inclusive, for indexed range filters"""
+    return (
+        timezone.make_aware(datetime.combine(since, time.min)),
+        timezone.make_aware(datetime.combine(until + timedelta(days=1), time.min)),
+    )
+
+
+def submission_series(period, since, until):
+    """Submissions per bucket, in total and by ISO standard, language and status"""
+    axis = bucket_axis(period, since, until)
+    start, end = _datetime_range(since, until)
+    submissions = FormSubmission.objects.order_by().filter(
+        submitted_at__gte=start,
+        submitted_at__lt=end,
+    ).annotate(bucket=_bucket(period, 'submitted_at'))
+
+    result = {'period': period, 'buckets': _axis_labels(axis)}
+    totals = [0] * len(axis)
+    for name, field in SUBMISSION_GROUPS.items():
+        series = _pivot(submissions.values('bucket', field).annotate(count=Count('id')), axis, field)
+        result[f'by_{name}'] = series
+        if name == 'status':
+            totals = [sum(counts) for counts in zip(totals, *series.values())]
+    result['total'] = totals
+    return result
+
+
+def transition_durations(since, until):
+    """
+    Time spent in a status before each transition, for submissions made
+    between since and until.
+
+    LAG over each submission's log gives the time of the previous change;
+    one aggregate query then averages the gaps per (from, to) pair.
+    """
+    statuses = FormSubmission.SubmissionStatus.values
+    pairs = [(a, b) for a in statuses for b in statuses if a != b]
+
+    start, end = _datetime_range(since, until)
+    logs = FormSubmissionLog.objects.filter(
+        submission__submitted_at__gte=start,
+        submission__submitted_at__lt=end,
+    ).annotate(
+        previous_at=Window(
+            Lag('created_at'),
+            partition_by=[F('submission_id')],
+            order_by=F('created_at').asc()
+        )
+    )
+    duration = ExpressionWrapper(F('created_at') - F('previous_at'), output_field=DurationField())
+
+    aggregates = {}
+    for position, (a, b) in enumerate(pairs):
+        transition = Q(previous_status=a, new_status=b, previous_at__isnull=False)
+        aggregates[f'count_{position}'] = Count('id', filter=transition)
+        aggregates[f'avg_{position}'] = Avg(duration, filter=transition)
+    values = logs.aggregate(**aggregates)
+
+    result = {'from': [], 'to': [], 'count': [], 'avg_seconds': []}
+    for position, (a, b) in enumerate(pairs):
+        if not values[f'count_{position}']:
+            continue
+        result['from'].append(a)
+        result['to'].append(b)
+        result['count'].append(values[f'count_{position}'])
+        result['avg_seconds'].append(round(values[f'avg_{position}'].total_seconds()))
+    return result
+
+
+def certificate_series(period, since, until):
+    """Certificates issued and expiring per bucket, by standard"""
+    axis = bucket_axis(period, since, until)
+    certificates = Certificate.objects.order_by()
+
+    issued = certificates.filter(first_issue_date__range=(since, until)).annotate(
+        bucket=_bucket(period, 'first_issue_date')
+    ).values('bucket', 'standard').annotate(count=Count('id'))
+    expiring = certificates.filter(expiry_date__range=(since, until)).annotate(
+        bucket=_bucket(period, 'expiry_date')
+    ).values('bucket', 'standard').annotate(count=Count('id'))
+
+    return {
+        'period': period,
+        'buckets': _axis_labels(axis),
+        'issued': _pivot(issued, axis, 'standard'),
+        'expiring': _pivot(expiring, axis, 'standard'),
+    }
+
+
+def cached(name, period, since, until, build):
+    """Return build()'s result, cached briefly under name and the resolved range"""
+    key = f'{ANALYTICS_CACHE_PREFIX}:{name}:{period}:{since.isoformat()}:{until.isoformat()}'
+    result = cache.get(key)
+    if result is None:
+        result = build()
+        cache.set(key, result, settings.ANALYTICS_CACHE_TIMEOUT)
+    return result
@@ -0,0 +1,112 @@
+from datetime import date, datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.forms.models import FormSubmission, FormSubmissionLog, FormTemplate, ISOStandard
+
+from .series import (
+    MAX_BUCKETS, AnalyticsError, bucket_axis, parse_range, submission_series, transition_durations
+)
+
+
+def at(day, hour=12):
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()) + timedelta(hours=hour))
+
+
+class BucketAxisTests(TestCase):
+    def test_weeks_start_on_monday(self):
+        axis = bucket_axis('week', date(2025, 1, 8), date(2025, 1, 20))
+
+        self.assertEqual(axis, [date(2025, 1, 6), date(2025, 1, 13), date(2025, 1, 20)])
+
+    def test_months_cross_the_year_end(self):
+        axis = bucket_axis('month', date(2024, 11, 15), date(2025, 2, 1))
+
+        self.assertEqual(axis, [date(2024, 11, 1), date(2024, 12, 1), date(2025, 1, 1), date(2025, 2, 1)])
+
+
+class ParseRangeTests(TestCase):
+    def test_defaults_to_the_period_span(self):
+        period, since, until = parse_range({'period': 'week'})
+
+        self.assertEqual(period, 'week')
+        self.assertEqual(until, timezone.localdate())
+        self.assertEqual(until - since, timedelta(days=181))
+
+    def test_invalid_parameters_are_rejected(self):
+        too_long = (date(2025, 1, 1) + timedelta(days=MAX_BUCKETS)).isoformat()
+        for params in (
+            {'period': 'year'},
+            {'since': '2025-13-01'},
+            {'since': '2025-02-01', 'until': '2025-01-01'},
+            {'since': '2025-01-01', 'until': too_long},
+        ):
+            with self.subTest(params=params), self.assertRaises(AnalyticsError):
+                parse_range(params)
+
+
+class SubmissionSeriesTests(TestCase):
+    def setUp(self):
+        self.form_template = FormTemplate.objects.create(name='ISO 9001', iso_standard=ISOStandard.ISO_9001)
+
+    def submit(self, day, language='en', **kwargs):
+        submission = FormSubmission.objects.create(
+            form_template=self.form_template, submitter_email='client@example.com',
+            submitter_name='Client', language=language, **kwargs
+        )
+        FormSubmission.objects.filter(pk=submission.pk).update(submitted_at=at(day))
+        return submission
+
+    def test_counts_are_pivoted_per_bucket(self):
+        self.submit(date(2025, 1, 7))
+        self.submit(date(2025, 1, 12), language='it')
+        self.submit(date(2025, 1, 13), language='it')
+
+        series = submission_series('week', date(2025, 1, 6), date(2025, 1, 19))
+
+        self.assertEqual(series['buckets'], ['2025-01-06', '2025-01-13'])
+        self.assertEqual(series['by_language'], {'en': [1, 0], 'it': [1, 1]})
+        self.assertEqual(series['by_iso_standard'], {'ISO_9001': [2, 1]})
+        self.assertEqual(series['total'], [2, 1])
+
+    def test_transition_durations(self):
+        submission = self.submit(date(2025, 1, 7))
+        for hour, previous, new in ((9, '', 'PENDING'), (11, 'PENDING', 'UNDER_REVIEW')):
+            log = FormSubmissionLog.objects.create(
+                submission=submission, previous_status=previous, new_status=new
+            )
+            FormSubmissionLog.objects.filter(pk=log.pk).update(created_at=at(date(2025, 1, 7), hour))
+
+        durations = transition_durations(date(2025, 1, 1), date(2025, 1, 31))
+
+        self.assertEqual(durations, {
+            'from': ['PENDING'], 'to': ['UNDER_REVIEW'], 'count': [1], 'avg_seconds': [7200],
+        })
+
+
+class AnalyticsViewTests(TestCase):
+    URL = '/api/analytics/submissions/'
+
+    def test_admin_only(self):
+        client = APIClient()
+        self.assertIn(client.get(self.URL).status_code, (401, 403))
+
+        client.force_authenticate(get_user_model().objects.create_user('staff'))
+        self.assertEqual(client.get(self.URL).status_code, 403)
+
+        client.force_authenticate(get_user_model().objects.create_user('admin', is_staff=True))
+        response = client.get(self.URL, {'period': 'month'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['buckets']), len(response.data['total']))
+
+    def test_bad_range_is_a_400(self):
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create_user('admin', is_staff=True))
+
+        response = client.get(self.URL, {'since': '2025-02-01', 'until': '2025-01-01'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('since', response.data['error'])
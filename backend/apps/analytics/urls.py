@@ -0,0 +1,10 @@
+from django.urls import path
+from . import views
+
+app_name = 'analytics'
+
+urlpatterns = [
+    # Admin analytics endpoints: /api/analytics/...
+    path('submissions/', views.submissions, name='submissions'),
+    path('certificates/', views.certificates, name='certificates'),
+]
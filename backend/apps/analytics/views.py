@@ -0,0 +1,60 @@
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from .series import (
+    AnalyticsError, cached, certificate_series, parse_range,
+    submission_series, transition_durations
+)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def submissions(request):
+    """
+    Submissions over time and status transition durations
+
+    GET /api/analytics/submissions/?period=week&since=2025-01-01&until=2025-06-30
+    Headers: Authorization: Token <admin_token>
+
+    period is day (default), week or month; the range defaults to the last
+    30 days, 26 weeks or 12 months.
+    """
+    try:
+        period, since, until = parse_range(request.query_params)
+    except AnalyticsError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    def build():
+        return {
+            **submission_series(period, since, until),
+            'since': since,
+            'until': until,
+            'transitions': transition_durations(since, until),
+        }
+
+    return Response(cached('submissions', period, since, until, build))
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def certificates(request):
+    """
+    Certificate issuance and expiry curves by standard
+
+    GET /api/analytics/certificates/?period=month
+    Headers: Authorization: Token <admin_token>
+
+    Without since/until the range reaches as far ahead of today as it goes
+    back, so upcoming expiries are included.
+    """
+    try:
+        period, since, until = parse_range(request.query_params, ahead=True)
+    except AnalyticsError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    def build():
+        return {**certificate_series(period, since, until), 'since': since, 'until': until}
+
+    return Response(cached('certificates', period, since, until, build))
@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import BlogCategory, BlogPost
+from .cache import bump_blog_version
+from .models import BlogCategory, BlogPost, BlogTag
 
 
 @admin.register(BlogCategory)
@@ -14,6 +15,17 @@ class BlogCategoryAdmin(admin.ModelAdmin):
     posts_count.short_description = 'Posts'
 
 
+@admin.register(BlogTag)
+class BlogTagAdmin(admin.ModelAdmin):
+    list_display = ['name', 'slug', 'posts_count']
+    search_fields = ['name', 'slug']
+    prepopulated_fields = {'slug': ('name',)}
+
+    def posts_count(self, obj):
+        return obj.posts.count()
+    posts_count.short_description = 'Posts'
+
+
 @admin.register(BlogPost)
 class BlogPostAdmin(admin.ModelAdmin):
     list_display = ['title', 'category', 'author', 'status_badge', 'published_at', 'view_count']
@@ -80,14 +92,18 @@ class BlogPostAdmin(admin.ModelAdmin):
             status='PUBLISHED',
             published_at=timezone.now()
         )
+        # .update() skips the signal handlers that invalidate the public cache
+        bump_blog_version()
         self.message_user(request, f'{count} post(s) published.')
 
     @admin.action(description='Archive selected posts')
     def archive_posts(self, request, queryset):
         count = queryset.exclude(status='ARCHIVED').update(status='ARCHIVED')
+        bump_blog_version()
         self.message_user(request, f'{count} post(s) archived.')
 
     @admin.action(description='Set selected posts to draft')
     def draft_posts(self, request, queryset):
         count = queryset.exclude(status='DRAFT').update(status='DRAFT')
+        bump_blog_version()
         self.message_user(request, f'{count} post(s) set to draft.')
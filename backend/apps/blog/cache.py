@@ -0,0 +1,53 @@
+"""
+Public Blog Response Cache
+
+The public listing endpoints (post list, featured, by_tag, the tag cloud
+and categories) serve the same pages to every visitor while posts change a
+few times a week. Their serialized payloads are cached per endpoint, query
+string and host under a blog version that signals.py bumps whenever a
+post, category or tag is saved or deleted; bumping it orphans every cached
+page at once.
+
+Responses carry X-Cache: HIT or MISS, which the nginx access log records.
+View counts in cached listings lag by up to BLOG_CACHE_TIMEOUT seconds.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+BLOG_CACHE_PREFIX = 'blog:api'
+BLOG_VERSION_KEY = 'blog:api:version'
+
+
+def blog_version():
+    # Versions are timestamps, so one recreated after an eviction can
+    # never match keys written under an earlier version
+    version = cache.get(BLOG_VERSION_KEY)
+    if version is None:
+        cache.add(BLOG_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(BLOG_VERSION_KEY)
+    return version
+
+
+def bump_blog_version():
+    cache.set(BLOG_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def get_blog_payload(name, build):
+    """
+    Return (payload, hit) for the named page under the current version.
+
+    build() produces the payload on a miss; exceptions it raises (a 404 for
+    a page past the end, say) propagate and nothing is cached.
+    """
+    # Names carry query strings and hosts, so they are hashed into a safe key
+    key = f'{BLOG_CACHE_PREFIX}:{blog_version()}:{hashlib.sha256(name.encode()).hexdigest()}'
+    payload = cache.get(key)
+    if payload is not None:
+        return payload, True
+    payload = build()
+    cache.set(key, payload, settings.BLOG_CACHE_TIMEOUT)
+    return payload, False
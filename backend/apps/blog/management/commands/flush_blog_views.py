@@ -0,0 +1,14 @@
+"""
+Management command to write buffered blog views to the database.
+Run with: python manage.py flush_blog_views (e.g. every minute from cron)
+"""
+from django.core.management.base import BaseCommand
+from apps.blog.view_counter import flush_view_counts
+
+
+class Command(BaseCommand):
+    help = 'Adds the view counts buffered in the cache to BlogPost.view_count'
+
+    def handle(self, *args, **options):
+        flushed = flush_view_counts()
+        self.stdout.write(self.style.SUCCESS(f'Flushed {flushed} blog view(s)'))
@@ -0,0 +1,15 @@
+"""
+Management command to recompute the full-text search vectors of all blog posts.
+Run with: python manage.py rebuild_blog_search
+"""
+from django.core.management.base import BaseCommand
+from apps.blog.models import BlogPost
+from apps.blog.search import update_search_vectors
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the search vectors of every blog post in one UPDATE'
+
+    def handle(self, *args, **options):
+        updated = update_search_vectors(BlogPost.objects.all())
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt search vectors for {updated} blog post(s)'))
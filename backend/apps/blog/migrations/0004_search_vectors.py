@@ -0,0 +1,91 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import UnaccentExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+SEARCH_CONFIGS = {
+    'en': 'english',
+    'sq': 'albanian_unaccent',
+    'it': 'italian',
+}
+
+
+def create_albanian_config(apps, schema_editor):
+    """
+    Albanian has no stemmer; use the simple configuration with unaccent, so
+    words typed without ë or ç still match
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE TEXT SEARCH CONFIGURATION albanian_unaccent (COPY = simple)')
+    schema_editor.execute(
+        'ALTER TEXT SEARCH CONFIGURATION albanian_unaccent '
+        'ALTER MAPPING FOR hword, hword_part, word WITH unaccent, simple'
+    )
+
+
+def drop_albanian_config(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP TEXT SEARCH CONFIGURATION IF EXISTS albanian_unaccent')
+
+
+def build_search_vectors(apps, schema_editor):
+    """
+    Fill the search vectors of the existing posts
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    vectors = {}
+    for language, config in SEARCH_CONFIGS.items():
+        suffix = '' if language == 'en' else f'_{language}'
+        vectors[f'search_{language}'] = (
+            SearchVector(f'title{suffix}', weight='A', config=config)
+            + SearchVector(f'excerpt{suffix}', 'tags', weight='B', config=config)
+            + SearchVector(f'content{suffix}', weight='C', config=config)
+        )
+    BlogPost.objects.update(**vectors)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_add_featured_image_static'),
+    ]
+
+    operations = [
+        UnaccentExtension(),
+        migrations.RunPython(create_albanian_config, drop_albanian_config),
+        migrations.AddField(
+            model_name='blogpost',
+            name='search_en',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='search_it',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='search_sq',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_en'], name='blog_post_search_en_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_sq'], name='blog_post_search_sq_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_it'], name='blog_post_search_it_gin'),
+        ),
+        migrations.RunPython(build_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:06
+
+import uuid
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def backfill_tags(apps, schema_editor):
+    """
+    Create a tag for every distinct tag in BlogPost.tags and link the posts
+    """
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    BlogTag = apps.get_model('blog', 'BlogTag')
+    PostTag = BlogPost.tag_set.through
+
+    tags = {}
+    links = []
+    for post_id, value in BlogPost.objects.values_list('id', 'tags'):
+        slugs = []
+        for name in (value or '').split(','):
+            name = name.strip()
+            slug = slugify(name)[:100]
+            if slug and slug not in slugs:
+                tags.setdefault(slug, BlogTag(slug=slug, name=name[:100]))
+                slugs.append(slug)
+        links.extend((post_id, slug) for slug in slugs)
+
+    BlogTag.objects.bulk_create(tags.values(), batch_size=1000)
+    PostTag.objects.bulk_create([
+        PostTag(blogpost_id=post_id, blogtag_id=tags[slug].id)
+        for post_id, slug in links
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_search_vectors'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogTag',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.SlugField(max_length=100, unique=True)),
+            ],
+            options={
+                'verbose_name': 'Tag',
+                'verbose_name_plural': 'Tags',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='tag_set',
+            field=models.ManyToManyField(blank=True, editable=False, related_name='posts', to='blog.blogtag'),
+        ),
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+    ]
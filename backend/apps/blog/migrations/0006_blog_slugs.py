@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:07
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+def backfill_slugs(apps, schema_editor):
+    """
+    Register the current slugs of every post; the first post keeps a shared slug
+    """
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    BlogSlug = apps.get_model('blog', 'BlogSlug')
+
+    slugs = {}
+    posts = BlogPost.objects.order_by('created_at').values_list('id', 'slug', 'slug_sq', 'slug_it')
+    for post_id, *values in posts:
+        for language, slug in zip(('en', 'sq', 'it'), values):
+            if slug and slug not in slugs:
+                slugs[slug] = BlogSlug(slug=slug, language=language, post_id=post_id)
+    BlogSlug.objects.bulk_create(slugs.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_blog_tags'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogSlug',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('slug', models.SlugField(max_length=255, unique=True)),
+                ('language', models.CharField(choices=[('en', 'English'), ('sq', 'Albanian'), ('it', 'Italian')], max_length=2)),
+                ('is_current', models.BooleanField(default=True, help_text='False for slugs the post no longer uses')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slugs', to='blog.blogpost')),
+            ],
+            options={
+                'verbose_name': 'Slug',
+                'verbose_name_plural': 'Slugs',
+                'ordering': ['post', 'language', '-is_current'],
+            },
+        ),
+        migrations.RunPython(backfill_slugs, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,7 @@
 import uuid
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils.text import slugify
 from django.utils import timezone
@@ -30,6 +33,27 @@ class BlogCategory(models.Model):
         super().save(*args, **kwargs)
 
 
+class BlogTag(models.Model):
+    """Normalized tag, kept in sync with the comma-separated BlogPost.tags"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    name = models.CharField(max_length=100)
+    slug = models.SlugField(max_length=100, unique=True)
+
+    class Meta:
+        verbose_name = 'Tag'
+        verbose_name_plural = 'Tags'
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = slugify(self.name)
+        super().save(*args, **kwargs)
+
+
 class BlogPost(models.Model):
     """Blog posts with multi-language support"""
 
@@ -81,6 +105,7 @@ class BlogPost(models.Model):
         related_name='posts'
     )
     tags = models.CharField(max_length=255, blank=True, help_text="Comma-separated tags")
+    tag_set = models.ManyToManyField(BlogTag, related_name='posts', blank=True, editable=False)
 
     # Meta
     author = models.CharField(max_length=100, default="MSC Certifications")
@@ -103,6 +128,11 @@ class BlogPost(models.Model):
     # Stats
     view_count = models.PositiveIntegerField(default=0)
 
+    # Full-text search documents per language, kept up to date by apps.blog.search
+    search_en = SearchVectorField(null=True, editable=False)
+    search_sq = SearchVectorField(null=True, editable=False)
+    search_it = SearchVectorField(null=True, editable=False)
+
     class Meta:
         verbose_name = 'Blog Post'
         verbose_name_plural = 'Blog Posts'
@@ -110,11 +140,34 @@ class BlogPost(models.Model):
         indexes = [
             models.Index(fields=['status', 'published_at']),
             models.Index(fields=['slug']),
+            GinIndex(fields=['search_en'], name='blog_post_search_en_gin'),
+            GinIndex(fields=['search_sq'], name='blog_post_search_sq_gin'),
+            GinIndex(fields=['search_it'], name='blog_post_search_it_gin'),
         ]
 
     def __str__(self):
         return self.title
 
+    def clean(self):
+        """
+        Reject slugs another post currently uses; sync_post_slugs() would
+        leave them with that post and this one unreachable by them
+        """
+        super().clean()
+
+        slugs = {field: getattr(self, field) for field in ('slug', 'slug_sq', 'slug_it') if getattr(self, field)}
+        taken = set(
+            BlogSlug.objects.filter(slug__in=slugs.values(), is_current=True)
+            .exclude(post_id=self.pk)
+            .values_list('slug', flat=True)
+        )
+        errors = {
+            field: f'"{slug}" is already used by another post.'
+            for field, slug in slugs.items() if slug in taken
+        }
+        if errors:
+            raise ValidationError(errors)
+
     def save(self, *args, **kwargs):
         # Auto-generate slug from title
         if not self.slug:
@@ -135,3 +188,33 @@ class BlogPost(models.Model):
         if self.tags:
             return [tag.strip() for tag in self.tags.split(',') if tag.strip()]
         return []
+
+
+class BlogSlug(models.Model):
+    """
+    Every slug a post has had, in any language. Detail URLs are resolved
+    here with one unique-index probe; old slugs keep resolving after a
+    post is renamed.
+    """
+
+    class Language(models.TextChoices):
+        EN = 'en', 'English'
+        SQ = 'sq', 'Albanian'
+        IT = 'it', 'Italian'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    slug = models.SlugField(max_length=255, unique=True)
+    language = models.CharField(max_length=2, choices=Language.choices)
+    post = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='slugs')
+    is_current = models.BooleanField(default=True, help_text="False for slugs the post no longer uses")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Slug'
+        verbose_name_plural = 'Slugs'
+        ordering = ['post', 'language', '-is_current']
+
+    def __str__(self):
+        return self.slug
@@ -0,0 +1,79 @@
+"""
+Blog Full-Text Search
+
+Every post keeps one tsvector per language (search_en, search_sq,
+search_it), each behind a GIN index. Titles weigh most, then excerpt and
+tags, then content. Albanian uses the albanian_unaccent configuration
+(simple + unaccent, created in migration 0004), so "eshte" finds "është".
+
+The vectors are rewritten by the post_save handler in signals.py;
+`manage.py rebuild_blog_search` refreshes them all after bulk changes.
+"""
+
+import logging
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, Func, Value
+
+logger = logging.getLogger(__name__)
+
+# Language -> PostgreSQL text search configuration
+SEARCH_CONFIGS = {
+    'en': 'english',
+    'sq': 'albanian_unaccent',
+    'it': 'italian',
+}
+
+
+def _field(name, language):
+    return name if language == 'en' else f'{name}_{language}'
+
+
+def search_vector(language):
+    """Weighted document of a post in one language"""
+    config = SEARCH_CONFIGS[language]
+    return (
+        SearchVector(_field('title', language), weight='A', config=config)
+        + SearchVector(_field('excerpt', language), 'tags', weight='B', config=config)
+        + SearchVector(_field('content', language), weight='C', config=config)
+    )
+
+
+def update_search_vectors(queryset):
+    """Recompute the search vectors of every post in queryset with one UPDATE"""
+    if connection.vendor != 'postgresql':
+        return 0
+    return queryset.update(**{
+        f'search_{language}': search_vector(language) for language in SEARCH_CONFIGS
+    })
+
+
+def _plain_text(field):
+    # Content is HTML; snippets are built from the text only
+    return Func(F(field), Value('<[^>]+>'), Value(' '), Value('g'), function='regexp_replace')
+
+
+def search_posts(queryset, query, language='en'):
+    """
+    Posts in queryset matching query (web search syntax: quoted phrases,
+    OR, -exclusion), best match first, annotated with rank and a headline
+    with the matches wrapped in <mark>.
+    """
+    config = SEARCH_CONFIGS[language]
+    vector = f'search_{language}'
+    search_query = SearchQuery(query, config=config, search_type='websearch')
+
+    return queryset.filter(**{vector: search_query}).annotate(
+        rank=SearchRank(F(vector), search_query),
+        headline=SearchHeadline(
+            _plain_text(_field('content', language)),
+            search_query,
+            config=config,
+            start_sel='<mark>',
+            stop_sel='</mark>',
+            max_words=35,
+            min_words=15,
+            max_fragments=2,
+        ),
+    ).order_by('-rank', '-published_at')
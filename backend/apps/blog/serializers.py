@@ -42,6 +42,15 @@ class BlogPostListSerializer(serializers.ModelSerializer):
         return None
 
 
+class BlogPostSearchSerializer(BlogPostListSerializer):
+    """Search result: a listing entry with its rank and highlighted snippet"""
+    rank = serializers.FloatField(read_only=True)
+    headline = serializers.CharField(read_only=True)
+
+    class Meta(BlogPostListSerializer.Meta):
+        fields = BlogPostListSerializer.Meta.fields + ['rank', 'headline']
+
+
 class BlogPostDetailSerializer(serializers.ModelSerializer):
     """Full serializer for blog post detail view"""
     category = BlogCategorySerializer(read_only=True)
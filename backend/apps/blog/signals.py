@@ -0,0 +1,46 @@
+"""
+Signal handlers keeping the blog search vectors, normalized tags and slug
+lookup table in sync with the posts, and invalidating the public response
+cache on any post, category or tag change.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_blog_version
+from .models import BlogCategory, BlogPost, BlogTag
+from .search import update_search_vectors
+from .slugs import sync_post_slugs
+from .tags import sync_post_tags
+
+
+@receiver(post_save, sender=BlogPost)
+def refresh_search_vectors(sender, instance, raw=False, **kwargs):
+    # Computed by the database from the saved row, so one extra UPDATE
+    if not raw:
+        update_search_vectors(BlogPost.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=BlogPost)
+def refresh_tags(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sync_post_tags(instance)
+
+
+@receiver(post_save, sender=BlogPost)
+def refresh_slugs(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sync_post_slugs(instance)
+
+
+# Registered last, so the handlers above have run before the bump
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_save, sender=BlogCategory)
+@receiver(post_delete, sender=BlogCategory)
+@receiver(post_save, sender=BlogTag)
+@receiver(post_delete, sender=BlogTag)
+def invalidate_blog_cache(sender, **kwargs):
+    # On commit, so no request caches a page without the change
+    transaction.on_commit(bump_blog_version)
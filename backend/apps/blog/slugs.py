@@ -0,0 +1,78 @@
+"""
+Blog Slug Resolution
+
+BlogSlug holds every slug of every post (slug, slug_sq, slug_it and the
+ones they replaced), so a detail URL in any language is one probe of its
+unique index. sync_post_slugs() runs after every save: new slugs are added,
+slugs the post stopped using are kept but marked not current.
+
+A slug belongs to one post. A post's current slug takes over another
+post's old slug; if two posts claim the same current slug, the first
+one keeps it. BlogPost.clean() rejects such a slug, so the admin reports
+the clash instead of saving a post that cannot be reached by it.
+"""
+
+import logging
+
+from django.db.models import Q
+
+from .models import BlogSlug
+
+logger = logging.getLogger(__name__)
+
+# Language -> BlogPost slug field
+SLUG_FIELDS = {
+    BlogSlug.Language.EN: 'slug',
+    BlogSlug.Language.SQ: 'slug_sq',
+    BlogSlug.Language.IT: 'slug_it',
+}
+
+
+def current_slugs(post):
+    """{slug: language} of the slugs post uses now; the first language wins a shared slug"""
+    slugs = {}
+    for language, field in SLUG_FIELDS.items():
+        value = getattr(post, field)
+        if value and value not in slugs:
+            slugs[value] = language
+    return slugs
+
+
+def canonical_slug(post, language):
+    """The slug post uses now in language, falling back to the English one"""
+    return getattr(post, SLUG_FIELDS[language]) or post.slug
+
+
+def sync_post_slugs(post):
+    """Bring post's BlogSlug rows in line with its slug fields"""
+    wanted = current_slugs(post)
+    rows = {
+        row.slug: row
+        for row in BlogSlug.objects.filter(Q(post=post) | Q(slug__in=wanted))
+    }
+
+    to_create = []
+    to_update = []
+    for row in rows.values():
+        if row.post_id == post.pk and row.is_current and row.slug not in wanted:
+            row.is_current = False
+            to_update.append(row)
+
+    for slug, language in wanted.items():
+        row = rows.get(slug)
+        if row is None:
+            to_create.append(BlogSlug(slug=slug, language=language, post=post))
+        elif row.post_id == post.pk:
+            if not row.is_current or row.language != language:
+                row.is_current, row.language = True, language
+                to_update.append(row)
+        elif not row.is_current:
+            row.post, row.language, row.is_current = post, language, True
+            to_update.append(row)
+        else:
+            logger.warning(f"Blog slug '{slug}' is already used by post {row.post_id}")
+
+    if to_create:
+        BlogSlug.objects.bulk_create(to_create)
+    if to_update:
+        BlogSlug.objects.bulk_update(to_update, ['post', 'language', 'is_current'])
@@ -0,0 +1,49 @@
+"""
+Blog Tags
+
+BlogPost.tags stays the comma-separated text editors type; every save
+mirrors it into BlogTag rows linked through BlogPost.tag_set. Tags are
+matched by slug, so "ISO 27001", "iso 27001" and "ISO-27001" are one tag,
+and lookups are exact and indexed instead of substring scans.
+"""
+
+from django.db.models import Count
+from django.utils.text import slugify
+
+from .models import BlogPost, BlogTag
+
+
+def parse_tags(value):
+    """Tags in a comma-separated string, as an ordered {slug: name} dict"""
+    tags = {}
+    for name in (value or '').split(','):
+        name = name.strip()
+        slug = slugify(name)[:100]
+        if slug and slug not in tags:
+            tags[slug] = name[:100]
+    return tags
+
+
+def sync_post_tags(post):
+    """Point post.tag_set at the tags in post.tags, creating missing ones"""
+    wanted = parse_tags(post.tags)
+    existing = list(BlogTag.objects.filter(slug__in=wanted))
+    missing = wanted.keys() - {tag.slug for tag in existing}
+    if missing:
+        # ignore_conflicts: another post may create the same tag concurrently
+        BlogTag.objects.bulk_create(
+            [BlogTag(slug=slug, name=wanted[slug]) for slug in missing],
+            ignore_conflicts=True
+        )
+        existing = list(BlogTag.objects.filter(slug__in=wanted))
+    post.tag_set.set(existing)
+
+
+def tag_cloud():
+    """Tags of published posts with their post counts, most used first"""
+    return list(
+        BlogTag.objects.filter(posts__status=BlogPost.Status.PUBLISHED)
+        .annotate(count=Count('posts'))
+        .order_by('-count', 'name')
+        .values('name', 'slug', 'count')
+    )
@@ -0,0 +1,281 @@
+import importlib
+from unittest import mock, skipUnless
+
+from django.apps import apps
+from django.contrib import admin
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from .cache import blog_version
+from .models import BlogCategory, BlogPost, BlogTag
+from .tags import tag_cloud
+from .view_counter import flush_view_counts, pending_views, record_view
+
+TEST_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ViewCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.post = BlogPost.objects.create(
+            title='ISO 9001 Explained',
+            content='<p>Quality</p>',
+            status=BlogPost.Status.PUBLISHED,
+            view_count=10,
+        )
+
+    def test_record_view_buffers_without_touching_the_row(self):
+        self.assertEqual(record_view(self.post.pk), 1)
+        self.assertEqual(record_view(self.post.pk), 2)
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 10)
+        self.assertEqual(pending_views([self.post.pk]), {self.post.pk: 2})
+
+    def test_detail_returns_live_count(self):
+        client = APIClient()
+        client.get(f'/api/blog/posts/{self.post.slug}/')
+        response = client.get(f'/api/blog/posts/{self.post.slug}/')
+
+        self.assertEqual(response.data['view_count'], 12)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 10)
+
+    def test_flush_moves_buffered_views_to_the_row(self):
+        record_view(self.post.pk)
+        record_view(self.post.pk)
+
+        self.assertEqual(flush_view_counts(), 2)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 12)
+        self.assertEqual(pending_views([self.post.pk]), {})
+        self.assertEqual(flush_view_counts(), 0)
+
+    def test_flush_resets_other_counters_when_one_vanishes(self):
+        other = BlogPost.objects.create(title='ISO 14001', content='<p>Environment</p>')
+        record_view(self.post.pk)
+        record_view(other.pk)
+
+        real_incr = cache.incr
+
+        def incr(key, delta=1):
+            # The first post's counter is culled between the read and the reset
+            if delta < 0 and str(self.post.pk) in key:
+                raise ValueError(key)
+            return real_incr(key, delta)
+
+        with mock.patch.object(cache, 'incr', side_effect=incr):
+            self.assertEqual(flush_view_counts(), 2)
+
+        other.refresh_from_db()
+        self.assertEqual(other.view_count, 1)
+        self.assertEqual(pending_views([other.pk]), {})
+
+
+class BlogSearchTests(TestCase):
+    URL = '/api/blog/posts/search/'
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_query_is_required(self):
+        response = self.client.get(self.URL, {'q': '  '})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('q', response.data['error'])
+
+    def test_unknown_language_is_rejected(self):
+        response = self.client.get(self.URL, {'q': 'audit', 'lang': 'de'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('lang', response.data['error'])
+
+    @skipUnless(connection.vendor == 'postgresql', 'full-text search needs PostgreSQL')
+    def test_search_ranks_and_highlights(self):
+        BlogPost.objects.create(
+            title='Internal audits', content='<p>How an audit is planned</p>', status=BlogPost.Status.PUBLISHED,
+        )
+        BlogPost.objects.create(
+            title='ISO 9001 Explained', content='<p>Mentions an audit once</p>', status=BlogPost.Status.PUBLISHED,
+        )
+        BlogPost.objects.create(title='Audit draft', content='<p>Audit</p>')
+        BlogPost.objects.create(
+            title='Auditimi', title_sq='Auditimi', content_sq='<p>Çfarë është një auditim</p>',
+            status=BlogPost.Status.PUBLISHED,
+        )
+
+        response = self.client.get(self.URL, {'q': 'audit'})
+
+        titles = [post['title'] for post in response.data['results']]
+        self.assertEqual(titles, ['Internal audits', 'ISO 9001 Explained'])
+        self.assertIn('<mark>', response.data['results'][0]['headline'])
+
+        response = self.client.get(self.URL, {'q': 'eshte', 'lang': 'sq'})
+        self.assertEqual([post['title'] for post in response.data['results']], ['Auditimi'])
+
+
+@override_settings(CACHES=TEST_CACHES)
+class BlogTagTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def post(self, title, tags, status=BlogPost.Status.PUBLISHED):
+        return BlogPost.objects.create(title=title, content='<p>Body</p>', tags=tags, status=status)
+
+    def by_tag(self, tag):
+        response = self.client.get('/api/blog/posts/by_tag/', {'tag': tag})
+        return sorted(post['title'] for post in response.data['results'])
+
+    def test_spellings_of_a_tag_are_one_tag(self):
+        self.post('Annex A', 'ISO 27001, Security')
+        self.post('Controls', 'iso-27001')
+
+        self.assertEqual(BlogTag.objects.filter(slug='iso-27001').count(), 1)
+        self.assertEqual(self.by_tag('ISO 27001'), ['Annex A', 'Controls'])
+        self.assertEqual(self.by_tag('iso-27001'), ['Annex A', 'Controls'])
+
+    def test_tags_match_exactly(self):
+        self.post('Annex A', 'ISO 27001')
+        self.post('Basics', 'ISO')
+
+        self.assertEqual(self.by_tag('iso'), ['Basics'])
+
+    def test_cloud_counts_published_posts_only(self):
+        self.post('Annex A', 'ISO 27001, Security')
+        self.post('Controls', 'ISO 27001')
+        self.post('Draft', 'ISO 27001, Drafts', status=BlogPost.Status.DRAFT)
+
+        self.assertEqual(tag_cloud(), [
+            {'name': 'ISO 27001', 'slug': 'iso-27001', 'count': 2},
+            {'name': 'Security', 'slug': 'security', 'count': 1},
+        ])
+
+    def test_migration_backfills_existing_tags(self):
+        annex = self.post('Annex A', 'ISO 27001, Security')
+        controls = self.post('Controls', 'iso-27001,, ')
+        BlogTag.objects.all().delete()
+
+        migration = importlib.import_module('apps.blog.migrations.0005_blog_tags')
+        migration.backfill_tags(apps, None)
+
+        self.assertEqual(sorted(BlogTag.objects.values_list('slug', flat=True)), ['iso-27001', 'security'])
+        self.assertEqual(sorted(annex.tag_set.values_list('slug', flat=True)), ['iso-27001', 'security'])
+        self.assertEqual(list(controls.tag_set.values_list('slug', flat=True)), ['iso-27001'])
+
+
+@override_settings(CACHES=TEST_CACHES)
+class BlogSlugTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.post = BlogPost.objects.create(
+            title='ISO 9001', slug='iso-9001', slug_sq='iso-9001-sq', slug_it='iso-9001-it',
+            content='<p>Quality</p>', status=BlogPost.Status.PUBLISHED,
+        )
+
+    def get(self, slug):
+        return self.client.get(f'/api/blog/posts/{slug}/')
+
+    def test_every_language_slug_resolves(self):
+        for slug in ('iso-9001', 'iso-9001-sq', 'iso-9001-it'):
+            with self.subTest(slug=slug):
+                response = self.get(slug)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data['id'], str(self.post.pk))
+                self.assertNotIn('X-Canonical-Slug', response)
+
+    def test_renamed_post_keeps_its_old_slug(self):
+        self.post.slug_sq = 'iso-9001-shqip'
+        self.post.save()
+
+        response = self.get('iso-9001-sq')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Canonical-Slug'], 'iso-9001-shqip')
+        self.assertNotIn('X-Canonical-Slug', self.get('iso-9001-shqip'))
+
+    def test_slug_used_by_another_post_is_rejected(self):
+        other = BlogPost(title='ISO 9001 Again', slug='iso-9001-again', slug_it='iso-9001-sq', content='<p>x</p>')
+
+        with self.assertRaises(ValidationError) as raised:
+            other.full_clean()
+        self.assertEqual(list(raised.exception.message_dict), ['slug_it'])
+
+        # Saved anyway (no clean), the first post keeps the slug
+        other.status = BlogPost.Status.PUBLISHED
+        other.save()
+        self.assertEqual(self.get('iso-9001-sq').data['id'], str(self.post.pk))
+
+    def test_old_slug_can_be_reused(self):
+        self.post.slug_it = 'iso-9001-italiano'
+        self.post.save()
+
+        other = BlogPost(title='Other', slug='other', slug_it='iso-9001-it', content='<p>x</p>')
+        other.full_clean()
+        other.status = BlogPost.Status.PUBLISHED
+        other.save()
+
+        self.assertEqual(self.get('iso-9001-it').data['id'], str(other.pk))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class BlogResponseCacheTests(TestCase):
+    URL = '/api/blog/posts/'
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.post = BlogPost.objects.create(
+            title='ISO 9001', content='<p>Quality</p>', status=BlogPost.Status.PUBLISHED,
+        )
+
+    def test_second_request_is_a_hit(self):
+        first = self.client.get(self.URL)
+        second = self.client.get(self.URL)
+
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(self.client.get(self.URL, {'page': 1})['X-Cache'], 'MISS')
+
+    def test_saves_bump_the_version(self):
+        category = BlogCategory.objects.create(name='Quality', slug='quality')
+        tag = BlogTag.objects.create(name='ISO 9001', slug='iso-9001')
+        for instance in (self.post, category, tag):
+            with self.subTest(model=type(instance).__name__):
+                version = blog_version()
+                with self.captureOnCommitCallbacks(execute=True):
+                    instance.save()
+                self.assertNotEqual(blog_version(), version)
+
+    def test_saved_post_is_served_fresh(self):
+        self.client.get(self.URL)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.title = 'ISO 9001:2015'
+            self.post.save()
+
+        response = self.client.get(self.URL)
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['title'], 'ISO 9001:2015')
+
+    def test_admin_bulk_actions_bump_the_version(self):
+        model_admin = admin.site._registry[BlogPost]
+        for action in ('draft_posts', 'publish_posts', 'archive_posts'):
+            with self.subTest(action=action), mock.patch.object(model_admin, 'message_user'):
+                version = blog_version()
+                getattr(model_admin, action)(None, BlogPost.objects.all())
+                self.assertNotEqual(blog_version(), version)
+
+    def test_missing_page_is_not_cached(self):
+        with mock.patch('apps.blog.cache.cache.set') as cache_set:
+            response = self.client.get(self.URL, {'page': 2})
+
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('X-Cache', response)
+        cache_set.assert_not_called()
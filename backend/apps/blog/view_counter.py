@@ -0,0 +1,124 @@
+"""
+Blog View Counter
+
+Page views are counted in the cache instead of the blog_blogpost row: each
+view is one cache.incr(), and flush_view_counts() moves the accumulated
+counts into BlogPost.view_count with a single UPDATE. It is run by
+`manage.py flush_blog_views` or by the in-process flusher
+(BLOG_VIEW_FLUSH_INTERVAL).
+
+Counts are approximate by design: with the file-based cache incr() is not
+atomic across processes, so concurrent views of one post can be lost. Use
+a Redis or Memcached CACHE_BACKEND where exact counts matter.
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Case, F, IntegerField, Value, When
+
+from .models import BlogPost
+
+logger = logging.getLogger(__name__)
+
+VIEW_KEY_PREFIX = 'blog:views'
+FLUSH_LOCK_KEY = 'blog:views:flush:lock'
+
+_flusher = None
+
+
+def _view_key(post_id):
+    return f'{VIEW_KEY_PREFIX}:{post_id}'
+
+
+def _add_views(post_id, delta):
+    """
+    Add delta to a post's buffered views; returns the new count, or None
+    when subtracting from a counter that is gone (expired or culled).
+    """
+    key = _view_key(post_id)
+    try:
+        count = cache.incr(key, delta)
+    except ValueError:
+        if delta < 0:
+            return None
+        cache.add(key, 0, timeout=None)
+        count = cache.incr(key, delta)
+    # Backends without a native incr() (file-based, locmem) rewrite the
+    # value with the default timeout; unflushed views must not expire
+    cache.touch(key, None)
+    return count
+
+
+def record_view(post_id):
+    """Count one view of a post; returns the views not yet flushed"""
+    return _add_views(post_id, 1)
+
+
+def pending_views(post_ids):
+    """Unflushed view counts of the given posts, by post id"""
+    keys = {_view_key(post_id): post_id for post_id in post_ids}
+    return {keys[key]: count for key, count in cache.get_many(keys).items() if count}
+
+
+def flush_view_counts():
+    """Add the buffered views to BlogPost.view_count in one UPDATE"""
+    pending = pending_views(BlogPost.objects.values_list('pk', flat=True))
+    if not pending:
+        return 0
+
+    BlogPost.objects.filter(pk__in=pending).update(
+        view_count=F('view_count') + Case(
+            *[When(pk=post_id, then=Value(count)) for post_id, count in pending.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    )
+    # Subtract what was written rather than deleting, so views counted
+    # since pending_views() was read are kept for the next flush. A counter
+    # culled meanwhile is skipped; the others are still reset
+    for post_id, count in pending.items():
+        if _add_views(post_id, -count) is None:
+            logger.warning(f"Blog view counter for post {post_id} vanished during flush")
+
+    flushed = sum(pending.values())
+    logger.info(f"Flushed {flushed} blog view(s) for {len(pending)} post(s)")
+    return flushed
+
+
+def start_flusher(interval=None):
+    """
+    Flush buffered views every `interval` seconds in a daemon thread.
+    Every web worker starts one; a cache lock lets only one of them flush
+    per interval.
+    """
+    global _flusher
+    interval = interval if interval is not None else settings.BLOG_VIEW_FLUSH_INTERVAL
+    if not interval or _flusher is not None:
+        return None
+
+    _flusher = threading.Thread(
+        target=_run_flusher,
+        args=(interval,),
+        name='blog-view-flush',
+        daemon=True,
+    )
+    _flusher.start()
+    return _flusher
+
+
+def _run_flusher(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            if cache.add(FLUSH_LOCK_KEY, True, timeout=interval):
+                flush_view_counts()
+        except Exception as e:
+            logger.error(f"Scheduled blog view flush failed: {e}")
+        finally:
+            # The thread keeps its own connection; do not hold it while sleeping
+            connection.close()
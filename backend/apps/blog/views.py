@@ -2,19 +2,42 @@ from rest_framework import viewsets, filters
 from rest_framework.permissions import AllowAny
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import F, Q
+from django.db.models import F
 from django.shortcuts import get_object_or_404
+from django.utils.text import slugify
+import json
 
+from .cache import get_blog_payload
 from .models import BlogCategory, BlogPost
+from .view_counter import record_view
 from .serializers import (
     BlogCategorySerializer,
     BlogPostListSerializer,
-    BlogPostDetailSerializer
+    BlogPostDetailSerializer,
+    BlogPostSearchSerializer
 )
+from .search import SEARCH_CONFIGS, search_posts
+from .slugs import canonical_slug
+from .tags import tag_cloud
 
 
-class BlogCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class CachedBlogResponseMixin:
+    """Serve listing payloads from the blog response cache, with an X-Cache header"""
+
+    def cached_response(self, request, name, build):
+        # Image URLs are absolute, so the host is part of the cache name
+        params = sorted(request.query_params.lists())
+        name = f'{request.build_absolute_uri("/")}:{name}:{params}'
+        # Cached as plain JSON data rather than DRF's ReturnDict/ReturnList
+        payload, hit = get_blog_payload(name, lambda: json.loads(json.dumps(build(), cls=JSONEncoder)))
+        response = Response(payload)
+        response['X-Cache'] = 'HIT' if hit else 'MISS'
+        return response
+
+
+class BlogCategoryViewSet(CachedBlogResponseMixin, viewsets.ReadOnlyModelViewSet):
     """
     Public ViewSet for blog categories.
     """
@@ -23,8 +46,12 @@ class BlogCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [AllowAny]
     lookup_field = 'slug'
 
+    def list(self, request, *args, **kwargs):
+        parent = super()
+        return self.cached_response(request, 'categories', lambda: parent.list(request, *args, **kwargs).data)
+
 
-class BlogPostViewSet(viewsets.ReadOnlyModelViewSet):
+class BlogPostViewSet(CachedBlogResponseMixin, viewsets.ReadOnlyModelViewSet):
     """
     Public ViewSet for blog posts.
     Only shows published posts.
@@ -40,7 +67,7 @@ class BlogPostViewSet(viewsets.ReadOnlyModelViewSet):
     def get_queryset(self):
         return BlogPost.objects.filter(
             status=BlogPost.Status.PUBLISHED
-        ).select_related('category')
+        ).select_related('category').defer('search_en', 'search_sq', 'search_it')
 
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -48,13 +75,16 @@ class BlogPostViewSet(viewsets.ReadOnlyModelViewSet):
         return BlogPostListSerializer
 
     def get_object(self):
-        """Override to support lookup by any language slug (en, sq, it)"""
+        """
+        Override to support lookup by any language slug (en, sq, it), current
+        or old, through the BlogSlug unique index
+        """
         queryset = self.get_queryset()
         slug = self.kwargs.get('slug')
 
-        # Try to find by any of the three slug fields
-        obj = queryset.filter(
-            Q(slug=slug) | Q(slug_sq=slug) | Q(slug_it=slug)
+        obj = queryset.filter(slugs__slug=slug).annotate(
+            slug_language=F('slugs__language'),
+            slug_is_current=F('slugs__is_current'),
         ).first()
 
         if obj is None:
@@ -63,31 +93,78 @@ class BlogPostViewSet(viewsets.ReadOnlyModelViewSet):
 
         return obj
 
+    def list(self, request, *args, **kwargs):
+        parent = super()
+        return self.cached_response(request, 'posts', lambda: parent.list(request, *args, **kwargs).data)
+
     def retrieve(self, request, *args, **kwargs):
-        """Get post detail and increment view count"""
+        """Get post detail and count the view"""
         instance = self.get_object()
 
-        # Increment view count
-        BlogPost.objects.filter(pk=instance.pk).update(view_count=F('view_count') + 1)
-        instance.refresh_from_db()
+        # Buffered in the cache and flushed in batches; show the live count
+        instance.view_count += record_view(instance.pk)
 
         serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        response = Response(serializer.data)
+        if not instance.slug_is_current:
+            # Old slug: tell the client where the post lives now
+            response['X-Canonical-Slug'] = canonical_slug(instance, instance.slug_language)
+        return response
 
     @action(detail=False, methods=['get'])
     def featured(self, request):
         """Get featured/latest posts for homepage"""
-        posts = self.get_queryset()[:3]
-        serializer = BlogPostListSerializer(posts, many=True, context={'request': request})
+        def build():
+            posts = self.get_queryset()[:3]
+            return BlogPostListSerializer(posts, many=True, context={'request': request}).data
+
+        return self.cached_response(request, 'featured', build)
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Full-text search, best match first, with highlighted snippets.
+        GET /api/blog/posts/search/?q=<query>&lang=en|sq|it
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'q parameter is required'}, status=400)
+        lang = request.query_params.get('lang', 'en')
+        if lang not in SEARCH_CONFIGS:
+            return Response({'error': f"lang must be one of: {', '.join(SEARCH_CONFIGS)}"}, status=400)
+
+        posts = search_posts(self.get_queryset(), query, lang)
+        page = self.paginate_queryset(posts)
+        if page is not None:
+            serializer = BlogPostSearchSerializer(page, many=True, context={'request': request})
+            return self.get_paginated_response(serializer.data)
+        serializer = BlogPostSearchSerializer(posts, many=True, context={'request': request})
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def by_tag(self, request):
-        """Get posts by tag"""
-        tag = request.query_params.get('tag', '')
+        """
+        Get posts with a tag (exact match on the tag slug, e.g. "ISO 27001" or "iso-27001")
+        GET /api/blog/posts/by_tag/?tag=<tag>
+        """
+        tag = slugify(request.query_params.get('tag', ''))
         if not tag:
             return Response({'error': 'tag parameter is required'}, status=400)
 
-        posts = self.get_queryset().filter(tags__icontains=tag)
-        serializer = BlogPostListSerializer(posts, many=True, context={'request': request})
-        return Response(serializer.data)
+        def build():
+            posts = self.get_queryset().filter(tag_set__slug=tag)
+            page = self.paginate_queryset(posts)
+            if page is not None:
+                serializer = BlogPostListSerializer(page, many=True, context={'request': request})
+                return self.get_paginated_response(serializer.data).data
+            return BlogPostListSerializer(posts, many=True, context={'request': request}).data
+
+        return self.cached_response(request, 'by_tag', build)
+
+    @action(detail=False, methods=['get'])
+    def tags(self, request):
+        """
+        Tag cloud: tags of published posts with their post counts
+        GET /api/blog/posts/tags/
+        """
+        return self.cached_response(request, 'tags', tag_cloud)
@@ -2,7 +2,10 @@ from django.contrib import admin
 from django.http import HttpResponse
 from django.urls import reverse
 from django.utils.html import format_html
-from .models import Certificate, CertificateSite
+from .artifacts import retry_jobs
+from .models import ArtifactJob, Certificate, CertificateSite, StatusSweepLog
+from .utils.pdf_export import certificate_zip_response
+from .utils.pdf_generator import LANGUAGES
 import os
 
 
@@ -25,10 +28,11 @@ class CertificateAdmin(admin.ModelAdmin):
         'download_pdf_link',
         'created_at'
     ]
-    list_filter = ['status', 'standard', 'created_at']
+    list_filter = ['status', 'standard', 'artifact_status', 'created_at']
     search_fields = ['certificate_number', 'company_name', 'scope_activity']
     readonly_fields = [
         'secure_id',
+        'artifact_status',
         'qr_code_preview',
         'is_maintenance_due',
         'days_until_expiry',
@@ -63,7 +67,7 @@ class CertificateAdmin(admin.ModelAdmin):
             )
         }),
         ('Signature & PDF', {
-            'fields': ('signature', 'qr_code_preview', 'download_pdf_button',)
+            'fields': ('signature', 'artifact_status', 'qr_code_preview', 'download_pdf_button',)
         }),
         ('Status Information', {
             'fields': (
@@ -167,15 +171,18 @@ class CertificateAdmin(admin.ModelAdmin):
     download_pdf_button.short_description = 'Download PDF'
 
     def download_pdf_action(self, request, queryset):
-        """Admin action to download PDFs (downloads first selected in Albanian)"""
-        if queryset.count() > 1:
-            self.message_user(request, 'Please select only one certificate to download', level='warning')
-            return
+        """
+        Admin action to download PDFs.
+        A single certificate opens its Albanian PDF; several are streamed
+        as a ZIP archive with every language.
+        """
+        if queryset.count() == 1:
+            certificate = queryset.first()
+            from django.shortcuts import redirect
+            return redirect(f'/api/certificates/{certificate.pk}/download_pdf/?lang=sq')
 
-        certificate = queryset.first()
-        from django.shortcuts import redirect
-        return redirect(f'/api/certificates/{certificate.pk}/download_pdf/?lang=sq')
-    download_pdf_action.short_description = 'Download PDF for selected certificate'
+        return certificate_zip_response(queryset, list(LANGUAGES))
+    download_pdf_action.short_description = 'Download PDF(s) for selected certificates'
 
     def perform_maintenance_action(self, request, queryset):
         """Admin action to perform maintenance on selected certificates"""
@@ -208,3 +215,48 @@ class CertificateSiteAdmin(admin.ModelAdmin):
         'updated_at'
     ]
     readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(ArtifactJob)
+class ArtifactJobAdmin(admin.ModelAdmin):
+    list_display = [
+        'certificate',
+        'kind',
+        'status',
+        'attempts',
+        'run_after',
+        'updated_at'
+    ]
+    list_filter = ['kind', 'status']
+    search_fields = ['certificate__certificate_number', 'last_error']
+    readonly_fields = [
+        'certificate',
+        'kind',
+        'status',
+        'attempts',
+        'run_after',
+        'locked_at',
+        'last_error',
+        'created_at',
+        'updated_at'
+    ]
+    actions = ['retry_jobs_action']
+
+    def has_add_permission(self, request):
+        return False
+
+    def retry_jobs_action(self, request, queryset):
+        """Admin action to requeue selected jobs immediately"""
+        count = retry_jobs(queryset)
+        self.message_user(request, f'Requeued {count} job(s)')
+    retry_jobs_action.short_description = 'Retry selected jobs'
+
+
+@admin.register(StatusSweepLog)
+class StatusSweepLogAdmin(admin.ModelAdmin):
+    list_display = ['ran_at', 'source', 'expired_count', 'duration_ms']
+    list_filter = ['source']
+    readonly_fields = ['ran_at', 'source', 'expired_count', 'duration_ms']
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,161 @@
+"""
+Certificate Artifact Jobs
+
+Processing side of the ArtifactJob queue: claims due jobs, generates the
+QR code or pre-renders the PDFs, and reschedules failures with exponential
+backoff. Driven by `manage.py run_artifact_worker`.
+
+Claiming uses SELECT ... FOR UPDATE SKIP LOCKED, so several workers can
+share the queue without picking the same job.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .cache import invalidate_verify_cache
+from .models import (
+    ArtifactJob,
+    Certificate,
+    ARTIFACT_JOB_MAX_ATTEMPTS,
+    ARTIFACT_JOB_RETRY_DELAY_SECONDS,
+)
+from .utils.pdf_cache import evict_certificate, get_or_render
+from .utils.pdf_generator import CertificatePDFGenerator, LANGUAGES
+
+logger = logging.getLogger(__name__)
+
+# RUNNING jobs older than this are assumed to belong to a dead worker
+ARTIFACT_JOB_LOCK_TIMEOUT = timedelta(minutes=10)
+
+
+def claim_jobs(limit=10):
+    """Mark up to `limit` due jobs as RUNNING and return them"""
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            ArtifactJob.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=ArtifactJob.STATUS_PENDING, run_after__lte=now) |
+                Q(status=ArtifactJob.STATUS_RUNNING, locked_at__lt=now - ARTIFACT_JOB_LOCK_TIMEOUT)
+            )
+            .order_by('run_after')[:limit]
+        )
+        ArtifactJob.objects.filter(pk__in=[job.pk for job in jobs]).update(
+            status=ArtifactJob.STATUS_RUNNING,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+    for job in jobs:
+        job.status = ArtifactJob.STATUS_RUNNING
+        job.locked_at = now
+        job.attempts += 1
+    return jobs
+
+
+def process_jobs(limit=10):
+    """Claim and run one batch of jobs; returns (succeeded, failed)"""
+    succeeded = failed = 0
+    for job in claim_jobs(limit):
+        if run_job(job):
+            succeeded += 1
+        else:
+            failed += 1
+    return succeeded, failed
+
+
+def run_job(job):
+    """Run a claimed job, deleting it on success or rescheduling it on failure"""
+    try:
+        if job.kind == ArtifactJob.KIND_QR_CODE:
+            _generate_qr_code(job.certificate_id)
+        else:
+            _render_pdfs(job.certificate_id)
+    except Certificate.DoesNotExist:
+        # Certificate deleted while the job was running; nothing left to do
+        pass
+    except Exception as e:
+        logger.error(f"Artifact job {job.pk} ({job.kind}) for certificate {job.certificate_id} failed: {e}")
+        _reschedule(job, e)
+        return False
+
+    job.delete()
+    return True
+
+
+def _generate_qr_code(certificate_id):
+    certificate = Certificate.objects.get(pk=certificate_id)
+    if not certificate.qr_code:
+        certificate.generate_qr_code()
+
+    # .update() skips save() and the signal handlers, so caches are cleared here
+    Certificate.objects.filter(pk=certificate_id).update(
+        qr_code=certificate.qr_code.name,
+        artifact_status='READY',
+        updated_at=timezone.now(),
+    )
+    invalidate_verify_cache(certificate.secure_id)
+    evict_certificate(certificate_id)
+
+    ArtifactJob.enqueue(certificate, ArtifactJob.KIND_PDF)
+
+
+def _render_pdfs(certificate_id):
+    certificate = Certificate.objects.prefetch_related('sites').get(pk=certificate_id)
+    for lang in LANGUAGES:
+        get_or_render(CertificatePDFGenerator(certificate, lang=lang))
+
+
+def _reschedule(job, error):
+    job.last_error = str(error)
+    if job.attempts >= ARTIFACT_JOB_MAX_ATTEMPTS:
+        job.status = ArtifactJob.STATUS_FAILED
+        if job.kind == ArtifactJob.KIND_QR_CODE:
+            Certificate.objects.filter(pk=job.certificate_id).update(artifact_status='FAILED')
+    else:
+        job.status = ArtifactJob.STATUS_PENDING
+        delay = ARTIFACT_JOB_RETRY_DELAY_SECONDS * 2 ** (job.attempts - 1)
+        job.run_after = timezone.now() + timedelta(seconds=delay)
+    job.locked_at = None
+    job.save(update_fields=['status', 'run_after', 'locked_at', 'last_error', 'updated_at'])
+
+
+def retry_jobs(queryset):
+    """Put failed jobs back in the queue with a fresh attempt budget"""
+    certificate_ids = list(
+        queryset.filter(kind=ArtifactJob.KIND_QR_CODE).values_list('certificate_id', flat=True)
+    )
+    count = queryset.update(
+        status=ArtifactJob.STATUS_PENDING,
+        attempts=0,
+        run_after=timezone.now(),
+        locked_at=None,
+    )
+    Certificate.objects.filter(pk__in=certificate_ids, artifact_status='FAILED').update(artifact_status='PENDING')
+    return count
+
+
+def generate_qr_codes(certificates, batch_size=500):
+    """
+    Generate QR codes for freshly inserted certificates and store them
+    with bulk_update() instead of one save() per certificate.
+    """
+    for certificate in certificates:
+        try:
+            certificate.generate_qr_code()
+            certificate.artifact_status = 'READY'
+        except Exception as e:
+            logger.error(f"QR code generation failed for certificate {certificate.pk}: {e}")
+            certificate.artifact_status = 'FAILED'
+    Certificate.objects.bulk_update(certificates, ['qr_code', 'artifact_status'], batch_size=batch_size)
+
+
+def queue_qr_codes(certificates, batch_size=500):
+    """Queue QR jobs for freshly inserted certificates in one insert per batch"""
+    ArtifactJob.objects.bulk_create(
+        [ArtifactJob(certificate=certificate, kind=ArtifactJob.KIND_QR_CODE) for certificate in certificates],
+        batch_size=batch_size,
+    )
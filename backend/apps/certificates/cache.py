@@ -0,0 +1,144 @@
+"""
+Certificate Verification Cache
+
+Read-through cache for the public verification payload served by
+CertificateViewSet.verify (the endpoint every QR scan hits).
+
+Entries are keyed by secure_id and dropped by the signal handlers in
+signals.py whenever a certificate or one of its sites is saved or deleted,
+so a repeat scan is answered without touching the database. Bulk updates
+that skip the signals call invalidate_all_verify_cache(), which bumps the
+generation embedded in every key.
+"""
+
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Certificate
+from .serializers import CertificateSiteSerializer
+from .utils.conditional import certificate_validators
+
+VERIFY_CACHE_PREFIX = 'certificates:verify'
+VERIFY_HITS_KEY = 'certificates:verify:stats:hits'
+VERIFY_MISSES_KEY = 'certificates:verify:stats:misses'
+VERIFY_GENERATION_KEY = 'certificates:verify:generation'
+
+# Unknown UUIDs are cached briefly so repeated bad scans stay cheap too
+VERIFY_NOT_FOUND_TIMEOUT = 60
+
+
+def verify_cache_key(secure_id):
+    return f'{VERIFY_CACHE_PREFIX}:{_generation()}:{secure_id}'
+
+
+def build_verify_payload(certificate):
+    """Render the limited public information shown on the verification page"""
+    return {
+        'certificate_number': certificate.certificate_number,
+        'company_name': certificate.company_name,
+        'standard': certificate.get_standard_display(),
+        'status': certificate.get_status_display(),
+        'first_issue_date': certificate.first_issue_date,
+        'expiry_date': certificate.expiry_date,
+        'scope_activity': certificate.scope_activity,
+        'iaf_code': certificate.iaf_code,
+        'is_valid': certificate.status == 'VALID',
+        'sites': [
+            dict(site) for site in
+            CertificateSiteSerializer(certificate.sites.all(), many=True).data
+        ],
+    }
+
+
+def get_verify_entry(secure_id):
+    """
+    Return the cached entry for secure_id, or None if no such certificate.
+
+    The entry holds the public 'payload' plus the 'etag' and 'last_modified'
+    validators, so conditional requests are answered without a query.
+    On a miss the certificate and its sites are loaded in two queries.
+    """
+    try:
+        secure_id = uuid.UUID(str(secure_id))
+    except ValueError:
+        return None
+
+    key = verify_cache_key(secure_id)
+    entry = cache.get(key)
+    if entry is not None:
+        _increment(VERIFY_HITS_KEY)
+        return entry if entry['payload'] is not None else None
+
+    _increment(VERIFY_MISSES_KEY)
+    certificate = (
+        Certificate.objects.filter(secure_id=secure_id)
+        .prefetch_related('sites')
+        .first()
+    )
+    if certificate is None:
+        cache.set(key, {'payload': None}, VERIFY_NOT_FOUND_TIMEOUT)
+        return None
+
+    etag, last_modified = certificate_validators(certificate)
+    entry = {
+        'payload': build_verify_payload(certificate),
+        'etag': etag,
+        'last_modified': last_modified,
+    }
+    cache.set(key, entry, settings.CERTIFICATE_VERIFY_CACHE_TIMEOUT)
+    return entry
+
+
+def invalidate_verify_cache(secure_id):
+    cache.delete(verify_cache_key(secure_id))
+
+
+def invalidate_all_verify_cache():
+    """Orphan every cached entry at once; they age out on their own"""
+    cache.set(VERIFY_GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def get_verify_cache_stats():
+    """
+    Hit/miss counters shared by all workers using the same cache.
+    Approximate unless the backend has an atomic incr() (see _increment).
+    """
+    hits = cache.get(VERIFY_HITS_KEY, 0)
+    misses = cache.get(VERIFY_MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / total, 4) if total else None,
+    }
+
+
+def reset_verify_cache_stats():
+    cache.delete_many([VERIFY_HITS_KEY, VERIFY_MISSES_KEY])
+
+
+def _generation():
+    # Generations are timestamps, so one recreated after an eviction can
+    # never match keys written under an earlier generation
+    generation = cache.get(VERIFY_GENERATION_KEY)
+    if generation is None:
+        cache.add(VERIFY_GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(VERIFY_GENERATION_KEY)
+    return generation
+
+
+def _increment(key):
+    """
+    Bump a stats counter. Redis and Memcached increment atomically; the
+    file-based and local-memory backends read, add and rewrite the value,
+    so concurrent requests can lose counts. The counters are a rough
+    hit-ratio gauge, not exact totals.
+    """
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Counter missing or evicted - start it again
+        cache.set(key, 1, timeout=None)
@@ -0,0 +1,276 @@
+"""
+Bulk Certificate Import
+
+Loads certificates and their sites from CSV or JSON in three steps:
+every record is validated up front, the valid ones are inserted with
+bulk_create() in batches inside one transaction, and the QR codes are
+then generated in a batch step (or queued for the artifact worker when
+CERTIFICATE_ARTIFACTS_ASYNC is on).
+
+CSV: one row per site. Rows sharing a certificate_number belong to the
+same certificate, whose fields are read from its first row. Site columns
+are site_number, site_name, site_scope_activity and site_address.
+
+JSON: a list of certificate objects (or {"certificates": [...]}), each
+with an optional nested "sites" list.
+
+Dates are ISO formatted (YYYY-MM-DD).
+"""
+
+import csv
+import io
+import json
+import logging
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from .artifacts import generate_qr_codes, queue_qr_codes
+from .models import Certificate, CertificateSite
+from .serializers import CertificateImportSerializer
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = 500
+
+CERTIFICATE_COLUMNS = [
+    field for field in CertificateImportSerializer.Meta.fields if field != 'sites'
+]
+SITE_COLUMNS = {
+    'site_number': 'site_number',
+    'site_name': 'name',
+    'site_scope_activity': 'scope_activity',
+    'site_address': 'address',
+}
+
+
+class CertificateImportError(ValueError):
+    """Raised when an import file cannot be read at all"""
+
+
+class ImportRecord:
+    """One certificate of an import file, with the row it came from"""
+
+    def __init__(self, row, data):
+        self.row = row
+        self.data = data
+        self.errors = {}
+        self.certificate = None
+        self.sites = []
+
+    @property
+    def certificate_number(self):
+        if self.certificate is not None:
+            return self.certificate.certificate_number
+        return self.data.get('certificate_number') or ''
+
+    def report(self, status):
+        return {
+            'row': self.row,
+            'certificate_number': self.certificate_number,
+            'status': status,
+            'errors': self.errors,
+        }
+
+
+def read_import_file(content, fmt):
+    """
+    Parse an uploaded file into ImportRecords.
+    fmt is 'csv' or 'json', or a filename whose extension names the format.
+    """
+    fmt = fmt.rsplit('.', 1)[-1].lower()
+    if isinstance(content, bytes):
+        try:
+            content = content.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            raise CertificateImportError('File must be UTF-8 encoded')
+
+    if fmt == 'csv':
+        return parse_csv(content)
+    if fmt == 'json':
+        try:
+            data = json.loads(content)
+        except ValueError as e:
+            raise CertificateImportError(f'Invalid JSON: {e}')
+        return parse_json(data)
+    raise CertificateImportError('Unsupported format, use a .csv or .json file')
+
+
+def parse_csv(text):
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames or 'standard' not in reader.fieldnames:
+        raise CertificateImportError('CSV header row with certificate columns is required')
+
+    records = []
+    by_number = {}
+    # Line 1 is the header
+    for line, row in enumerate(reader, start=2):
+        row = {key.strip(): (value or '').strip() for key, value in row.items() if key}
+        number = row.get('certificate_number', '')
+
+        record = by_number.get(number) if number else None
+        if record is None:
+            data = {
+                column: row[column] for column in CERTIFICATE_COLUMNS
+                if row.get(column) and column != 'certificate_number'
+            }
+            data['certificate_number'] = number
+            data['sites'] = []
+            record = ImportRecord(line, data)
+            records.append(record)
+            if number:
+                by_number[number] = record
+
+        site = {field: row[column] for column, field in SITE_COLUMNS.items() if row.get(column)}
+        if site:
+            site.setdefault('site_number', len(record.data['sites']) + 1)
+            record.data['sites'].append(site)
+
+    return records
+
+
+def parse_json(data):
+    if isinstance(data, dict):
+        data = data.get('certificates')
+    if not isinstance(data, list):
+        raise CertificateImportError('Expected a list of certificates')
+
+    records = []
+    for index, item in enumerate(data, start=1):
+        record = ImportRecord(index, item if isinstance(item, dict) else {})
+        if not isinstance(item, dict):
+            record.errors = {'non_field_errors': ['Expected an object']}
+        records.append(record)
+    return records
+
+
+def validate_records(records):
+    """
+    Validate every record, filling in record.errors or the unsaved
+    record.certificate and record.sites.
+    """
+    numbers = {r.data.get('certificate_number') for r in records if r.data.get('certificate_number')}
+    existing = _existing_numbers(numbers)
+    seen = {}
+
+    for record in records:
+        if record.errors:
+            continue
+
+        serializer = CertificateImportSerializer(data=record.data)
+        if not serializer.is_valid():
+            record.errors = serializer.errors
+            continue
+
+        data = dict(serializer.validated_data)
+        sites = data.pop('sites', [])
+        errors = {}
+
+        number = data.get('certificate_number')
+        if number in existing:
+            errors['certificate_number'] = ['A certificate with this number already exists.']
+        elif number in seen:
+            errors['certificate_number'] = [f'Duplicate of the certificate on row {seen[number]}.']
+        elif number:
+            seen[number] = record.row
+
+        site_numbers = [site['site_number'] for site in sites]
+        if len(site_numbers) != len(set(site_numbers)):
+            errors['sites'] = ['Site numbers must be unique per certificate.']
+
+        certificate = Certificate(**data)
+        try:
+            certificate.clean()
+        except ValidationError as e:
+            for field, messages in e.message_dict.items():
+                errors.setdefault(field, []).extend(messages)
+
+        record.errors = errors
+        record.certificate = certificate
+        record.sites = [CertificateSite(**site) for site in sites]
+
+    return records
+
+
+def import_certificates(records, dry_run=False, skip_invalid=False, sync_limit=None):
+    """
+    Validate and insert records, returning a per-row report.
+
+    Nothing is inserted when any record is invalid, unless skip_invalid
+    is set, in which case the valid records are still imported.
+
+    sync_limit caps the number of certificates imported while QR codes
+    are generated in the calling process (CERTIFICATE_ARTIFACTS_ASYNC off),
+    so a web request is not kept busy past the worker timeout.
+    """
+    if not dry_run and sync_limit is not None and not settings.CERTIFICATE_ARTIFACTS_ASYNC \
+            and len(records) > sync_limit:
+        raise CertificateImportError(
+            f'Files with more than {sync_limit} certificates must be imported with '
+            f'`python manage.py import_certificates` (or with CERTIFICATE_ARTIFACTS_ASYNC on)'
+        )
+
+    validate_records(records)
+    valid = [record for record in records if not record.errors]
+    invalid = len(records) - len(valid)
+
+    insert = not dry_run and bool(valid) and (skip_invalid or not invalid)
+    if insert:
+        _insert(valid)
+
+    rows = []
+    for record in records:
+        if record.errors:
+            rows.append(record.report('invalid'))
+        else:
+            rows.append(record.report('created' if insert else 'valid'))
+
+    return {
+        'total': len(records),
+        'created': len(valid) if insert else 0,
+        'invalid': invalid,
+        'dry_run': dry_run,
+        'rows': rows,
+    }
+
+
+def _insert(records):
+    certificates = [record.certificate for record in records]
+    generate_async = settings.CERTIFICATE_ARTIFACTS_ASYNC
+    for certificate in certificates:
+        certificate.apply_defaults()
+        certificate.artifact_status = 'PENDING'
+
+    sites = []
+    for record in records:
+        for site in record.sites:
+            site.certificate = record.certificate
+            sites.append(site)
+
+    try:
+        with transaction.atomic():
+            Certificate.objects.bulk_create(certificates, batch_size=IMPORT_BATCH_SIZE)
+            CertificateSite.objects.bulk_create(sites, batch_size=IMPORT_BATCH_SIZE)
+            if generate_async:
+                queue_qr_codes(certificates, batch_size=IMPORT_BATCH_SIZE)
+    except IntegrityError as e:
+        # A certificate number was taken between validation and insert
+        raise CertificateImportError(f'Import aborted, nothing was saved: {e}')
+
+    logger.info(f"Imported {len(certificates)} certificates with {len(sites)} sites")
+
+    if not generate_async:
+        generate_qr_codes(certificates, batch_size=IMPORT_BATCH_SIZE)
+
+
+def _existing_numbers(numbers):
+    numbers = list(numbers)
+    existing = set()
+    for start in range(0, len(numbers), IMPORT_BATCH_SIZE):
+        existing.update(
+            Certificate.objects.filter(
+                certificate_number__in=numbers[start:start + IMPORT_BATCH_SIZE]
+            ).values_list('certificate_number', flat=True)
+        )
+    return existing
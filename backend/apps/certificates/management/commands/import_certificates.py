@@ -0,0 +1,61 @@
+"""
+Management command to bulk import certificates and their sites from CSV or JSON.
+Run with: python manage.py import_certificates certificates.csv
+"""
+from django.core.management.base import BaseCommand, CommandError
+from apps.certificates.importer import CertificateImportError, import_certificates, read_import_file
+
+
+class Command(BaseCommand):
+    help = 'Imports certificates and their sites from a CSV or JSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=str, help='Path to the .csv or .json file')
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'json'],
+            help='File format (detected from the file extension if not specified)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate the file without importing anything',
+        )
+        parser.add_argument(
+            '--skip-invalid',
+            action='store_true',
+            help='Import the valid certificates even if some rows have errors',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], 'rb') as f:
+                content = f.read()
+        except OSError as e:
+            raise CommandError(f'Cannot read {options["path"]}: {e}')
+
+        try:
+            records = read_import_file(content, options['format'] or options['path'])
+            report = import_certificates(
+                records,
+                dry_run=options['dry_run'],
+                skip_invalid=options['skip_invalid'],
+            )
+        except CertificateImportError as e:
+            raise CommandError(str(e))
+
+        for row in report['rows']:
+            if row['errors']:
+                self.stdout.write(self.style.WARNING(
+                    f'  Row {row["row"]} ({row["certificate_number"] or "no number"}):'
+                ))
+                for field, messages in row['errors'].items():
+                    self.stdout.write(f'    {field}: {"; ".join(str(m) for m in messages)}')
+
+        summary = f'{report["total"]} certificates, {report["invalid"]} invalid, {report["created"]} imported'
+        if report['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'Dry run: {summary}'))
+        elif report['invalid'] and not report['created']:
+            raise CommandError(f'Nothing imported: {summary}')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Successfully imported: {summary}'))
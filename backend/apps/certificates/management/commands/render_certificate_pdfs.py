@@ -0,0 +1,75 @@
+"""
+Management command to render certificate PDFs into the PDF cache.
+Run with: python manage.py render_certificate_pdfs
+"""
+from django.core.management.base import BaseCommand, CommandError
+from apps.certificates.models import Certificate
+from apps.certificates.utils.pdf_cache import evict_certificate
+from apps.certificates.utils.pdf_generator import LANGUAGES
+from apps.certificates.utils.render_pool import build_jobs, iter_render
+
+
+class Command(BaseCommand):
+    help = 'Renders certificate PDFs across a process pool to warm the PDF cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ids',
+            nargs='+',
+            type=int,
+            help='Certificate IDs to render. Renders all certificates if not specified.',
+        )
+        parser.add_argument(
+            '--status',
+            type=str,
+            help='Only render certificates with this status (e.g., VALID)',
+        )
+        parser.add_argument(
+            '--lang',
+            nargs='+',
+            type=str,
+            choices=list(LANGUAGES),
+            help='Languages to render. Renders every language if not specified.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Number of render processes (defaults to CERTIFICATE_PDF_RENDER_WORKERS)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Drop cached PDFs first so every certificate is re-rendered',
+        )
+
+    def handle(self, *args, **options):
+        queryset = Certificate.objects.order_by('pk')
+        if options['ids']:
+            queryset = queryset.filter(pk__in=options['ids'])
+        if options['status']:
+            queryset = queryset.filter(status=options['status'].upper())
+
+        certificate_ids = list(queryset.values_list('pk', flat=True))
+        if not certificate_ids:
+            raise CommandError('No certificates matched')
+
+        if options['force']:
+            for certificate_id in certificate_ids:
+                evict_certificate(certificate_id)
+
+        languages = options['lang'] or list(LANGUAGES)
+        self.stdout.write(
+            f'Rendering {len(certificate_ids)} certificates in {len(languages)} language(s)...'
+        )
+
+        rendered = failed = 0
+        for result in iter_render(build_jobs(certificate_ids, languages), max_workers=options['workers']):
+            if result.error:
+                failed += 1
+                self.stdout.write(self.style.WARNING(
+                    f'  Certificate {result.certificate_id} ({result.lang}): {result.error}'
+                ))
+            else:
+                rendered += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Rendered {rendered} PDFs, {failed} failed'))
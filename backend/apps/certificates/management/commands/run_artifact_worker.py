@@ -0,0 +1,57 @@
+"""
+Management command to process queued certificate artifact jobs (QR codes, PDFs).
+Run with: python manage.py run_artifact_worker
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from apps.certificates.artifacts import process_jobs
+
+
+class Command(BaseCommand):
+    help = 'Generates queued certificate QR codes and pre-renders PDFs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process every job that is currently due, then exit',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10,
+            help='Number of jobs claimed at a time (default: 10)',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=5,
+            help='Seconds to wait when the queue is empty (default: 5)',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        total_succeeded = total_failed = 0
+
+        if not options['once']:
+            self.stdout.write('Artifact worker started, waiting for jobs...')
+
+        try:
+            while True:
+                succeeded, failed = process_jobs(batch_size)
+                total_succeeded += succeeded
+                total_failed += failed
+
+                if succeeded or failed:
+                    self.stdout.write(f'  Processed {succeeded + failed} job(s), {failed} failed')
+                elif options['once']:
+                    break
+                else:
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Completed {total_succeeded} job(s), {total_failed} failed'
+        ))
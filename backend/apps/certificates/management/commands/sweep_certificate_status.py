@@ -0,0 +1,28 @@
+"""
+Management command to expire certificates past their expiry date.
+Run with: python manage.py sweep_certificate_status (e.g. nightly from cron)
+"""
+from django.core.management.base import BaseCommand
+from apps.certificates.status_sweep import expired_queryset, sweep_expired_certificates
+
+
+class Command(BaseCommand):
+    help = 'Marks every certificate past its expiry date as EXPIRED in one UPDATE'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the certificates that would be expired',
+        )
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            count = expired_queryset().count()
+            self.stdout.write(f'{count} certificate(s) would be expired')
+            return
+
+        log = sweep_expired_certificates(source='command')
+        self.stdout.write(self.style.SUCCESS(
+            f'Expired {log.expired_count} certificate(s) in {log.duration_ms:.1f} ms'
+        ))
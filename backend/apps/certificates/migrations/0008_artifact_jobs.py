@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:42
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0007_certificate_signature'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='artifact_status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('READY', 'Ready'), ('FAILED', 'Failed')], default='READY', help_text='QR code generation status (PENDING while queued for the artifact worker)', max_length=10),
+        ),
+        migrations.CreateModel(
+            name='ArtifactJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('QR_CODE', 'QR Code'), ('PDF', 'PDF')], max_length=10)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('FAILED', 'Failed')], default='PENDING', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, help_text='Job is not picked up before this time (used for retry backoff)')),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('certificate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='artifact_jobs', to='certificates.certificate')),
+            ],
+            options={
+                'verbose_name': 'Artifact Job',
+                'verbose_name_plural': 'Artifact Jobs',
+                'ordering': ['run_after'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='certificate_status_ac5299_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0008_artifact_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusSweepLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ran_at', models.DateTimeField(auto_now_add=True)),
+                ('source', models.CharField(choices=[('command', 'Management command'), ('scheduler', 'Scheduler')], default='command', max_length=20)),
+                ('expired_count', models.PositiveIntegerField(default=0, help_text='Certificates switched to EXPIRED by this run')),
+                ('duration_ms', models.FloatField(help_text='Time spent in the UPDATE (milliseconds)')),
+            ],
+            options={
+                'verbose_name': 'Status Sweep Log',
+                'verbose_name_plural': 'Status Sweep Logs',
+                'ordering': ['-ran_at'],
+            },
+        ),
+    ]
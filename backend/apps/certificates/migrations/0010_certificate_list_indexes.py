@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0009_status_sweep_log'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='certificate',
+            index=models.Index(fields=['-created_at'], name='cert_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='certificate',
+            index=models.Index(fields=['status', 'expiry_date'], name='cert_status_expiry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='certificate',
+            index=models.Index(condition=models.Q(('status', 'VALID')), fields=['expiry_date', 'id'], name='cert_valid_expiry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='certificate',
+            index=models.Index(condition=models.Q(('status', 'VALID')), fields=['next_maintenance_date', 'id'], name='cert_valid_maintenance_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 import qrcode
@@ -15,6 +16,10 @@ QR_CODE_BORDER = 4
 EXPIRING_SOON_DAYS = 90
 MAINTENANCE_INTERVAL_YEARS = 1
 
+# Constants for background artifact jobs
+ARTIFACT_JOB_MAX_ATTEMPTS = 5
+ARTIFACT_JOB_RETRY_DELAY_SECONDS = 30
+
 
 class Certificate(models.Model):
     """
@@ -43,6 +48,13 @@ class Certificate(models.Model):
         ('HACCP', 'HACCP: Hazard Analysis and Critical Control Points'),
     ]
 
+    # Artifact (QR code / PDF) generation status
+    ARTIFACT_STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('READY', 'Ready'),
+        ('FAILED', 'Failed'),
+    ]
+
     # Certificate fields
     certificate_number = models.CharField(
         max_length=100,
@@ -111,6 +123,13 @@ class Certificate(models.Model):
         null=True
     )
 
+    artifact_status = models.CharField(
+        max_length=10,
+        choices=ARTIFACT_STATUS_CHOICES,
+        default='READY',
+        help_text="QR code generation status (PENDING while queued for the artifact worker)"
+    )
+
     # Signature
     signature = models.ImageField(
         upload_to='certificate_signatures/',
@@ -127,6 +146,22 @@ class Certificate(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Certificate'
         verbose_name_plural = 'Certificates'
+        indexes = [
+            models.Index(fields=['-created_at'], name='cert_created_idx'),
+            # Status filters and the expiry sweep (expiry_date < today, status != EXPIRED)
+            models.Index(fields=['status', 'expiry_date'], name='cert_status_expiry_idx'),
+            # Dashboard lists only ever look at valid certificates, ordered by (date, id)
+            models.Index(
+                fields=['expiry_date', 'id'],
+                condition=models.Q(status='VALID'),
+                name='cert_valid_expiry_idx'
+            ),
+            models.Index(
+                fields=['next_maintenance_date', 'id'],
+                condition=models.Q(status='VALID'),
+                name='cert_valid_maintenance_idx'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.certificate_number} - {self.company_name}"
@@ -152,6 +187,31 @@ class Certificate(models.Model):
                 })
 
     def save(self, *args, **kwargs):
+        self.apply_defaults()
+
+        # QR codes are left to the artifact worker when it is enabled
+        generate_async = not self.qr_code and settings.CERTIFICATE_ARTIFACTS_ASYNC
+        if generate_async:
+            self.artifact_status = 'PENDING'
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'artifact_status'}
+
+        # Save first to get an ID
+        super().save(*args, **kwargs)
+
+        if generate_async:
+            ArtifactJob.enqueue(self, ArtifactJob.KIND_QR_CODE)
+        # Generate QR code if not exists
+        elif not self.qr_code:
+            self.generate_qr_code()
+            # Save again to store QR code (without triggering infinite loop)
+            super().save(update_fields=['qr_code'])
+
+    def apply_defaults(self):
+        """
+        Fill in derived fields before saving.
+        Also used by the bulk importer, whose bulk_create() bypasses save().
+        """
         # Generate certificate number if not exists
         if not self.certificate_number:
             self.certificate_number = self.generate_certificate_number()
@@ -166,15 +226,6 @@ class Certificate(models.Model):
         # Check and update status based on maintenance and expiry
         self.update_status()
 
-        # Save first to get an ID
-        super().save(*args, **kwargs)
-
-        # Generate QR code if not exists
-        if not self.qr_code:
-            self.generate_qr_code()
-            # Save again to store QR code (without triggering infinite loop)
-            super().save(update_fields=['qr_code'])
-
     def generate_certificate_number(self):
         """
         Generate a unique certificate number
@@ -198,8 +249,6 @@ class Certificate(models.Model):
         Generate QR code for the certificate
         QR code contains secure URL to view live certificate status using UUID
         """
-        from django.conf import settings
-
         # Create QR code with secure UUID-based URL (non-guessable)
         # Uses FRONTEND_URL from settings (set via environment variable)
         frontend_url = getattr(settings, 'FRONTEND_URL', 'http://localhost:3000')
@@ -294,3 +343,100 @@ class CertificateSite(models.Model):
 
     def __str__(self):
         return f"Site {self.site_number} - {self.name} ({self.certificate.certificate_number})"
+
+
+class ArtifactJob(models.Model):
+    """
+    Queued generation of a certificate artifact (QR code or cached PDFs),
+    processed by `manage.py run_artifact_worker`.
+    Jobs are deleted once they succeed; failed jobs are retried with
+    exponential backoff until ARTIFACT_JOB_MAX_ATTEMPTS is reached.
+    """
+
+    KIND_QR_CODE = 'QR_CODE'
+    KIND_PDF = 'PDF'
+    KIND_CHOICES = [
+        (KIND_QR_CODE, 'QR Code'),
+        (KIND_PDF, 'PDF'),
+    ]
+
+    STATUS_PENDING = 'PENDING'
+    STATUS_RUNNING = 'RUNNING'
+    STATUS_FAILED = 'FAILED'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    certificate = models.ForeignKey(
+        Certificate,
+        on_delete=models.CASCADE,
+        related_name='artifact_jobs'
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    run_after = models.DateTimeField(
+        default=timezone.now,
+        help_text="Job is not picked up before this time (used for retry backoff)"
+    )
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    # Metadata
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['run_after']
+        verbose_name = 'Artifact Job'
+        verbose_name_plural = 'Artifact Jobs'
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} for {self.certificate_id} ({self.status})"
+
+    @classmethod
+    def enqueue(cls, certificate, kind):
+        """Queue a job unless an identical one is already waiting"""
+        job = cls.objects.filter(
+            certificate=certificate, kind=kind, status=cls.STATUS_PENDING
+        ).first()
+        if job is None:
+            job = cls.objects.create(certificate=certificate, kind=kind)
+        return job
+
+
+class StatusSweepLog(models.Model):
+    """
+    Record of one run of the certificate status sweep
+    (`manage.py sweep_certificate_status` or the in-process scheduler)
+    """
+
+    SOURCE_CHOICES = [
+        ('command', 'Management command'),
+        ('scheduler', 'Scheduler'),
+    ]
+
+    ran_at = models.DateTimeField(auto_now_add=True)
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default='command')
+    expired_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Certificates switched to EXPIRED by this run"
+    )
+    duration_ms = models.FloatField(help_text="Time spent in the UPDATE (milliseconds)")
+
+    class Meta:
+        ordering = ['-ran_at']
+        verbose_name = 'Status Sweep Log'
+        verbose_name_plural = 'Status Sweep Logs'
+
+    def __str__(self):
+        return f"Sweep at {self.ran_at:%Y-%m-%d %H:%M} - {self.expired_count} expired"
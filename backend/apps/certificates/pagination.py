@@ -0,0 +1,33 @@
+"""
+Pagination for the certificate dashboard lists (expiring_soon, maintenance_due).
+
+Page numbers are the default; ?pagination=cursor switches to cursor
+pagination, which stays fast on deep pages because it seeks on the
+(date, id) index instead of using OFFSET.
+"""
+
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class CertificateListPagination(PageNumberPagination):
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class CertificateCursorPagination(CursorPagination):
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def __init__(self, ordering):
+        self.ordering = ordering
+
+    def get_ordering(self, request, queryset, view):
+        # Ignore the view's OrderingFilter; the cursor must follow the index
+        return self.ordering
+
+
+def get_list_paginator(request, ordering):
+    """Cursor paginator when requested (or when following a cursor link), else page numbers"""
+    if request.query_params.get('pagination') == 'cursor' or 'cursor' in request.query_params:
+        return CertificateCursorPagination(ordering)
+    return CertificateListPagination()
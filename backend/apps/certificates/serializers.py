@@ -52,6 +52,7 @@ class CertificateSerializer(serializers.ModelSerializer):
             'next_maintenance_date',
             'last_maintenance_date',
             'qr_code',
+            'artifact_status',
             'signature',
             'is_maintenance_due',
             'days_until_expiry',
@@ -64,11 +65,50 @@ class CertificateSerializer(serializers.ModelSerializer):
             'certificate_number',
             'secure_id',
             'qr_code',
+            'artifact_status',
             'created_at',
             'updated_at'
         ]
 
 
+class CertificateListSerializer(serializers.ModelSerializer):
+    """
+    Lean serializer for dashboard lists: no nested sites, no file fields
+    """
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    standard_display = serializers.CharField(source='get_standard_display', read_only=True)
+    is_maintenance_due = serializers.BooleanField(read_only=True)
+    days_until_expiry = serializers.IntegerField(read_only=True)
+
+    # Model fields read by this serializer, for QuerySet.only()
+    model_fields = [
+        'id',
+        'certificate_number',
+        'status',
+        'standard',
+        'company_name',
+        'expiry_date',
+        'next_maintenance_date',
+    ]
+
+    class Meta:
+        model = Certificate
+        fields = [
+            'id',
+            'certificate_number',
+            'status',
+            'status_display',
+            'standard',
+            'standard_display',
+            'company_name',
+            'expiry_date',
+            'next_maintenance_date',
+            'is_maintenance_due',
+            'days_until_expiry'
+        ]
+        read_only_fields = fields
+
+
 class CertificateSiteCreateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating Certificate Sites (without certificate field)
@@ -122,6 +162,36 @@ class CertificateCreateSerializer(serializers.ModelSerializer):
         return CertificateSerializer(instance, context=self.context).data
 
 
+class CertificateImportSerializer(serializers.ModelSerializer):
+    """
+    Serializer validating one certificate of a bulk import.
+    Uniqueness of certificate_number is checked by the importer for the
+    whole file in a single query instead of once per row.
+    """
+    sites = CertificateSiteCreateSerializer(many=True, required=False)
+
+    class Meta:
+        model = Certificate
+        fields = [
+            'certificate_number',
+            'status',
+            'standard',
+            'company_name',
+            'address',
+            'first_issue_date',
+            'modification_date',
+            'expiry_date',
+            'scope_activity',
+            'iaf_code',
+            'next_maintenance_date',
+            'last_maintenance_date',
+            'sites'
+        ]
+        extra_kwargs = {
+            'certificate_number': {'required': False, 'allow_blank': True, 'validators': []},
+        }
+
+
 class CertificateMaintenanceSerializer(serializers.Serializer):
     """
     Serializer for performing maintenance on a certificate
@@ -0,0 +1,51 @@
+"""
+Signal handlers keeping certificate caches in sync with the database.
+"""
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_verify_cache
+from .models import ArtifactJob, Certificate, CertificateSite
+from .utils.pdf_cache import evict_certificate
+
+
+@receiver(post_save, sender=Certificate)
+@receiver(post_delete, sender=Certificate)
+def invalidate_certificate_caches(sender, instance, **kwargs):
+    invalidate_verify_cache(instance.secure_id)
+    evict_certificate(instance.pk)
+
+
+@receiver(post_save, sender=Certificate)
+def queue_certificate_pdfs(sender, instance, raw=False, **kwargs):
+    # Without a QR code yet, the QR job queues the PDFs once it is done
+    if settings.CERTIFICATE_ARTIFACTS_ASYNC and not raw and instance.qr_code:
+        ArtifactJob.enqueue(instance, ArtifactJob.KIND_PDF)
+
+
+@receiver(post_save, sender=CertificateSite)
+@receiver(post_delete, sender=CertificateSite)
+def invalidate_site_certificate_caches(sender, instance, **kwargs):
+    evict_certificate(instance.certificate_id)
+
+    if CertificateSite.certificate.is_cached(instance):
+        secure_id = instance.certificate.secure_id
+    else:
+        # The certificate may already be gone when its sites are cascade-deleted;
+        # its own post_delete handler covers that case.
+        secure_id = Certificate.objects.filter(
+            pk=instance.certificate_id
+        ).values_list('secure_id', flat=True).first()
+
+    if secure_id:
+        invalidate_verify_cache(secure_id)
+
+
+@receiver(post_save, sender=CertificateSite)
+def queue_site_certificate_pdfs(sender, instance, raw=False, **kwargs):
+    if settings.CERTIFICATE_ARTIFACTS_ASYNC and not raw:
+        certificate = instance.certificate
+        if certificate.qr_code:
+            ArtifactJob.enqueue(certificate, ArtifactJob.KIND_PDF)
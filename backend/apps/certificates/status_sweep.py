@@ -0,0 +1,85 @@
+"""
+Certificate Status Sweep
+
+Certificate.update_status() only runs when a certificate is saved, so
+certificates nobody touches keep their old status after they expire.
+sweep_expired_certificates() expires them all in a single set-based
+UPDATE; it is run nightly by `manage.py sweep_certificate_status` or by
+the optional in-process scheduler (CERTIFICATE_STATUS_SWEEP_INTERVAL).
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+
+from .cache import invalidate_all_verify_cache
+from .models import Certificate, StatusSweepLog
+
+logger = logging.getLogger(__name__)
+
+SWEEP_LOCK_KEY = 'certificates:status_sweep:lock'
+
+_scheduler = None
+
+
+def expired_queryset(today=None):
+    """Certificates past their expiry date that are not marked EXPIRED yet"""
+    today = today or timezone.now().date()
+    return Certificate.objects.filter(expiry_date__lt=today).exclude(status='EXPIRED')
+
+
+def sweep_expired_certificates(source='command'):
+    """Expire overdue certificates with one UPDATE and log the run"""
+    started = time.perf_counter()
+    expired_count = expired_queryset().update(status='EXPIRED', updated_at=timezone.now())
+    duration_ms = (time.perf_counter() - started) * 1000
+
+    if expired_count:
+        # The UPDATE skips the signal handlers that clear single entries
+        invalidate_all_verify_cache()
+
+    logger.info(f"Status sweep expired {expired_count} certificate(s) in {duration_ms:.1f} ms")
+    return StatusSweepLog.objects.create(
+        source=source,
+        expired_count=expired_count,
+        duration_ms=duration_ms,
+    )
+
+
+def start_scheduler(interval=None):
+    """
+    Run the sweep every `interval` seconds in a daemon thread.
+    Every web worker starts one; a cache lock lets only one of them sweep
+    per interval.
+    """
+    global _scheduler
+    interval = interval if interval is not None else settings.CERTIFICATE_STATUS_SWEEP_INTERVAL
+    if not interval or _scheduler is not None:
+        return None
+
+    _scheduler = threading.Thread(
+        target=_run_scheduler,
+        args=(interval,),
+        name='certificate-status-sweep',
+        daemon=True,
+    )
+    _scheduler.start()
+    return _scheduler
+
+
+def _run_scheduler(interval):
+    while True:
+        try:
+            if cache.add(SWEEP_LOCK_KEY, True, timeout=interval):
+                sweep_expired_certificates(source='scheduler')
+        except Exception as e:
+            logger.error(f"Scheduled status sweep failed: {e}")
+        finally:
+            # The thread keeps its own connection; do not hold it while sleeping
+            connection.close()
+        time.sleep(interval)
@@ -1,3 +1,432 @@
-from django.test import TestCase
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .importer import import_certificates, parse_json, read_import_file
+from . import artifacts
+from .cache import get_verify_cache_stats, invalidate_all_verify_cache, reset_verify_cache_stats, verify_cache_key
+from .models import (
+    ARTIFACT_JOB_MAX_ATTEMPTS, ARTIFACT_JOB_RETRY_DELAY_SECONDS, ArtifactJob, Certificate, CertificateSite
+)
+from .status_sweep import sweep_expired_certificates
+from .utils import pdf_cache, pdf_generator, render_pool
+
+CSV_HEADER = (
+    'certificate_number,standard,company_name,first_issue_date,expiry_date,scope_activity,iaf_code,'
+    'site_number,site_name,site_scope_activity,site_address\n'
+)
+
+
+def certificate(number):
+    return {
+        'certificate_number': number, 'standard': 'ISO_9001_2015', 'company_name': 'Acme',
+        'first_issue_date': '2024-01-01', 'expiry_date': '2027-01-01',
+        'scope_activity': 'Design', 'iaf_code': '28',
+    }
+
+
+def create_certificate(number, **kwargs):
+    return Certificate.objects.create(**{
+        'certificate_number': number, 'standard': 'ISO_9001_2015', 'company_name': 'Acme',
+        'address': 'Tirana', 'first_issue_date': date(2024, 1, 1), 'expiry_date': date(2027, 1, 1),
+        'scope_activity': 'Design', 'iaf_code': '28', **kwargs,
+    })
+
+
+def import_csv(rows, **kwargs):
+    return import_certificates(read_import_file(CSV_HEADER + ''.join(rows), 'csv'), **kwargs)
+
+
+# QR codes are queued rather than written to MEDIA_ROOT during the tests
+@override_settings(CERTIFICATE_ARTIFACTS_ASYNC=True)
+class CertificateImportTests(TestCase):
+    VALID = [
+        'MSC-1,ISO_9001_2015,Acme,2024-01-01,2027-01-01,Design,28,1,Head office,Storage,Tirana\n',
+        'MSC-1,ISO_9001_2015,Acme,2024-01-01,2027-01-01,Design,28,2,Warehouse,Storage,Durres\n',
+        'MSC-2,ISO_14001_2015,Beta,2024-02-01,2027-02-01,Design,28,,,,\n',
+    ]
+    INVALID = 'MSC-3,ISO_9001_2015,Gamma,2024-03-01,2023-03-01,Design,28,,,,\n'
+
+    def test_valid_file_is_imported_with_sites(self):
+        report = import_csv(self.VALID)
+
+        self.assertEqual((report['total'], report['created'], report['invalid']), (2, 2, 0))
+        self.assertEqual(
+            list(CertificateSite.objects.filter(certificate__certificate_number='MSC-1')
+                 .order_by('site_number').values_list('name', flat=True)),
+            ['Head office', 'Warehouse']
+        )
+        self.assertEqual(ArtifactJob.objects.count(), 2)
+
+    def test_invalid_rows_block_the_whole_import(self):
+        report = import_csv(self.VALID + [self.INVALID])
+
+        self.assertEqual(report['created'], 0)
+        self.assertEqual(report['invalid'], 1)
+        invalid = report['rows'][-1]
+        self.assertEqual((invalid['status'], invalid['row']), ('invalid', 5))
+        self.assertIn('expiry_date', invalid['errors'])
+        self.assertFalse(Certificate.objects.exists())
+
+    def test_duplicate_and_existing_numbers_are_rejected(self):
+        import_csv(self.VALID[2:])
+
+        # CSV rows sharing a number are one certificate's sites, so in-file
+        # duplicates can only come from JSON
+        report = import_certificates(parse_json([
+            certificate('MSC-2'), certificate('MSC-4'), certificate('MSC-4'),
+        ]))
+
+        self.assertEqual(report['invalid'], 2)
+        self.assertEqual([bool(row['errors']) for row in report['rows']], [True, False, True])
+        self.assertIn('Duplicate', report['rows'][2]['errors']['certificate_number'][0])
+        self.assertEqual(Certificate.objects.count(), 1)
+
+    def test_dry_run_validates_without_saving(self):
+        report = import_csv(self.VALID, dry_run=True)
+
+        self.assertEqual(report['created'], 0)
+        self.assertEqual({row['status'] for row in report['rows']}, {'valid'})
+        self.assertFalse(Certificate.objects.exists())
+
+    def test_skip_invalid_imports_the_valid_rows(self):
+        report = import_csv(self.VALID + [self.INVALID], skip_invalid=True)
+
+        self.assertEqual((report['created'], report['invalid']), (2, 1))
+        self.assertEqual(
+            sorted(Certificate.objects.values_list('certificate_number', flat=True)),
+            ['MSC-1', 'MSC-2']
+        )
+
+    @override_settings(CERTIFICATE_ARTIFACTS_ASYNC=False, CERTIFICATE_IMPORT_SYNC_LIMIT=1)
+    def test_api_refuses_large_files_while_qr_codes_are_synchronous(self):
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create_user('admin', is_staff=True))
+        payload = [certificate('MSC-1'), certificate('MSC-2')]
+
+        response = client.post('/api/certificates/bulk_import/', payload, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('import_certificates', response.data['error'])
+        self.assertFalse(Certificate.objects.exists())
+
+        response = client.post('/api/certificates/bulk_import/?dry_run=true', payload, format='json')
+        self.assertEqual(response.status_code, 200)
+
+
+class BrokenPool:
+    def submit(self, fn, job):
+        raise BrokenProcessPool('worker died')
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+class RenderPoolTests(TestCase):
+    def test_broken_pool_falls_back_to_in_process_rendering(self):
+        jobs = [(n, 'en') for n in range(render_pool.POOL_MIN_JOBS)]
+
+        with mock.patch.object(render_pool, '_get_pool', return_value=BrokenPool()), \
+                mock.patch.object(render_pool, '_render_job', side_effect=lambda job: job):
+            results = list(render_pool.iter_render(jobs, max_workers=2))
+
+        self.assertEqual(results, jobs)
+
+
+class CertificatePDFTests(TestCase):
+    def test_renders_share_one_background_image(self):
+        # pdf_generator registers the prebuilt image through ReportLab internals;
+        # this fails if an upgrade changes them
+        pdfs = [
+            pdf_generator.CertificatePDFGenerator(create_certificate(number), lang='en').render()
+            for number in ('MSC-1', 'MSC-2')
+        ]
+
+        background = os.path.join(pdf_generator.CertificatePDFGenerator.ASSETS_DIR, 'certificate_background.png')
+        image = pdf_generator._static_image(background)
+        for pdf in pdfs:
+            self.assertTrue(pdf.startswith(b'%PDF-'))
+            self.assertTrue(pdf.rstrip().endswith(b'%%EOF'))
+            xref = int(re.search(rb'startxref\s+(\d+)', pdf).group(1))
+            self.assertEqual(pdf[xref:xref + 4], b'xref')
+            self.assertEqual(pdf.count(f'/FormXob.{image.name} '.encode()), 1)
+            self.assertEqual(pdf.count(f'/Width {image.width}\n'.encode()), 1)
+
+
+@override_settings(CERTIFICATE_ARTIFACTS_ASYNC=True)
+class VerifyCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.certificate = create_certificate('MSC-1')
+        self.url = f'/api/certificates/verify/{self.certificate.secure_id}/'
+
+    def test_repeat_verify_is_served_from_cache(self):
+        first = self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(get_verify_cache_stats()['hits'], 1)
+        self.assertEqual(get_verify_cache_stats()['misses'], 1)
+
+    def test_certificate_save_drops_the_entry(self):
+        self.client.get(self.url)
+        self.certificate.company_name = 'Acme Group'
+        self.certificate.save()
+
+        self.assertEqual(self.client.get(self.url).data['company_name'], 'Acme Group')
+
+    def test_site_save_drops_the_entry(self):
+        self.client.get(self.url)
+        CertificateSite.objects.create(
+            certificate=self.certificate, site_number=1, name='Warehouse', address='Durres'
+        )
+
+        self.assertEqual([site['name'] for site in self.client.get(self.url).data['sites']], ['Warehouse'])
+
+    def test_invalidate_all_bumps_the_generation(self):
+        key = verify_cache_key(self.certificate.secure_id)
+        self.client.get(self.url)
+        reset_verify_cache_stats()
+
+        invalidate_all_verify_cache()
+
+        self.assertNotEqual(verify_cache_key(self.certificate.secure_id), key)
+        self.client.get(self.url)
+        self.assertEqual(get_verify_cache_stats()['misses'], 1)
+
+    def test_unknown_certificate_is_not_found(self):
+        response = self.client.get(f'/api/certificates/verify/{uuid.uuid4()}/')
+
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(CERTIFICATE_ARTIFACTS_ASYNC=True)
+class ConditionalRequestTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.certificate = create_certificate('MSC-1')
+        self.url = f'/api/certificates/verify/{self.certificate.secure_id}/'
+
+    def test_matching_etag_is_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_changed_certificate_gets_a_new_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        self.certificate.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_deleting_a_site_changes_the_etag(self):
+        site = CertificateSite.objects.create(certificate=self.certificate, site_number=1, address='Durres')
+        etag = self.client.get(self.url)['ETag']
+        site.delete()
+
+        self.assertNotEqual(self.client.get(self.url)['ETag'], etag)
+
+    def test_qr_code_honours_if_modified_since(self):
+        Certificate.objects.filter(pk=self.certificate.pk).update(qr_code='certificate_qr_codes/qr_MSC-1.png')
+        self.client.force_authenticate(get_user_model().objects.create_user('admin', is_staff=True))
+        url = f'/api/certificates/{self.certificate.pk}/qr_code/'
+        response = self.client.get(url)
+        self.assertIn('private', response['Cache-Control'])
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+
+        self.assertEqual(response.status_code, 304)
+
+
+class FakeGenerator:
+    def __init__(self, certificate, lang='en'):
+        self.certificate = certificate
+        self.lang = lang
+        self.renders = 0
+
+    def render(self):
+        self.renders += 1
+        return b'%PDF-' + self.certificate.company_name.encode()
+
+
+@override_settings(CERTIFICATE_ARTIFACTS_ASYNC=True)
+class PDFCacheTests(TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        settings_override = override_settings(CERTIFICATE_PDF_CACHE_DIR=self.cache_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.certificate = create_certificate('MSC-1')
+
+    def write(self, relative, size, age):
+        path = os.path.join(self.cache_dir, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(b'x' * size)
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_second_request_is_a_hit(self):
+        generator = FakeGenerator(self.certificate)
+
+        self.assertEqual(pdf_cache.get_or_render(generator), b'%PDF-Acme')
+        self.assertEqual(pdf_cache.get_or_render(generator), b'%PDF-Acme')
+        self.assertEqual(generator.renders, 1)
+
+    def test_certificate_change_is_not_served_stale(self):
+        pdf_cache.get_or_render(FakeGenerator(self.certificate))
+        self.certificate.company_name = 'Acme Group'
+        self.certificate.save()
+
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, str(self.certificate.pk))))
+        generator = FakeGenerator(self.certificate)
+        self.assertEqual(pdf_cache.get_or_render(generator), b'%PDF-Acme Group')
+        self.assertEqual(generator.renders, 1)
+
+    def test_trim_removes_least_recently_used_first(self):
+        oldest = self.write('1/a.pdf', 400, age=300)
+        older = self.write('2/b.pdf', 400, age=200)
+        newest = self.write('2/c.pdf', 400, age=100)
+
+        removed = pdf_cache.enforce_size_limit(max_bytes=1000)
+
+        self.assertEqual(removed, 1)
+        self.assertFalse(os.path.exists(oldest))
+        self.assertTrue(os.path.exists(older) and os.path.exists(newest))
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, '1')))
+
+    def test_trim_spares_writes_in_progress(self):
+        in_progress = self.write('1/new.tmp', 5000, age=1)
+        abandoned = self.write('1/old.tmp', 5000, age=pdf_cache.PDF_CACHE_TMP_GRACE + 60)
+        entry = self.write('1/a.pdf', 400, age=300)
+
+        self.assertEqual(pdf_cache.enforce_size_limit(max_bytes=1000), 0)
+
+        self.assertTrue(os.path.exists(in_progress))
+        self.assertFalse(os.path.exists(abandoned))
+        self.assertTrue(os.path.exists(entry))
+
+
+@override_settings(CERTIFICATE_ARTIFACTS_ASYNC=True)
+class ArtifactJobTests(TestCase):
+    def setUp(self):
+        self.certificate = create_certificate('MSC-1')
+
+    def test_qr_job_generates_the_code_and_queues_the_pdfs(self):
+        self.assertEqual(self.certificate.artifact_status, 'PENDING')
+
+        self.assertEqual(artifacts.process_jobs(), (1, 0))
+
+        self.certificate.refresh_from_db()
+        self.assertTrue(self.certificate.qr_code)
+        self.assertEqual(self.certificate.artifact_status, 'READY')
+        self.assertEqual(
+            list(ArtifactJob.objects.values_list('kind', 'status')),
+            [(ArtifactJob.KIND_PDF, ArtifactJob.STATUS_PENDING)]
+        )
+
+    def test_claim_takes_due_and_abandoned_jobs_only(self):
+        now = timezone.now()
+        ArtifactJob.objects.update(run_after=now + timedelta(minutes=5))
+        abandoned = ArtifactJob.objects.create(
+            certificate=self.certificate, kind=ArtifactJob.KIND_PDF, status=ArtifactJob.STATUS_RUNNING,
+            locked_at=now - artifacts.ARTIFACT_JOB_LOCK_TIMEOUT - timedelta(minutes=1), attempts=1,
+        )
+
+        jobs = artifacts.claim_jobs()
+
+        self.assertEqual([job.pk for job in jobs], [abandoned.pk])
+        abandoned.refresh_from_db()
+        self.assertEqual((abandoned.status, abandoned.attempts), (ArtifactJob.STATUS_RUNNING, 2))
+        self.assertEqual(artifacts.claim_jobs(), [])
+
+    def test_failed_job_is_retried_with_backoff_then_given_up(self):
+        ArtifactJob.objects.all().delete()
+        job = ArtifactJob.objects.create(certificate=self.certificate, kind=ArtifactJob.KIND_PDF)
+
+        with mock.patch.object(artifacts, '_render_pdfs', side_effect=OSError('disk full')):
+            self.assertEqual(artifacts.process_jobs(), (0, 1))
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.attempts, job.last_error), (ArtifactJob.STATUS_PENDING, 1, 'disk full'))
+            delay = (job.run_after - timezone.now()).total_seconds()
+            self.assertAlmostEqual(delay, ARTIFACT_JOB_RETRY_DELAY_SECONDS, delta=5)
+            self.assertEqual(artifacts.claim_jobs(), [])
+
+            for _ in range(ARTIFACT_JOB_MAX_ATTEMPTS - 1):
+                ArtifactJob.objects.filter(pk=job.pk).update(run_after=timezone.now())
+                artifacts.process_jobs()
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (ArtifactJob.STATUS_FAILED, ARTIFACT_JOB_MAX_ATTEMPTS))
+
+
+@override_settings(CERTIFICATE_ARTIFACTS_ASYNC=True)
+class StatusSweepTests(TestCase):
+    def test_overdue_certificates_are_expired_once(self):
+        overdue = create_certificate('MSC-1')
+        current = create_certificate('MSC-2')
+        # save() already expires overdue certificates, so backdate with update()
+        Certificate.objects.filter(pk=overdue.pk).update(expiry_date=date(2020, 1, 1))
+        key = verify_cache_key(overdue.secure_id)
+
+        log = sweep_expired_certificates()
+
+        self.assertEqual(log.expired_count, 1)
+        self.assertEqual(Certificate.objects.get(pk=overdue.pk).status, 'EXPIRED')
+        self.assertNotEqual(Certificate.objects.get(pk=current.pk).status, 'EXPIRED')
+        self.assertNotEqual(verify_cache_key(overdue.secure_id), key)
+        self.assertEqual(sweep_expired_certificates().expired_count, 0)
+
+
+@override_settings(CERTIFICATE_ARTIFACTS_ASYNC=True)
+class CertificateListTests(TestCase):
+    LIST_FIELDS = {
+        'id', 'certificate_number', 'status', 'status_display', 'standard', 'standard_display',
+        'company_name', 'expiry_date', 'next_maintenance_date', 'is_maintenance_due', 'days_until_expiry',
+    }
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user('admin', is_staff=True))
+        today = timezone.now().date()
+        for n, days in enumerate((30, 10, 20), start=1):
+            create_certificate(f'MSC-{n}', status='VALID', expiry_date=today + timedelta(days=days))
+
+    def test_page_number_shape(self):
+        response = self.client.get('/api/certificates/expiring_soon/?page_size=2')
+
+        self.assertEqual(set(response.data), {'count', 'next', 'previous', 'results'})
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(set(response.data['results'][0]), self.LIST_FIELDS)
+        self.assertEqual([row['certificate_number'] for row in response.data['results']], ['MSC-2', 'MSC-3'])
+
+    def test_cursor_shape(self):
+        response = self.client.get('/api/certificates/expiring_soon/?pagination=cursor&page_size=2')
+
+        self.assertEqual(set(response.data), {'next', 'previous', 'results'})
+        self.assertEqual(set(response.data['results'][0]), self.LIST_FIELDS)
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual([row['certificate_number'] for row in response.data['results']], ['MSC-1'])
@@ -0,0 +1,57 @@
+"""
+Conditional GET support (ETag / Last-Modified) for certificate endpoints.
+
+Validators are derived from Certificate.updated_at, the newest site
+updated_at and the site count (so deleting a site also changes the tag),
+letting scanners and browsers revalidate with a cheap 304.
+"""
+
+import hashlib
+from calendar import timegm
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def certificate_validators(certificate):
+    """
+    Return (etag, last_modified) for a certificate.
+
+    Uses the prefetched sites when available, so no extra query is issued
+    for querysets built with prefetch_related('sites').
+    """
+    sites = list(certificate.sites.all())
+    last_modified = max([certificate.updated_at] + [site.updated_at for site in sites])
+    raw = ':'.join([
+        str(certificate.pk),
+        certificate.updated_at.isoformat(),
+        last_modified.isoformat(),
+        str(len(sites)),
+        certificate.qr_code.name or '',
+    ])
+    etag = quote_etag(hashlib.sha256(raw.encode()).hexdigest()[:32])
+    return etag, last_modified
+
+
+def not_modified_response(request, etag, last_modified):
+    """Return a 304 response if the client's copy is still current, else None"""
+    return get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=_timestamp(last_modified),
+    )
+
+
+def set_validators(response, etag, last_modified, public=False):
+    """Attach ETag/Last-Modified and ask caches to revalidate before reuse"""
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(_timestamp(last_modified))
+    if public:
+        patch_cache_control(response, public=True, no_cache=True)
+    else:
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _timestamp(value):
+    return int(timegm(value.utctimetuple()))
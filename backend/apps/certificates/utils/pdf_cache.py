@@ -0,0 +1,229 @@
+"""
+Rendered PDF Cache for Certificates
+
+Stores PDFs produced by CertificatePDFGenerator on disk so repeat downloads
+skip the ReportLab render entirely.
+
+Layout: CERTIFICATE_PDF_CACHE_DIR/<certificate pk>/<content hash>.pdf
+
+The content hash covers every input the generator reads (certificate fields,
+sites, signature and QR files, static assets and the language), so an entry
+can never be served stale. Entries for a certificate are removed when it is
+edited (see signals.py) and the whole cache is trimmed least-recently-used
+first once it grows past CERTIFICATE_PDF_CACHE_MAX_BYTES.
+
+Trimming walks the whole cache directory, so a miss does not trigger it
+directly: each process keeps an estimate of the cache size (the total at
+its last walk plus what it wrote since) and walks again only when the
+estimate passes the cap or PDF_CACHE_TRIM_INTERVAL seconds have gone by,
+which catches what other processes wrote.
+
+A trim leaves .tmp files younger than PDF_CACHE_TMP_GRACE alone (another
+process may be writing them), deletes older ones as leftovers of crashed
+writes, and removes certificate directories it leaves empty.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when the PDF layout changes so old renders are no longer matched
+PDF_CACHE_VERSION = '2'
+
+ASSETS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    'static', 'certificates', 'img'
+)
+STATIC_ASSETS = ('certificate_background.png', 'signature.png')
+
+PDF_CACHE_TRIM_INTERVAL = 300
+# A trim frees space down to this share of the cap, so the next one is
+# not due again after a single write
+PDF_CACHE_TRIM_TARGET = 0.9
+# Seconds after which a .tmp file is taken to be abandoned, not in progress
+PDF_CACHE_TMP_GRACE = 600
+
+# Cache size estimate of this process; None until the first walk
+_size_estimate = None
+_last_trim = 0.0
+_trim_lock = threading.Lock()
+
+
+def pdf_cache_key(certificate, lang):
+    """Hash of everything CertificatePDFGenerator reads for this certificate"""
+    parts = [
+        PDF_CACHE_VERSION,
+        lang,
+        certificate.certificate_number,
+        certificate.company_name,
+        certificate.standard,
+        certificate.address,
+        certificate.scope_activity,
+        certificate.iaf_code,
+        certificate.first_issue_date,
+        certificate.modification_date,
+        certificate.expiry_date,
+        _file_fingerprint(certificate.signature),
+        _file_fingerprint(certificate.qr_code),
+    ]
+    for site in sorted(certificate.sites.all(), key=lambda s: s.site_number):
+        parts.extend([site.site_number, site.name, site.address])
+    for asset in STATIC_ASSETS:
+        parts.append(_path_fingerprint(os.path.join(ASSETS_DIR, asset)))
+
+    return hashlib.sha256('\x1f'.join(str(p) for p in parts).encode()).hexdigest()
+
+
+def get_or_render(generator):
+    """
+    Return the PDF bytes for a generator, rendering and storing them on a miss.
+    """
+    certificate = generator.certificate
+    path = _entry_path(certificate.pk, pdf_cache_key(certificate, generator.lang))
+
+    try:
+        with open(path, 'rb') as f:
+            pdf = f.read()
+    except FileNotFoundError:
+        pdf = None
+
+    if pdf is not None:
+        try:
+            os.utime(path)  # mark as recently used for LRU eviction
+        except OSError:
+            pass
+        return pdf
+
+    pdf = generator.render()
+    try:
+        _store(path, pdf)
+        _note_write(len(pdf))
+    except OSError as e:
+        logger.warning(f"Could not cache PDF for certificate {certificate.pk}: {e}")
+    return pdf
+
+
+def evict_certificate(certificate_pk):
+    """Drop every cached PDF of a certificate"""
+    shutil.rmtree(_certificate_dir(certificate_pk), ignore_errors=True)
+
+
+def _note_write(size):
+    """Count a new entry and trim the cache when it may have outgrown the cap"""
+    global _size_estimate
+    with _trim_lock:
+        if _size_estimate is not None:
+            _size_estimate += size
+        due = (
+            _size_estimate is None
+            or _size_estimate > settings.CERTIFICATE_PDF_CACHE_MAX_BYTES
+            or time.monotonic() - _last_trim > PDF_CACHE_TRIM_INTERVAL
+        )
+    if due:
+        enforce_size_limit()
+
+
+def enforce_size_limit(max_bytes=None):
+    """
+    Once the cache is over max_bytes, delete least recently used entries
+    until it is down to PDF_CACHE_TRIM_TARGET of it
+    """
+    global _size_estimate, _last_trim
+    if max_bytes is None:
+        max_bytes = settings.CERTIFICATE_PDF_CACHE_MAX_BYTES
+
+    entries = []
+    directories = []
+    total = 0
+    now = time.time()
+    for root, _dirs, files in os.walk(settings.CERTIFICATE_PDF_CACHE_DIR):
+        directories.append(root)
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+                if name.endswith('.tmp'):
+                    if now - stat.st_mtime > PDF_CACHE_TMP_GRACE:
+                        os.remove(path)
+                    continue
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+    removed = 0
+    if total > max_bytes:
+        target = int(max_bytes * PDF_CACHE_TRIM_TARGET)
+        for _mtime, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            total -= size
+            removed += 1
+            if total <= target:
+                break
+
+    # Deepest first; rmdir() refuses the ones still holding files
+    for directory in reversed(directories[1:]):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            pass
+
+    with _trim_lock:
+        _size_estimate = total
+        _last_trim = time.monotonic()
+    return removed
+
+
+def _certificate_dir(certificate_pk):
+    return os.path.join(settings.CERTIFICATE_PDF_CACHE_DIR, str(certificate_pk))
+
+
+def _entry_path(certificate_pk, key):
+    return os.path.join(_certificate_dir(certificate_pk), f'{key}.pdf')
+
+
+def _store(path, pdf):
+    """Write atomically so concurrent readers never see a partial file"""
+    directory = os.path.dirname(path)
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    except FileNotFoundError:
+        # New certificate, or a trim just removed the empty directory
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(pdf)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _file_fingerprint(field_file):
+    if not field_file:
+        return ''
+    try:
+        return f'{field_file.name}:{_path_fingerprint(field_file.path)}'
+    except (NotImplementedError, ValueError):
+        return field_file.name
+
+
+def _path_fingerprint(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return 'missing'
+    return f'{stat.st_size}:{stat.st_mtime_ns}'
@@ -0,0 +1,82 @@
+"""
+Bulk Certificate PDF Export
+
+Streams a ZIP archive of certificate PDFs to the client while they are being
+rendered: each PDF is written to the archive and flushed to the response
+before the next one is produced, so the archive is never held in memory.
+Rendering goes through render_pool, so large exports use every core.
+"""
+
+import zipfile
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from .pdf_generator import LANGUAGES
+from .render_pool import build_jobs, iter_render
+
+EXPORT_CHUNK_SIZE = 50
+
+
+class _StreamBuffer:
+    """Write-only file object collecting ZIP output between yields"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def parse_languages(value):
+    """Parse a comma-separated language list, defaulting to every supported language"""
+    languages = [lang.strip() for lang in (value or '').split(',')]
+    languages = [lang for lang in dict.fromkeys(languages) if lang in LANGUAGES]
+    return languages or list(LANGUAGES)
+
+
+def iter_certificate_zip(queryset, languages):
+    """
+    Yield the ZIP archive in chunks, one chunk per rendered PDF.
+
+    Certificates that fail to render are left out and listed in errors.txt
+    at the end of the archive instead of aborting the download.
+    """
+    certificate_ids = queryset.values_list('pk', flat=True).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    buffer = _StreamBuffer()
+    errors = []
+
+    # PDFs are already deflated internally, so the archive only stores them
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for result in iter_render(build_jobs(certificate_ids, languages)):
+            if result.error:
+                errors.append(f'certificate {result.certificate_id} ({result.lang}): {result.error}')
+                continue
+            archive.writestr(get_valid_filename(result.filename), result.pdf)
+            yield buffer.drain()
+
+        if errors:
+            archive.writestr('errors.txt', '\n'.join(errors) + '\n')
+
+    yield buffer.drain()
+
+
+def certificate_zip_response(queryset, languages):
+    """StreamingHttpResponse with the PDFs of every certificate in queryset"""
+    response = StreamingHttpResponse(
+        iter_certificate_zip(queryset, languages),
+        content_type='application/zip'
+    )
+    timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
+    response['Content-Disposition'] = f'attachment; filename="certificates_{timestamp}.zip"'
+    return response
@@ -15,10 +15,17 @@ from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.units import mm
 from reportlab.pdfgen import canvas
-from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase import pdfdoc, pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.lib.boxstuff import aspectRatioFix
+from reportlab.lib.rl_accel import asciiBase85Decode
 from io import BytesIO
+import copy
+import hashlib
 import os
+import zlib
+
+from .pdf_cache import get_or_render
 
 
 # ── Font registration ────────────────────────────────────────────────────
@@ -49,6 +56,42 @@ def _register_poppins():
     _fonts_registered = True
 
 
+# ── Static image layer ───────────────────────────────────────────────────
+# Decoding and compressing the full-page background PNG dominates render
+# time, so static assets are turned into a PDF image XObject once per
+# process and a shallow copy is registered with each new canvas.
+
+_static_images = {}
+
+
+def _static_image(path):
+    """Return the prebuilt image XObject for a static asset (reloaded if the file changes)."""
+    key = (path, os.stat(path).st_mtime_ns)
+    image = _static_images.get(key)
+    if image is None:
+        name = hashlib.md5(f'{path}:{key[1]}'.encode()).hexdigest()
+        image = pdfdoc.PDFImageXObject(name, path, mask='auto')
+        image.name = name
+        _compact_stream(image)
+        if getattr(image, '_smask', None):
+            _compact_stream(image._smask)
+        _static_images[key] = image
+    return image
+
+
+def _compact_stream(image):
+    """Store the stream as binary, maximally deflated data (paid once per process)."""
+    filters = tuple(image._filters)
+    content = image.streamContent
+    if filters[:1] == ('ASCII85Decode',):
+        content = asciiBase85Decode(content)
+        filters = filters[1:]
+    if filters == ('FlateDecode',):
+        content = zlib.compress(zlib.decompress(content), 9)
+    image.streamContent = content
+    image._filters = filters
+
+
 # ── Multilingual text definitions ────────────────────────────────────────
 
 LANGUAGES = {
@@ -311,12 +354,19 @@ class CertificatePDFGenerator:
         self.texts = LANGUAGES[self.lang]
         self.c = None
 
+    @property
+    def filename(self):
+        return f'certificate_{self.certificate.certificate_number}_{self.lang}.pdf'
+
     def generate(self):
+        """Return the PDF as a download response, served from the PDF cache when possible"""
         response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = (
-            f'attachment; filename="certificate_{self.certificate.certificate_number}_{self.lang}.pdf"'
-        )
+        response['Content-Disposition'] = f'attachment; filename="{self.filename}"'
+        response.write(get_or_render(self))
+        return response
 
+    def render(self):
+        """Render the certificate and return the PDF bytes (bypasses the cache)"""
         buffer = BytesIO()
         self.c = canvas.Canvas(buffer, pagesize=A4)
         self.c.setTitle(f"Certificate - {self.certificate.certificate_number}")
@@ -326,8 +376,7 @@ class CertificatePDFGenerator:
         self.c.save()
         pdf = buffer.getvalue()
         buffer.close()
-        response.write(pdf)
-        return response
+        return pdf
 
     def _y_from_top(self, mm_from_top):
         """Convert spec Y (mm from top of page) to ReportLab Y (points from bottom)."""
@@ -339,7 +388,8 @@ class CertificatePDFGenerator:
         label = self.texts['address_label'].upper()
         sites = []
         try:
-            sites = list(self.certificate.sites.all().order_by('site_number'))
+            # Sort in Python so prefetched sites are reused without a query
+            sites = sorted(self.certificate.sites.all(), key=lambda s: s.site_number)
         except Exception:
             sites = []
 
@@ -386,14 +436,12 @@ class CertificatePDFGenerator:
     # ── Background: full-page PNG with stripe, logos, watermark, badge ──
 
     def _draw_background(self):
-        c = self.c
         bg_path = os.path.join(self.ASSETS_DIR, 'certificate_background.png')
         if not os.path.exists(bg_path):
             return
         try:
-            c.drawImage(bg_path, 0, 0,
-                        width=self.PAGE_WIDTH, height=self.PAGE_HEIGHT,
-                        preserveAspectRatio=False, mask='auto')
+            self._draw_static_image(bg_path, 0, 0,
+                                    width=self.PAGE_WIDTH, height=self.PAGE_HEIGHT)
         except Exception:
             pass
 
@@ -598,9 +646,9 @@ class CertificatePDFGenerator:
             sig_path = os.path.join(self.ASSETS_DIR, 'signature.png')
             if os.path.exists(sig_path):
                 try:
-                    c.drawImage(sig_path, center_x - sig_width / 2, line_y + 5,
-                                width=sig_width, height=sig_height,
-                                preserveAspectRatio=True, mask='auto')
+                    self._draw_static_image(sig_path, center_x - sig_width / 2, line_y + 5,
+                                            width=sig_width, height=sig_height,
+                                            preserveAspectRatio=True)
                 except Exception:
                     pass
 
@@ -706,6 +754,39 @@ class CertificatePDFGenerator:
 
     # ── Utilities ────────────────────────────────────────────────────
 
+    def _draw_static_image(self, path, x, y, width, height, preserveAspectRatio=False):
+        """
+        Equivalent of canvas.drawImage(path, ..., mask='auto') that reuses the
+        per-process XObject from _static_image() instead of re-encoding the file.
+        """
+        c = self.c
+        prebuilt = _static_image(path)
+        reg_name = c._doc.getXObjectName(prebuilt.name)
+        image = c._doc.idToObject.get(reg_name)
+        if image is None:
+            # Documents tag registered objects, so each canvas gets its own copy
+            image = copy.copy(prebuilt)
+            c._setXObjects(image)
+            c._doc.Reference(image, reg_name)
+            c._doc.addForm(prebuilt.name, image)
+            smask = getattr(prebuilt, '_smask', None)
+            if smask:
+                smask = copy.copy(smask)
+                c._setXObjects(smask)
+                image.smask = c._doc.Reference(smask, c._doc.getXObjectName(smask.name))
+                del image._smask
+
+        x, y, width, height, _scaled = aspectRatioFix(
+            preserveAspectRatio, 'c', x, y, width, height, image.width, image.height
+        )
+        c._currentPageHasImages = 1
+        c.saveState()
+        c.translate(x, y)
+        c.scale(width, height)
+        c._code.append(f'/{reg_name} Do')
+        c.restoreState()
+        c._formsinuse.append(prebuilt.name)
+
     def _draw_spaced_text(self, x, y, text, spacing=4, centered=False):
         c = self.c
         font_name = c._fontname
@@ -0,0 +1,147 @@
+"""
+Process-Pool PDF Rendering
+
+Rendering a certificate PDF is pure-Python CPU work, so large batches are
+farmed out to a ProcessPoolExecutor instead of running inside a web worker.
+Each pool process sets up Django once, registers the Poppins fonts and
+prebuilds the static background before taking jobs.
+
+There is one pool per process, shared by concurrent batches and started on
+first use with CERTIFICATE_PDF_RENDER_WORKERS processes, so two exports
+running in one gunicorn worker do not each start their own. If a pool
+process dies, the pool is dropped and the batch finishes in-process.
+
+A job is a (certificate_id, lang) pair; results come back in job order.
+Small batches are rendered in-process, where starting a pool would cost
+more than it saves.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain, islice
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Below this many jobs the batch is rendered in the calling process;
+# spawning and setting up the workers takes a couple of seconds
+POOL_MIN_JOBS = 64
+
+RenderResult = namedtuple('RenderResult', ['certificate_id', 'lang', 'filename', 'pdf', 'error'])
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def build_jobs(certificate_ids, languages):
+    """Expand certificate IDs and languages into (certificate_id, lang) jobs"""
+    return ((certificate_id, lang) for certificate_id in certificate_ids for lang in languages)
+
+
+def render_certificates(certificate_ids, languages, max_workers=None):
+    """Render every certificate in every language and return the results in order"""
+    return list(iter_render(build_jobs(certificate_ids, languages), max_workers=max_workers))
+
+
+def _get_pool(max_workers):
+    """The process's shared pool; max_workers only applies when it is started"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+            )
+        return _pool
+
+
+def _drop_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_render(jobs, max_workers=None):
+    """
+    Yield a RenderResult per job, in job order.
+
+    jobs may be a lazy iterable; at most two jobs per worker are in flight,
+    so results do not pile up in memory while the consumer is slow.
+    """
+    jobs = iter(jobs)
+    head = list(islice(jobs, POOL_MIN_JOBS))
+    max_workers = max_workers or settings.CERTIFICATE_PDF_RENDER_WORKERS
+
+    if len(head) < POOL_MIN_JOBS or max_workers <= 1:
+        for job in chain(head, jobs):
+            yield _render_job(job)
+        return
+
+    # The rest of head is fed through the refill loop with the others
+    jobs = chain(head, jobs)
+    pool = _get_pool(max_workers)
+    pending = deque()
+    try:
+        for job in islice(jobs, max_workers * 2):
+            _submit(pool, pending, job)
+
+        while pending:
+            result = pending[0][1].result()
+            pending.popleft()
+            yield result
+            next_job = next(jobs, None)
+            if next_job is not None:
+                _submit(pool, pending, next_job)
+    except BrokenProcessPool:
+        logger.error("PDF render pool broke, rendering the rest of the batch in-process")
+        _drop_pool(pool)
+        for job in chain([job for job, _future in pending], jobs):
+            yield _render_job(job)
+    finally:
+        # The consumer may stop early (a client disconnecting from an export)
+        for _job, future in pending:
+            if future is not None:
+                future.cancel()
+
+
+def _submit(pool, pending, job):
+    # Queued before submitting, so the job is not lost if the pool is broken
+    pending.append([job, None])
+    pending[-1][1] = pool.submit(_render_job, job)
+
+
+def _init_worker():
+    """Runs once in every pool process before it takes jobs"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+    import django
+    django.setup()
+
+    from .pdf_generator import CertificatePDFGenerator, _register_poppins, _static_image
+    _register_poppins()
+    background = os.path.join(CertificatePDFGenerator.ASSETS_DIR, 'certificate_background.png')
+    if os.path.exists(background):
+        _static_image(background)
+
+
+def _render_job(job):
+    from ..models import Certificate
+    from .pdf_cache import get_or_render
+    from .pdf_generator import CertificatePDFGenerator
+
+    certificate_id, lang = job
+    try:
+        certificate = Certificate.objects.prefetch_related('sites').get(pk=certificate_id)
+        generator = CertificatePDFGenerator(certificate, lang=lang)
+        return RenderResult(certificate_id, generator.lang, generator.filename, get_or_render(generator), None)
+    except Exception as e:
+        logger.error(f"Failed to render PDF for certificate {certificate_id} ({lang}): {e}")
+        return RenderResult(certificate_id, lang, None, None, str(e))
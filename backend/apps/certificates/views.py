@@ -1,6 +1,5 @@
 import logging
 from django.conf import settings
-from django.core.mail import send_mail
 from django.utils import timezone
 from datetime import timedelta
 from rest_framework import viewsets, status
@@ -9,15 +8,21 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser, AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from django.shortcuts import get_object_or_404
+from apps.outbox.mail import enqueue_mail
 from .models import Certificate, CertificateSite, EXPIRING_SOON_DAYS
+from .cache import get_verify_entry, get_verify_cache_stats
+from .importer import CertificateImportError, import_certificates, parse_json, read_import_file
 from .serializers import (
     CertificateSerializer,
     CertificateCreateSerializer,
+    CertificateListSerializer,
     CertificateSiteSerializer,
     CertificateMaintenanceSerializer
 )
+from .pagination import get_list_paginator
 from .utils.pdf_generator import CertificatePDFGenerator
+from .utils.pdf_export import certificate_zip_response, parse_languages
+from .utils.conditional import certificate_validators, not_modified_response, set_validators
 
 logger = logging.getLogger(__name__)
 
@@ -32,9 +37,12 @@ class CertificateViewSet(viewsets.ModelViewSet):
     - perform_maintenance: Mark certificate as maintained (admin)
     - qr_code: Get QR code info (admin)
     - download_pdf: Download certificate PDF (admin)
+    - export_pdfs: Download PDFs of many certificates as a streamed ZIP (admin)
+    - bulk_import: Import certificates and sites from CSV/JSON (admin)
     - expiring_soon: List certificates expiring within 90 days (admin)
     - maintenance_due: List certificates with overdue maintenance (admin)
     - verify: Public endpoint to verify certificate by UUID (no auth required)
+    - verify_cache_stats: Hit/miss counters for the verify cache (admin)
     """
     queryset = Certificate.objects.select_related().prefetch_related('sites')
     permission_classes = [IsAdminUser]
@@ -80,13 +88,19 @@ class CertificateViewSet(viewsets.ModelViewSet):
         certificate = self.get_object()
 
         if certificate.qr_code:
-            return Response({
+            etag, last_modified = certificate_validators(certificate)
+            not_modified = not_modified_response(request, etag, last_modified)
+            if not_modified is not None:
+                return not_modified
+
+            response = Response({
                 'certificate_number': certificate.certificate_number,
                 'qr_code_url': request.build_absolute_uri(certificate.qr_code.url),
                 'company_name': certificate.company_name,
                 'status': certificate.get_status_display(),
                 'secure_url': f"{request.scheme}://{request.get_host()}/api/certificates/verify/{certificate.secure_id}/"
             })
+            return set_validators(response, etag, last_modified)
         else:
             return Response({
                 'error': 'QR code not generated yet'
@@ -104,13 +118,18 @@ class CertificateViewSet(viewsets.ModelViewSet):
         certificate = self.get_object()
 
         if certificate.qr_code and certificate.qr_code.name:
+            etag, last_modified = certificate_validators(certificate)
+            not_modified = not_modified_response(request, etag, last_modified)
+            if not_modified is not None:
+                return not_modified
+
             try:
                 response = FileResponse(
                     certificate.qr_code.open('rb'),
                     content_type='image/png'
                 )
                 response['Content-Disposition'] = f'attachment; filename="QR_{certificate.certificate_number}.png"'
-                return response
+                return set_validators(response, etag, last_modified)
             except Exception as e:
                 return Response({
                     'error': f'Error downloading QR code: {str(e)}'
@@ -128,29 +147,33 @@ class CertificateViewSet(viewsets.ModelViewSet):
         GET /api/certificates/verify/{uuid}/
         No authentication required - this is the public verification endpoint
 
-        Returns certificate details for display on frontend
+        Returns certificate details for display on frontend.
+        The rendered payload is cached per UUID (see cache.py) and sent with
+        ETag/Last-Modified, so repeat scans can be answered with 304.
         """
-        try:
-            certificate = get_object_or_404(Certificate, secure_id=secure_id)
-
-            # Return limited public information
-            return Response({
-                'certificate_number': certificate.certificate_number,
-                'company_name': certificate.company_name,
-                'standard': certificate.get_standard_display(),
-                'status': certificate.get_status_display(),
-                'first_issue_date': certificate.first_issue_date,
-                'expiry_date': certificate.expiry_date,
-                'scope_activity': certificate.scope_activity,
-                'iaf_code': certificate.iaf_code,
-                'is_valid': certificate.status == 'VALID',
-                'sites': CertificateSiteSerializer(certificate.sites.all(), many=True).data
-            }, status=status.HTTP_200_OK)
-        except Exception as e:
+        entry = get_verify_entry(secure_id)
+        if entry is None:
             return Response({
                 'error': 'Certificate not found or invalid UUID'
             }, status=status.HTTP_404_NOT_FOUND)
 
+        not_modified = not_modified_response(request, entry['etag'], entry['last_modified'])
+        if not_modified is not None:
+            return not_modified
+
+        response = Response(entry['payload'], status=status.HTTP_200_OK)
+        return set_validators(response, entry['etag'], entry['last_modified'], public=True)
+
+    @action(detail=False, methods=['get'])
+    def verify_cache_stats(self, request):
+        """
+        Hit/miss counters for the public verification cache
+
+        GET /api/certificates/verify_cache_stats/
+        Headers: Authorization: Token <admin_token>
+        """
+        return Response(get_verify_cache_stats())
+
     @action(detail=False, methods=['post'], permission_classes=[AllowAny], authentication_classes=[])
     def search(self, request):
         """
@@ -202,12 +225,10 @@ Certificate Details:
 This request was submitted from the MSC Certifications website.
             """
 
-            send_mail(
+            enqueue_mail(
                 subject=admin_subject,
                 message=admin_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
                 recipient_list=['info@msc-cert.com'],
-                fail_silently=False
             )
 
             # Send confirmation to requester
@@ -228,12 +249,10 @@ Email: info@msc-cert.com
 Phone: +355 67 206 3632
             """
 
-            send_mail(
+            enqueue_mail(
                 subject=user_subject,
                 message=user_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
                 recipient_list=[email],
-                fail_silently=True
             )
 
             logger.info(f"Certificate search request submitted by {email} for {certificate_number}")
@@ -244,7 +263,7 @@ Phone: +355 67 206 3632
             }, status=status.HTTP_200_OK)
 
         except Exception as e:
-            logger.error(f"Failed to send certificate search email: {str(e)}")
+            logger.error(f"Failed to queue certificate search email: {str(e)}")
             return Response({
                 'success': False,
                 'message': 'Failed to submit your request. Please try again or contact us directly at info@msc-cert.com'
@@ -255,34 +274,42 @@ Phone: +355 67 206 3632
         """
         Get certificates expiring within configured days (default 90)
 
-        GET /api/certificates/expiring_soon/
+        GET /api/certificates/expiring_soon/?page=1&page_size=10
+        GET /api/certificates/expiring_soon/?pagination=cursor
         Headers: Authorization: Token <admin_token>
         """
         expiry_threshold = timezone.now().date() + timedelta(days=EXPIRING_SOON_DAYS)
-        certificates = self.queryset.filter(
+        certificates = Certificate.objects.filter(
             expiry_date__lte=expiry_threshold,
             expiry_date__gte=timezone.now().date(),
             status='VALID'
         )
 
-        serializer = self.get_serializer(certificates, many=True)
-        return Response(serializer.data)
+        return self._paginated_list(certificates, ('expiry_date', 'id'))
 
     @action(detail=False, methods=['get'])
     def maintenance_due(self, request):
         """
         Get certificates with maintenance due
 
-        GET /api/certificates/maintenance_due/
+        GET /api/certificates/maintenance_due/?page=1&page_size=10
+        GET /api/certificates/maintenance_due/?pagination=cursor
         Headers: Authorization: Token <admin_token>
         """
-        certificates = self.queryset.filter(
+        certificates = Certificate.objects.filter(
             next_maintenance_date__lte=timezone.now().date(),
             status='VALID'
         )
 
-        serializer = self.get_serializer(certificates, many=True)
-        return Response(serializer.data)
+        return self._paginated_list(certificates, ('next_maintenance_date', 'id'))
+
+    def _paginated_list(self, queryset, ordering):
+        """Page through a dashboard list with the lean list serializer"""
+        queryset = queryset.only(*CertificateListSerializer.model_fields).order_by(*ordering)
+        paginator = get_list_paginator(self.request, ordering)
+        page = paginator.paginate_queryset(queryset, self.request, view=self)
+        serializer = CertificateListSerializer(page, many=True, context=self.get_serializer_context())
+        return paginator.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['get'])
     def download_pdf(self, request, pk=None):
@@ -299,6 +326,78 @@ Phone: +355 67 206 3632
         pdf_generator = CertificatePDFGenerator(certificate, lang=lang)
         return pdf_generator.generate()
 
+    @action(detail=False, methods=['get'])
+    def export_pdfs(self, request):
+        """
+        Download PDFs of several certificates as a streamed ZIP archive
+
+        GET /api/certificates/export_pdfs/?ids=1,2,3&lang=sq,en,it
+        Headers: Authorization: Token <admin_token>
+
+        Without ids, every certificate matching the list filters is exported.
+        lang defaults to all supported languages.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+
+        ids = request.query_params.get('ids')
+        if ids:
+            try:
+                ids = [int(pk) for pk in ids.split(',') if pk.strip()]
+            except ValueError:
+                return Response({
+                    'error': 'ids must be a comma-separated list of certificate IDs'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            queryset = queryset.filter(pk__in=ids)
+
+        if not queryset.exists():
+            return Response({
+                'error': 'No certificates matched the export'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        languages = parse_languages(request.query_params.get('lang'))
+        return certificate_zip_response(queryset, languages)
+
+    @action(detail=False, methods=['post'])
+    def bulk_import(self, request):
+        """
+        Import certificates and their sites from a CSV or JSON file
+
+        POST /api/certificates/bulk_import/?dry_run=true&skip_invalid=true
+        Headers: Authorization: Token <admin_token>
+        Body: multipart/form-data with a .csv or .json `file`,
+              or a JSON list of certificates with nested sites
+
+        The whole file is validated first. Unless skip_invalid is set,
+        nothing is imported when any row has errors. Returns a per-row report.
+        Larger files than CERTIFICATE_IMPORT_SYNC_LIMIT are refused while QR
+        codes are generated in the request; use the import_certificates command.
+        """
+        dry_run = request.query_params.get('dry_run', '').lower() in ('1', 'true')
+        skip_invalid = request.query_params.get('skip_invalid', '').lower() in ('1', 'true')
+
+        upload = request.FILES.get('file')
+        try:
+            if upload:
+                records = read_import_file(upload.read(), request.data.get('format') or upload.name)
+            else:
+                records = parse_json(request.data)
+            report = import_certificates(
+                records,
+                dry_run=dry_run,
+                skip_invalid=skip_invalid,
+                sync_limit=settings.CERTIFICATE_IMPORT_SYNC_LIMIT,
+            )
+        except CertificateImportError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if report['created']:
+            response_status = status.HTTP_201_CREATED
+        elif report['invalid'] and not dry_run:
+            response_status = status.HTTP_400_BAD_REQUEST
+        else:
+            response_status = status.HTTP_200_OK
+        return Response(report, status=response_status)
+
 
 class CertificateSiteViewSet(viewsets.ModelViewSet):
     """
@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.db.models import Count
+from .stats import annotate_template_counts
 from .models import (
     FormTemplate, FormSection, FormQuestion,
     FormSubmission, FormAnswer, FormSubmissionLog
@@ -65,20 +66,18 @@ class FormTemplateAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at', 'updated_at']
 
     def get_queryset(self, request):
-        return super().get_queryset(request).annotate(
-            _questions_count=Count('sections__questions', distinct=True),
-            _submissions_count=Count('submissions', distinct=True)
-        )
+        # Submission counts are read from the SubmissionStats rollup
+        return annotate_template_counts(super().get_queryset(request))
 
     def questions_count(self, obj):
-        return obj._questions_count
+        return obj.questions_count
     questions_count.short_description = 'Questions'
-    questions_count.admin_order_field = '_questions_count'
+    questions_count.admin_order_field = 'questions_count'
 
     def submissions_count(self, obj):
-        return obj._submissions_count
+        return obj.submissions_count
     submissions_count.short_description = 'Filled Forms'
-    submissions_count.admin_order_field = '_submissions_count'
+    submissions_count.admin_order_field = 'submissions_count'
 
 
 # ============================================
@@ -5,3 +5,6 @@ class FormsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.forms'
     verbose_name = 'ISO Certification Forms'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,56 @@
+"""
+Public Form Schema Cache
+
+The public form endpoints serve the same few templates, with their nested
+sections and questions, to every visitor. Their serialized payloads are
+cached here under a schema version that signals.py bumps whenever a
+template, section or question is saved or deleted; bumping it orphans
+every cached payload at once.
+
+The version also makes up the ETag, so a client revalidating an unchanged
+schema gets a 304 after a single cache read.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import quote_etag
+
+SCHEMA_CACHE_PREFIX = 'forms:schema'
+SCHEMA_VERSION_KEY = 'forms:schema:version'
+
+
+def schema_version():
+    # Versions are timestamps, so one recreated after an eviction can
+    # never match keys written under an earlier version
+    version = cache.get(SCHEMA_VERSION_KEY)
+    if version is None:
+        cache.add(SCHEMA_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(SCHEMA_VERSION_KEY)
+    return version
+
+
+def bump_schema_version():
+    cache.set(SCHEMA_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def schema_etag(version, name):
+    return quote_etag(hashlib.sha256(f'{version}:{name}'.encode()).hexdigest()[:32])
+
+
+def get_schema_payload(version, name, build):
+    """
+    Return the named schema payload cached under version.
+
+    build() produces the payload on a miss; exceptions it raises (a 404 for
+    an unknown template, say) propagate and nothing is cached.
+    """
+    # Names carry query parameters, so they are hashed into a safe key
+    key = f'{SCHEMA_CACHE_PREFIX}:{version}:{hashlib.sha256(name.encode()).hexdigest()}'
+    payload = cache.get(key)
+    if payload is None:
+        payload = build()
+        cache.set(key, payload, settings.FORMS_SCHEMA_CACHE_TIMEOUT)
+    return payload
@@ -0,0 +1,140 @@
+"""
+Form Submission CSV Export
+
+Streams submissions to the client as CSV while they are read from the
+database: rows come from values_list() querysets walked with iterator(),
+so only the exported columns are loaded and memory stays flat however
+many submissions are exported.
+
+Two layouts are available:
+- summary: one row per submission with its scalar fields
+- wide: the summary columns plus one column per question, filled from a
+  single ordered query joining every submission to its answers
+"""
+
+import csv
+from itertools import groupby
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .models import FormQuestion
+
+EXPORT_CHUNK_SIZE = 2000
+
+LAYOUTS = ('summary', 'wide')
+
+SUBMISSION_HEADER = [
+    'Submission Number', 'Form Name', 'ISO Standard',
+    'Submitter Name', 'Email', 'Company', 'Status',
+    'Submitted At', 'Language'
+]
+SUBMISSION_FIELDS = [
+    'submission_number', 'form_template__name', 'form_template__iso_standard',
+    'submitter_name', 'submitter_email', 'company_name', 'status',
+    'submitted_at', 'language'
+]
+ANSWER_FIELDS = ['answers__question_id', 'answers__answer_text', 'answers__answer_json', 'answers__answer_file']
+
+
+class _Echo:
+    """Write-only file object handing each CSV line straight back"""
+
+    def write(self, value):
+        return value
+
+
+def _submission_row(values):
+    row = list(values)
+    # submitted_at
+    row[7] = row[7].isoformat()
+    return row
+
+
+def _answer_value(answer_text, answer_json, answer_file):
+    """Same rendering as FormAnswer.display_value, without the placeholder"""
+    if answer_file:
+        return answer_file
+    if answer_json:
+        if isinstance(answer_json, list):
+            return ', '.join(str(v) for v in answer_json)
+        return str(answer_json)
+    return answer_text or ''
+
+
+def _ordered(queryset):
+    # pk breaks ties so every submission's rows come out together
+    ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+    return queryset.order_by(*ordering, 'pk')
+
+
+def _chunked(lines):
+    """Join CSV lines into chunks, so the response is not one write per row"""
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= EXPORT_CHUNK_SIZE:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+
+
+def iter_submissions_csv(queryset):
+    """Yield the summary CSV, one line per submission"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(SUBMISSION_HEADER)
+
+    rows = _ordered(queryset).values_list(*SUBMISSION_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for values in rows:
+        yield writer.writerow(_submission_row(values))
+
+
+def export_questions(queryset):
+    """Questions of every form template in queryset, in form order"""
+    template_ids = queryset.order_by().values('form_template_id')
+    return list(
+        FormQuestion.objects.filter(section__form_template__in=template_ids)
+        .order_by('section__form_template__name', 'section__form_template_id', 'section__order', 'order')
+        .values_list('id', 'question_text', 'section__form_template__name')
+    )
+
+
+def iter_submissions_wide_csv(queryset):
+    """
+    Yield the wide CSV: summary columns followed by a column per question.
+
+    Answers are read with the submissions in one LEFT JOIN query ordered
+    by submission, and the rows of each submission are folded into one line.
+    """
+    writer = csv.writer(_Echo())
+    questions = export_questions(queryset)
+    columns = {question_id: index for index, (question_id, _, _) in enumerate(questions)}
+    multiple_forms = len({form_name for _, _, form_name in questions}) > 1
+
+    yield writer.writerow(SUBMISSION_HEADER + [
+        f'{form_name}: {text}' if multiple_forms else text
+        for _, text, form_name in questions
+    ])
+
+    rows = _ordered(queryset).values_list(
+        'pk', *SUBMISSION_FIELDS, *ANSWER_FIELDS
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    base = len(SUBMISSION_FIELDS) + 1
+    for _, submission_rows in groupby(rows, key=lambda row: row[0]):
+        answers = [''] * len(questions)
+        for row in submission_rows:
+            question_id = row[base]
+            if question_id in columns:
+                answers[columns[question_id]] = _answer_value(*row[base + 1:])
+        yield writer.writerow(_submission_row(row[1:base]) + answers)
+
+
+def submissions_csv_response(queryset, layout='summary'):
+    """StreamingHttpResponse with the submissions in queryset as CSV"""
+    lines = iter_submissions_wide_csv(queryset) if layout == 'wide' else iter_submissions_csv(queryset)
+    response = StreamingHttpResponse(_chunked(lines), content_type='text/csv')
+    timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
+    response['Content-Disposition'] = f'attachment; filename="submissions_{timestamp}.csv"'
+    return response
@@ -0,0 +1,275 @@
+"""
+Form Fixture Sync
+
+Brings the assessment forms in the database in line with the fixture tree
+in fixtures/iso_forms_data.py, touching only what differs:
+
+- templates are matched on (iso_standard, form_type='assessment'),
+  sections on (template, order) and questions on their English text
+  within the section, so questions reordered by an admin keep their rows;
+- a fixture question whose text matches no row takes over the row at its
+  position, unless that row already has answers: it is then skipped and
+  reported, so submitted answers never end up under a different question;
+- missing rows are inserted with bulk_create(), rows whose fixture fields
+  differ get one bulk_update() per model, everything else is left alone.
+
+The whole tree is read in three queries, so a sync that finds nothing to
+do costs three SELECTs. Rows that exist in the database but not in the
+fixture (added by an admin) are reported, never deleted.
+
+The fixture is the only source of text, Italian included, for the
+templates it covers (managed_templates()); update_italian_forms leaves
+them alone so the two commands never rewrite each other's values.
+"""
+
+import logging
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import bump_schema_version
+from .models import FormAnswer, FormQuestion, FormSection, FormTemplate, QuestionType
+from .template_tree import TREE_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+FORM_TYPE = 'assessment'
+
+# Only applied when a template is created; admins may change them later
+TEMPLATE_DEFAULTS = {
+    'is_active': True,
+    'is_public': True,
+    'send_confirmation_email': True,
+    'notification_emails': 'info@msc-cert.com,eneriko.h@msc-cert.com,contact@msc-cert.com',
+}
+
+TEMPLATE_FIELDS = ['name', 'name_sq', 'name_it', 'description', 'description_sq', 'description_it']
+SECTION_FIELDS = ['title', 'title_sq', 'title_it']
+QUESTION_FIELDS = [
+    'question_text', 'question_text_sq', 'question_text_it',
+    'question_type', 'is_required', 'options'
+]
+
+# Fixture keys -> model fields; a missing _it key falls back to English on
+# create only, so translations set by update_italian_forms are kept
+TEMPLATE_KEYS = {
+    'name': 'name', 'name_sq': 'name_sq', 'name_it': 'name_it',
+    'description': 'description', 'description_sq': 'description_sq', 'description_it': 'description_it',
+}
+SECTION_KEYS = {'title': 'title', 'title_sq': 'title_sq', 'title_it': 'title_it'}
+QUESTION_KEYS = {'q': 'question_text', 'q_sq': 'question_text_sq', 'q_it': 'question_text_it'}
+
+
+def _values(data, keys):
+    return {field: data[key] for key, field in keys.items() if key in data}
+
+
+def _with_fallbacks(values):
+    for field in ('name', 'description', 'title', 'question_text'):
+        if field in values:
+            values.setdefault(f'{field}_it', values[field])
+    return values
+
+
+def managed_templates(forms_data):
+    """Templates whose content is owned by the fixture tree"""
+    return FormTemplate.objects.filter(iso_standard__in=list(forms_data), form_type=FORM_TYPE)
+
+
+def template_values(form_data):
+    return _values(form_data, TEMPLATE_KEYS)
+
+
+def section_values(section_data):
+    return _values(section_data, SECTION_KEYS)
+
+
+def question_values(q_data, answer_options):
+    return {
+        **_values(q_data, QUESTION_KEYS),
+        'question_type': QuestionType.RADIO,
+        'is_required': True,
+        'options': answer_options,
+    }
+
+
+class SyncReport:
+    """Counts of created, updated and extra rows per model"""
+
+    def __init__(self):
+        self.counts = {
+            name: {'created': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0, 'extra': 0}
+            for name in ('templates', 'sections', 'questions')
+        }
+
+    def add(self, name, outcome, count=1):
+        self.counts[name][outcome] += count
+
+    @property
+    def changed(self):
+        return any(c['created'] or c['updated'] for c in self.counts.values())
+
+    def lines(self):
+        return [
+            f"{name}: {c['created']} created, {c['updated']} updated, "
+            f"{c['unchanged']} unchanged, {c['skipped']} skipped (answered), {c['extra']} not in fixture"
+            for name, c in self.counts.items()
+        ]
+
+
+class _Plan:
+    """Rows to insert and to update, with the fields that changed"""
+
+    def __init__(self):
+        self.create = defaultdict(list)
+        self.update = defaultdict(list)
+        self.update_fields = defaultdict(set)
+        self.touched = set()
+
+    def size(self):
+        return sum(map(len, self.create.values())) + sum(map(len, self.update.values()))
+
+
+def _apply(instance, values, name, plan, report, fields):
+    changed = [
+        field for field, value in values.items()
+        if field in fields and getattr(instance, field) != value
+    ]
+    if not changed:
+        report.add(name, 'unchanged')
+        return
+    for field in changed:
+        setattr(instance, field, values[field])
+    plan.update[name].append(instance)
+    plan.update_fields[name].update(changed)
+    report.add(name, 'updated')
+
+
+def sync_forms(forms_data, answer_options, iso_codes=None, fields=None, create=True, dry_run=False):
+    """
+    Sync the fixture forms (all, or only iso_codes) into the database.
+
+    fields limits which fields are compared and updated (e.g. only the _it
+    translations); create=False only updates existing rows. Nothing is
+    written with dry_run. Returns a SyncReport.
+    """
+    iso_codes = [code for code in (iso_codes or forms_data) if code in forms_data]
+    report = SyncReport()
+    plan = _Plan()
+    template_fields = set(fields or TEMPLATE_FIELDS) & set(TEMPLATE_FIELDS)
+    section_fields = set(fields or SECTION_FIELDS) & set(SECTION_FIELDS)
+    question_fields = set(fields or QUESTION_FIELDS) & set(QUESTION_FIELDS)
+
+    templates = {
+        template.iso_standard: template
+        for template in FormTemplate.objects.filter(iso_standard__in=iso_codes, form_type=FORM_TYPE)
+    }
+    sections = {}
+    for section in FormSection.objects.filter(form_template__in=templates.values()):
+        sections[(section.form_template_id, section.order)] = section
+    questions = {}
+    questions_by_text = {}
+    for question in FormQuestion.objects.filter(section__in=sections.values()):
+        questions[(question.section_id, question.order)] = question
+        questions_by_text.setdefault((question.section_id, question.question_text), question)
+
+    seen_sections = set()
+    seen_questions = set()
+    # (question, values, template pk) matched on position only
+    by_position = []
+    for iso_code in iso_codes:
+        form_data = forms_data[iso_code]
+        pending = plan.size()
+        template = templates.get(iso_code)
+        if template is None:
+            if not create:
+                continue
+            template = FormTemplate(
+                iso_standard=iso_code, form_type=FORM_TYPE,
+                **_with_fallbacks(template_values(form_data)), **TEMPLATE_DEFAULTS
+            )
+            plan.create['templates'].append(template)
+            report.add('templates', 'created')
+        else:
+            _apply(template, template_values(form_data), 'templates', plan, report, template_fields)
+
+        for section_order, section_data in enumerate(form_data['sections'], start=1):
+            section = sections.get((template.pk, section_order))
+            if section is None:
+                if not create:
+                    continue
+                section = FormSection(
+                    form_template=template, order=section_order,
+                    **_with_fallbacks(section_values(section_data))
+                )
+                plan.create['sections'].append(section)
+                report.add('sections', 'created')
+            else:
+                seen_sections.add(section.pk)
+                _apply(section, section_values(section_data), 'sections', plan, report, section_fields)
+
+            unmatched = []
+            for q_order, q_data in enumerate(section_data['questions'], start=1):
+                values = question_values(q_data, answer_options)
+                question = questions_by_text.get((section.pk, values.get('question_text')))
+                if question is None or question.pk in seen_questions:
+                    unmatched.append((q_order, values))
+                else:
+                    seen_questions.add(question.pk)
+                    _apply(question, values, 'questions', plan, report, question_fields)
+
+            for q_order, values in unmatched:
+                question = questions.get((section.pk, q_order))
+                if question is not None and question.pk not in seen_questions:
+                    seen_questions.add(question.pk)
+                    by_position.append((question, values, template.pk))
+                elif create:
+                    question = FormQuestion(section=section, order=q_order, **_with_fallbacks(values))
+                    plan.create['questions'].append(question)
+                    report.add('questions', 'created')
+
+        if plan.size() != pending:
+            plan.touched.add(template.pk)
+
+    if by_position:
+        answered = set(FormAnswer.objects.filter(
+            question__in=[question for question, _values, _template in by_position]
+        ).values_list('question_id', flat=True).distinct())
+        for question, values, template_pk in by_position:
+            if question.pk in answered:
+                logger.warning(
+                    f"Skipped question {question.pk} ({question.question_text!r}): "
+                    f"it has answers and the fixture now has {values.get('question_text')!r} in its place"
+                )
+                report.add('questions', 'skipped')
+                continue
+            pending = plan.size()
+            _apply(question, values, 'questions', plan, report, question_fields)
+            if plan.size() != pending:
+                plan.touched.add(template_pk)
+
+    report.add('sections', 'extra', len(sections) - len(seen_sections))
+    report.add('questions', 'extra', len(questions) - len(seen_questions))
+
+    if report.changed and not dry_run:
+        _write(plan)
+    return report
+
+
+def _write(plan):
+    models = {'templates': FormTemplate, 'sections': FormSection, 'questions': FormQuestion}
+    with transaction.atomic():
+        for name, model in models.items():
+            if plan.create[name]:
+                model.objects.bulk_create(plan.create[name], batch_size=TREE_BATCH_SIZE)
+        for name, model in models.items():
+            if plan.update[name]:
+                model.objects.bulk_update(
+                    plan.update[name], sorted(plan.update_fields[name]), batch_size=TREE_BATCH_SIZE
+                )
+        # bulk writes skip the signal handlers; bump what they would have
+        FormTemplate.objects.filter(pk__in=plan.touched).update(updated_at=timezone.now())
+        transaction.on_commit(bump_schema_version)
+
+    logger.info(f"Synced form fixtures: {len(plan.touched)} templates changed")
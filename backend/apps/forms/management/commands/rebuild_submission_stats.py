@@ -0,0 +1,14 @@
+"""
+Management command to recompute the submission stats rollup.
+Run with: python manage.py rebuild_submission_stats
+"""
+from django.core.management.base import BaseCommand
+from apps.forms.stats import rebuild_submission_stats
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the SubmissionStats rollup from the submissions table'
+
+    def handle(self, *args, **options):
+        count = rebuild_submission_stats()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt submission stats: {count} bucket(s)'))
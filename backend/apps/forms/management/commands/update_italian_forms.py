@@ -1,9 +1,14 @@
 """
 Management command to update ISO forms with Italian translations.
+Forms seeded from the fixture get their Italian text from seed_iso_forms
+and are skipped here.
 Run with: python manage.py update_italian_forms
 """
 from django.core.management.base import BaseCommand
 from apps.forms.models import FormTemplate, FormSection, FormQuestion
+from apps.forms.fixtures.iso_forms_data import ALL_FORMS_DATA
+from apps.forms.fixture_sync import managed_templates
+from apps.forms.template_tree import set_fields, update_template_tree
 
 
 # Italian translations for form content
@@ -75,38 +80,45 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         self.stdout.write('Updating forms with Italian translations...')
 
-        updated_forms = 0
-        updated_sections = 0
-        updated_questions = 0
+        forms = []
+        sections = []
+        questions = []
+        managed = managed_templates(ALL_FORMS_DATA)
 
         # Update form templates
-        for form in FormTemplate.objects.all():
+        for form in FormTemplate.objects.exclude(pk__in=managed):
             iso_code = form.iso_standard
             if iso_code in ITALIAN_TRANSLATIONS:
                 trans = ITALIAN_TRANSLATIONS[iso_code]
-                form.name_it = trans.get('name_it', form.name)
-                form.description_it = trans.get('description_it', form.description)
-                form.save()
-                updated_forms += 1
-                self.stdout.write(f'  Updated form: {form.name}')
+                # Only rows whose values differ are written
+                if set_fields(
+                    form,
+                    name_it=trans.get('name_it', form.name),
+                    description_it=trans.get('description_it', form.description),
+                ):
+                    forms.append(form)
+                    self.stdout.write(f'  Updated form: {form.name}')
 
         # Update sections
-        for section in FormSection.objects.all():
-            if section.title in SECTION_TRANSLATIONS:
-                section.title_it = SECTION_TRANSLATIONS[section.title]
-                section.save()
-                updated_sections += 1
+        sections_to_translate = FormSection.objects.filter(
+            title__in=SECTION_TRANSLATIONS
+        ).exclude(form_template__in=managed)
+        for section in sections_to_translate:
+            if set_fields(section, title_it=SECTION_TRANSLATIONS[section.title]):
+                sections.append(section)
 
         # Update questions (use English as fallback for now)
         # Questions are more complex - we'll leave them in English for now
         # and they'll fall back gracefully in the frontend
-        for question in FormQuestion.objects.filter(question_text_it=''):
-            question.question_text_it = question.question_text  # English fallback
-            question.save()
-            updated_questions += 1
+        updated_questions = 0
+        for question in FormQuestion.objects.exclude(section__form_template__in=managed):
+            changed = False
+            if question.question_text_it == '':
+                question.question_text_it = question.question_text  # English fallback
+                updated_questions += 1
+                changed = True
 
-        # Also update the answer options in questions to include Italian
-        for question in FormQuestion.objects.all():
+            # Also update the answer options in questions to include Italian
             if question.options:
                 updated_options = []
                 for opt in question.options:
@@ -121,10 +133,23 @@ class Command(BaseCommand):
                             opt['label_it'] = 'Non applicabile'
                         else:
                             opt['label_it'] = opt.get('label', '')
+                        changed = True
                     updated_options.append(opt)
                 question.options = updated_options
-                question.save()
+
+            if changed:
+                questions.append(question)
+
+        # One bulk UPDATE per model
+        update_template_tree(
+            templates=forms,
+            sections=sections,
+            questions=questions,
+            template_fields=['name_it', 'description_it'],
+            section_fields=['title_it'],
+            question_fields=['question_text_it', 'options'],
+        )
 
         self.stdout.write(self.style.SUCCESS(
-            f'Successfully updated {updated_forms} forms, {updated_sections} sections, {updated_questions} questions'
+            f'Successfully updated {len(forms)} forms, {len(sections)} sections, {updated_questions} questions'
         ))
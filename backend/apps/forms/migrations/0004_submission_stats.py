@@ -0,0 +1,58 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def build_submission_stats(apps, schema_editor):
+    """
+    Fill the rollup from the submissions made so far
+    """
+    FormSubmission = apps.get_model('forms', 'FormSubmission')
+    SubmissionStats = apps.get_model('forms', 'SubmissionStats')
+    rows = (
+        FormSubmission.objects.order_by()
+        .annotate(day=TruncDate('submitted_at'))
+        .values('form_template_id', 'form_template__iso_standard', 'status', 'day')
+        .annotate(count=Count('id'))
+    )
+    SubmissionStats.objects.bulk_create([
+        SubmissionStats(
+            form_template_id=row['form_template_id'],
+            iso_standard=row['form_template__iso_standard'],
+            status=row['status'],
+            day=row['day'],
+            count=row['count'],
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forms', '0003_submission_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('iso_standard', models.CharField(choices=[('ISO_9001', 'ISO 9001:2015 - Quality Management'), ('ISO_14001', 'ISO 14001:2015 - Environmental Management'), ('ISO_22000', 'ISO 22000:2018 - Food Safety'), ('ISO_22301', 'ISO 22301:2019 - Business Continuity'), ('ISO_27001', 'ISO 27001:2022 - Information Security'), ('ISO_37001', 'ISO 37001:2016 - Anti-Bribery'), ('ISO_39001', 'ISO 39001:2012 - Road Traffic Safety'), ('ISO_45001', 'ISO 45001:2018 - Occupational Health & Safety'), ('ISO_50001', 'ISO 50001:2018 - Energy Management'), ('HACCP', 'HACCP - Food Safety'), ('GENERAL', 'General Inquiry')], max_length=20)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending Review'), ('UNDER_REVIEW', 'Under Review'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected'), ('COMPLETED', 'Completed')], max_length=20)),
+                ('day', models.DateField()),
+                ('count', models.IntegerField(default=0)),
+                ('form_template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='forms.formtemplate')),
+            ],
+            options={
+                'verbose_name': 'Submission Stats',
+                'verbose_name_plural': 'Submission Stats',
+                'indexes': [models.Index(fields=['iso_standard', 'status'], name='forms_submi_iso_sta_3e64a0_idx')],
+                'constraints': [models.UniqueConstraint(fields=('form_template', 'status', 'day'), name='submission_stats_unique')],
+            },
+        ),
+        migrations.RunPython(build_submission_stats, reverse_code=migrations.RunPython.noop),
+    ]
@@ -1,5 +1,5 @@
 import uuid
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator, EmailValidator
 from django.utils import timezone
 
@@ -89,12 +89,17 @@ class FormTemplate(models.Model):
 
     @property
     def total_questions(self):
+        # Querysets built with stats.annotate_template_counts() carry the count
+        if hasattr(self, 'questions_count'):
+            return self.questions_count
         return self.sections.aggregate(
             total=models.Count('questions')
         )['total'] or 0
 
     @property
     def total_submissions(self):
+        if hasattr(self, 'submissions_count'):
+            return self.submissions_count
         return self.submissions.count()
 
 
@@ -198,6 +203,51 @@ class FormQuestion(models.Model):
         return f"{self.section.title} - Q{self.order}: {self.question_text[:50]}..."
 
 
+class SubmissionCounter(models.Model):
+    """
+    Last submission number handed out per day.
+    Numbers are allocated by incrementing the day's row in place, so
+    concurrent submissions queue on a row lock instead of counting the
+    day's submissions and colliding on the same number.
+    """
+    day = models.DateField(primary_key=True)
+    last_number = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Submission Counter'
+        verbose_name_plural = 'Submission Counters'
+
+    def __str__(self):
+        return f"{self.day}: {self.last_number}"
+
+    @staticmethod
+    def prefix(day):
+        return f"SUB-{day:%Y%m%d}-"
+
+    @classmethod
+    def allocate(cls, day):
+        """Reserve and return the next submission number for `day`"""
+        with transaction.atomic():
+            # The UPDATE locks the day's row until this transaction ends
+            if not cls.objects.filter(day=day).update(last_number=models.F('last_number') + 1):
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(day=day, last_number=cls._numbers_in_use(day) + 1)
+                except IntegrityError:
+                    # Another request created the day's row first
+                    cls.objects.filter(day=day).update(last_number=models.F('last_number') + 1)
+            return cls.objects.filter(day=day).values_list('last_number', flat=True).get()
+
+    @classmethod
+    def _numbers_in_use(cls, day):
+        """Highest number already issued for `day` (numbered before the counter existed)"""
+        prefix = cls.prefix(day)
+        last = FormSubmission.objects.filter(
+            submission_number__startswith=prefix
+        ).order_by('-submission_number').values_list('submission_number', flat=True).first()
+        return int(last[len(prefix):]) if last else 0
+
+
 class FormSubmission(models.Model):
     """
     A submission of a form by a user/client.
@@ -274,15 +324,9 @@ class FormSubmission(models.Model):
 
     def generate_submission_number(self):
         """Generate a unique submission number: SUB-YYYYMMDD-XXXXX"""
-        today = timezone.now().strftime('%Y%m%d')
-        prefix = f"SUB-{today}-"
-
-        # Get the count of submissions today
-        today_count = FormSubmission.objects.filter(
-            submission_number__startswith=prefix
-        ).count()
-
-        return f"{prefix}{str(today_count + 1).zfill(5)}"
+        today = timezone.now().date()
+        number = SubmissionCounter.allocate(today)
+        return f"{SubmissionCounter.prefix(today)}{str(number).zfill(5)}"
 
 
 class FormAnswer(models.Model):
@@ -366,3 +410,58 @@ class FormSubmissionLog(models.Model):
 
     def __str__(self):
         return f"{self.submission.submission_number}: {self.previous_status} → {self.new_status}"
+
+
+class SubmissionStats(models.Model):
+    """
+    Submission counts per form template, status and submission day.
+    Kept current by the signal handlers in signals.py as submissions are
+    created, change status or are deleted, so dashboard and admin counts
+    read a few rollup rows instead of counting submissions.
+    Rebuild from scratch with `manage.py rebuild_submission_stats`.
+    """
+    form_template = models.ForeignKey(
+        FormTemplate,
+        on_delete=models.CASCADE,
+        related_name='stats'
+    )
+    iso_standard = models.CharField(max_length=20, choices=ISOStandard.choices)
+    status = models.CharField(max_length=20, choices=FormSubmission.SubmissionStatus.choices)
+    day = models.DateField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Submission Stats'
+        verbose_name_plural = 'Submission Stats'
+        constraints = [
+            models.UniqueConstraint(fields=['form_template', 'status', 'day'], name='submission_stats_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['iso_standard', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.iso_standard} {self.status}: {self.count}"
+
+    @classmethod
+    def record(cls, form_template_id, status, day, delta):
+        """Add delta to the count of one template/status/day bucket"""
+        bucket = cls.objects.filter(form_template_id=form_template_id, status=status, day=day)
+        with transaction.atomic():
+            if bucket.update(count=models.F('count') + delta):
+                return
+            iso_standard = FormTemplate.objects.filter(
+                pk=form_template_id
+            ).values_list('iso_standard', flat=True).first()
+            try:
+                with transaction.atomic():
+                    cls.objects.create(
+                        form_template_id=form_template_id,
+                        iso_standard=iso_standard or '',
+                        status=status,
+                        day=day,
+                        count=delta
+                    )
+            except IntegrityError:
+                # Another request created the bucket first
+                bucket.update(count=models.F('count') + delta)
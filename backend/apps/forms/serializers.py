@@ -1,13 +1,13 @@
 from rest_framework import serializers
-from django.core.validators import validate_email
-from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
 import re
 
 from .models import (
     FormTemplate, FormSection, FormQuestion,
     FormSubmission, FormAnswer, FormSubmissionLog,
-    ISOStandard, QuestionType
+    ISOStandard
 )
+from .validation import get_validation_plan
 
 
 class FormQuestionSerializer(serializers.ModelSerializer):
@@ -252,25 +252,12 @@ class PublicFormSubmissionSerializer(serializers.Serializer):
                     'email': 'You have already submitted this form.'
                 })
 
-        # Validate answers if provided
-        answers = data.get('answers', [])
-        if answers:
-            answer_map = {str(a['question_id']): a for a in answers}
-            questions = FormQuestion.objects.filter(
-                section__form_template=form_template,
-                is_active=True,
-                section__is_active=True
-            )
-
-            errors = {}
-            for question in questions:
-                q_id = str(question.id)
-                if q_id in answer_map:
-                    answer = answer_map[q_id]
-                    error = self._validate_answer(question, answer)
-                    if error:
-                        errors[q_id] = error
-
+        # Validate answers against the template's compiled plan; answers to
+        # questions that are not on the form or are hidden are dropped
+        answers = {}
+        if data.get('answers'):
+            plan = get_validation_plan(form_template)
+            errors, answers = plan.validate(data['answers'])
             if errors:
                 raise serializers.ValidationError({'answer_errors': errors})
 
@@ -278,55 +265,11 @@ class PublicFormSubmissionSerializer(serializers.Serializer):
         data['answers'] = answers  # Ensure answers is set
         return data
 
-    def _validate_answer(self, question, answer):
-        """Validate individual answer based on question type and rules"""
-        answer_text = answer.get('answer_text', '')
-        answer_json = answer.get('answer_json')
-        rules = question.validation_rules or {}
-
-        if question.question_type == QuestionType.EMAIL:
-            if answer_text:
-                try:
-                    validate_email(answer_text)
-                except DjangoValidationError:
-                    return 'Invalid email address'
-
-        elif question.question_type == QuestionType.NUMBER:
-            if answer_text:
-                try:
-                    num = float(answer_text)
-                    if 'min' in rules and num < rules['min']:
-                        return f'Value must be at least {rules["min"]}'
-                    if 'max' in rules and num > rules['max']:
-                        return f'Value must be at most {rules["max"]}'
-                except ValueError:
-                    return 'Must be a valid number'
-
-        elif question.question_type in [QuestionType.TEXT, QuestionType.TEXTAREA]:
-            if answer_text:
-                if 'min_length' in rules and len(answer_text) < rules['min_length']:
-                    return f'Must be at least {rules["min_length"]} characters'
-                if 'max_length' in rules and len(answer_text) > rules['max_length']:
-                    return f'Must be at most {rules["max_length"]} characters'
-
-        elif question.question_type in [QuestionType.SELECT, QuestionType.RADIO]:
-            if answer_text and question.options:
-                valid_values = [opt.get('value') for opt in question.options]
-                if answer_text not in valid_values:
-                    return 'Invalid selection'
-
-        elif question.question_type == QuestionType.CHECKBOX:
-            if answer_json and question.options:
-                valid_values = [opt.get('value') for opt in question.options]
-                if isinstance(answer_json, list):
-                    for val in answer_json:
-                        if val not in valid_values:
-                            return f'Invalid selection: {val}'
-
-        return None
-
     def create(self, validated_data):
-        """Create the submission and answers"""
+        """
+        Create the submission, its answers and the initial log entry.
+        Runs a fixed number of queries however many questions the form has.
+        """
         form_template = validated_data['form_template']
         answers_data = validated_data.pop('answers')
 
@@ -345,8 +288,7 @@ class PublicFormSubmissionSerializer(serializers.Serializer):
 
             user_agent = request.META.get('HTTP_USER_AGENT', '')[:500]
 
-        # Create submission
-        submission = FormSubmission.objects.create(
+        submission = FormSubmission(
             form_template=form_template,
             submitter_name=validated_data['submitter_name'],
             submitter_email=validated_data['submitter_email'],
@@ -356,27 +298,32 @@ class PublicFormSubmissionSerializer(serializers.Serializer):
             ip_address=ip_address,
             user_agent=user_agent
         )
+        # Allocated outside the transaction so the day's counter row is not
+        # locked while the answers are written
+        submission.submission_number = submission.generate_submission_number()
+
+        # validate() already keeps one answer per visible question
+        answers = [
+            FormAnswer(
+                submission=submission,
+                question_id=question_id,
+                answer_text=answer_data.get('answer_text', ''),
+                answer_json=answer_data.get('answer_json')
+            )
+            for question_id, answer_data in answers_data.items()
+        ]
 
-        # Create answers
-        for answer_data in answers_data:
-            try:
-                question = FormQuestion.objects.get(id=answer_data['question_id'])
-                FormAnswer.objects.create(
-                    submission=submission,
-                    question=question,
-                    answer_text=answer_data.get('answer_text', ''),
-                    answer_json=answer_data.get('answer_json')
-                )
-            except FormQuestion.DoesNotExist:
-                continue  # Skip invalid question IDs
-
-        # Create initial log entry
-        FormSubmissionLog.objects.create(
-            submission=submission,
-            previous_status='',
-            new_status=FormSubmission.SubmissionStatus.PENDING,
-            notes='Form submitted'
-        )
+        with transaction.atomic():
+            submission.save(force_insert=True)
+            FormAnswer.objects.bulk_create(answers)
+
+            # Create initial log entry
+            FormSubmissionLog.objects.create(
+                submission=submission,
+                previous_status='',
+                new_status=FormSubmission.SubmissionStatus.PENDING,
+                notes='Form submitted'
+            )
 
         return submission
 
@@ -475,5 +422,6 @@ class PublicFormTemplateSerializer(serializers.ModelSerializer):
 
     def get_sections(self, obj):
         """Get only active sections with active questions"""
-        sections = obj.sections.filter(is_active=True).order_by('order')
-        return PublicFormSectionSerializer(sections, many=True).data
+        # Sections are pre-filtered and ordered via prefetch in the viewset;
+        # filtering here again would issue a query per template
+        return PublicFormSectionSerializer(obj.sections.all(), many=True).data
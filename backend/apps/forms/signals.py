@@ -0,0 +1,100 @@
+"""
+Signal handlers keeping form template caches and submission stats in sync
+with the database.
+
+Compiled validation plans are keyed by the template's updated_at, so any
+change to a section or question has to bump it; any change to a template,
+section or question also bumps the public schema version.
+
+The SubmissionStats rollup is adjusted as submissions are created, change
+status or template, or are deleted.
+"""
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import bump_schema_version
+from .models import FormQuestion, FormSection, FormSubmission, FormTemplate, SubmissionStats
+from .stats import submission_day
+
+
+def touch_template(form_template_id):
+    # .update() so the template's own save() and signals are not run
+    FormTemplate.objects.filter(pk=form_template_id).update(updated_at=timezone.now())
+    bump_schema_version()
+
+
+@receiver(post_save, sender=FormTemplate)
+@receiver(post_delete, sender=FormTemplate)
+def invalidate_template_schema(sender, instance, **kwargs):
+    bump_schema_version()
+
+
+@receiver(post_save, sender=FormSection)
+@receiver(post_delete, sender=FormSection)
+def touch_section_template(sender, instance, **kwargs):
+    touch_template(instance.form_template_id)
+
+
+@receiver(post_save, sender=FormQuestion)
+@receiver(post_delete, sender=FormQuestion)
+def touch_question_template(sender, instance, **kwargs):
+    if FormQuestion.section.is_cached(instance):
+        form_template_id = instance.section.form_template_id
+    else:
+        # The section may already be gone when its questions are cascade-deleted;
+        # its own post_delete handler covers that case.
+        form_template_id = FormSection.objects.filter(
+            pk=instance.section_id
+        ).values_list('form_template_id', flat=True).first()
+
+    if form_template_id:
+        touch_template(form_template_id)
+
+
+@receiver(post_save, sender=FormTemplate)
+def sync_stats_standard(sender, instance, **kwargs):
+    SubmissionStats.objects.filter(form_template=instance).exclude(
+        iso_standard=instance.iso_standard
+    ).update(iso_standard=instance.iso_standard)
+
+
+def _stats_bucket(instance):
+    # Read from __dict__ so deferred fields are not loaded one query at a time
+    values = instance.__dict__
+    if values.get('submitted_at') is None or 'status' not in values or 'form_template_id' not in values:
+        return None
+    return values['form_template_id'], values['status'], submission_day(values['submitted_at'])
+
+
+@receiver(post_init, sender=FormSubmission)
+def remember_stats_bucket(sender, instance, **kwargs):
+    instance._stats_bucket = _stats_bucket(instance)
+
+
+def _record_on_commit(bucket, delta):
+    # The bucket row is locked by its UPDATE until the transaction ends, so
+    # count after commit; concurrent submissions to one form would otherwise
+    # queue behind each other's answer inserts
+    transaction.on_commit(partial(SubmissionStats.record, *bucket, delta=delta))
+
+
+@receiver(post_save, sender=FormSubmission)
+def update_submission_stats(sender, instance, created, **kwargs):
+    current = _stats_bucket(instance)
+    if created:
+        _record_on_commit(current, 1)
+    elif instance._stats_bucket is not None and current is not None and current != instance._stats_bucket:
+        _record_on_commit(instance._stats_bucket, -1)
+        _record_on_commit(current, 1)
+    instance._stats_bucket = current
+
+
+@receiver(post_delete, sender=FormSubmission)
+def remove_submission_stats(sender, instance, **kwargs):
+    if instance._stats_bucket is not None:
+        _record_on_commit(instance._stats_bucket, -1)
@@ -0,0 +1,100 @@
+"""
+Submission Statistics Rollup
+
+Reads and rebuilds the SubmissionStats rollup. The rollup is maintained
+incrementally by the signal handlers in signals.py; rebuild_submission_stats()
+recomputes it with one GROUP BY query, for first deployment or after bulk
+changes that skipped the signals.
+"""
+
+import logging
+
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from .models import FormQuestion, FormSubmission, FormTemplate, SubmissionStats
+
+logger = logging.getLogger(__name__)
+
+
+def submission_day(submitted_at):
+    """Rollup bucket of a submission, matching TruncDate in the current time zone"""
+    return timezone.localdate(submitted_at)
+
+
+def rebuild_submission_stats():
+    """Replace the rollup with counts computed from the submissions table"""
+    rows = (
+        FormSubmission.objects.order_by()
+        .annotate(day=TruncDate('submitted_at'))
+        .values('form_template_id', 'form_template__iso_standard', 'status', 'day')
+        .annotate(count=Count('id'))
+    )
+    stats = [
+        SubmissionStats(
+            form_template_id=row['form_template_id'],
+            iso_standard=row['form_template__iso_standard'],
+            status=row['status'],
+            day=row['day'],
+            count=row['count'],
+        )
+        for row in rows
+    ]
+    with transaction.atomic():
+        SubmissionStats.objects.all().delete()
+        SubmissionStats.objects.bulk_create(stats, batch_size=1000)
+
+    logger.info(f"Rebuilt submission stats: {len(stats)} buckets")
+    return len(stats)
+
+
+def get_submission_totals():
+    """Total and pending submission counts plus totals per ISO standard"""
+    rows = SubmissionStats.objects.values('iso_standard', 'status').annotate(total=Sum('count'))
+
+    total = pending = 0
+    by_standard = {}
+    for row in rows:
+        total += row['total']
+        if row['status'] == FormSubmission.SubmissionStatus.PENDING:
+            pending += row['total']
+        by_standard[row['iso_standard']] = by_standard.get(row['iso_standard'], 0) + row['total']
+
+    return {
+        'total_submissions': total,
+        'pending_submissions': pending,
+        'submissions_by_standard': [
+            {'form_template__iso_standard': standard, 'count': count}
+            for standard, count in sorted(by_standard.items(), key=lambda item: -item[1])
+            if count
+        ],
+    }
+
+
+def annotate_template_counts(queryset):
+    """
+    Annotate questions_count and submissions_count on a FormTemplate queryset.
+    Submissions are summed from the rollup; both are correlated subqueries,
+    so sections, questions and submissions are never joined into one product.
+    """
+    questions = FormQuestion.objects.filter(
+        section__form_template=OuterRef('pk')
+    ).order_by().values('section__form_template').annotate(total=Count('id')).values('total')
+    submissions = SubmissionStats.objects.filter(
+        form_template=OuterRef('pk')
+    ).order_by().values('form_template').annotate(total=Sum('count')).values('total')
+
+    return queryset.annotate(
+        questions_count=Coalesce(Subquery(questions, output_field=IntegerField()), Value(0)),
+        submissions_count=Coalesce(Subquery(submissions, output_field=IntegerField()), Value(0)),
+    )
+
+
+def get_template_totals():
+    """Total and active form template counts in one query"""
+    return FormTemplate.objects.aggregate(
+        total_forms=Count('id'),
+        active_forms=Count('id', filter=Q(is_active=True)),
+    )
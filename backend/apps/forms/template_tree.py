@@ -0,0 +1,135 @@
+"""
+Form Template Trees
+
+Writes a template with its sections and questions in one transaction and a
+fixed number of queries: the template is saved, then all sections and all
+questions are inserted with bulk_create(). Shared by the duplicate action
+and the seeding/translation commands.
+
+bulk_create()/bulk_update() skip the signal handlers, so the functions here
+touch the affected templates and bump the public schema version themselves.
+"""
+
+import copy
+
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import bump_schema_version
+from .models import FormQuestion, FormSection, FormTemplate
+
+TREE_BATCH_SIZE = 500
+
+
+def copy_fields(instance, **overrides):
+    """
+    Unsaved copy of instance with every concrete field (all translations
+    included) except the primary key and timestamps.
+    """
+    model = type(instance)
+    values = {
+        field.attname: copy.deepcopy(getattr(instance, field.attname))
+        for field in model._meta.concrete_fields
+        if not field.primary_key and field.name not in ('created_at', 'updated_at')
+    }
+    values.update(overrides)
+    return model(**values)
+
+
+def set_fields(instance, **values):
+    """Assign values to instance; returns whether any of them changed"""
+    changed = False
+    for field, value in values.items():
+        if getattr(instance, field) != value:
+            setattr(instance, field, value)
+            changed = True
+    return changed
+
+
+def insert_template_tree(template, sections):
+    """
+    Insert an unsaved template and its sections and questions.
+
+    sections is a list of (FormSection, [FormQuestion, ...]) pairs of unsaved
+    objects; their template/section links are filled in here.
+    """
+    section_objects = []
+    question_objects = []
+    for section, questions in sections:
+        section.form_template = template
+        section_objects.append(section)
+        for question in questions:
+            question.section = section
+            question_objects.append(question)
+
+    with transaction.atomic():
+        template.save(force_insert=True)
+        FormSection.objects.bulk_create(section_objects, batch_size=TREE_BATCH_SIZE)
+        FormQuestion.objects.bulk_create(question_objects, batch_size=TREE_BATCH_SIZE)
+        # On commit, so no request caches the schema without the new rows
+        transaction.on_commit(bump_schema_version)
+
+    return template
+
+
+def clone_template_tree(original, **overrides):
+    """
+    Copy a template with all its sections and questions.
+
+    overrides are applied to the new template. conditional_logic is
+    repointed at the copied questions.
+    """
+    sections = list(original.sections.order_by('order'))
+    questions = list(
+        FormQuestion.objects.filter(section__form_template=original).order_by('section__order', 'order')
+    )
+
+    question_ids = {}
+    by_section = {section.pk: [] for section in sections}
+    for question in questions:
+        clone = copy_fields(question)
+        question_ids[str(question.pk)] = str(clone.pk)
+        by_section[question.section_id].append(clone)
+
+    for clones in by_section.values():
+        for clone in clones:
+            logic = clone.conditional_logic
+            if isinstance(logic, dict) and str(logic.get('question_id')) in question_ids:
+                logic['question_id'] = question_ids[str(logic['question_id'])]
+
+    return insert_template_tree(
+        copy_fields(original, **overrides),
+        [(copy_fields(section), by_section[section.pk]) for section in sections]
+    )
+
+
+def update_template_tree(templates=(), sections=(), questions=(),
+                         template_fields=(), section_fields=(), question_fields=()):
+    """
+    Save changed fields of existing templates, sections and questions with
+    one bulk_update() per model, then touch every affected template.
+    Callers pass only the rows that changed; with none, nothing is written.
+    """
+    templates = templates if template_fields else ()
+    sections = sections if section_fields else ()
+    questions = questions if question_fields else ()
+    if not (templates or sections or questions):
+        return
+
+    touched = {template.pk for template in templates}
+    touched.update(section.form_template_id for section in sections)
+
+    with transaction.atomic():
+        if templates:
+            FormTemplate.objects.bulk_update(templates, template_fields, batch_size=TREE_BATCH_SIZE)
+        if sections:
+            FormSection.objects.bulk_update(sections, section_fields, batch_size=TREE_BATCH_SIZE)
+        if questions:
+            FormQuestion.objects.bulk_update(questions, question_fields, batch_size=TREE_BATCH_SIZE)
+            touched.update(
+                FormSection.objects.filter(
+                    pk__in={question.section_id for question in questions}
+                ).values_list('form_template_id', flat=True)
+            )
+        FormTemplate.objects.filter(pk__in=touched).update(updated_at=timezone.now())
+        transaction.on_commit(bump_schema_version)
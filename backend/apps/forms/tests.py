@@ -0,0 +1,546 @@
+import csv
+import threading
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import (
+    FormAnswer, FormQuestion, FormSection, FormSubmission, FormTemplate,
+    ISOStandard, QuestionType, SubmissionCounter, SubmissionStats
+)
+from .fixture_sync import sync_forms
+from .serializers import PublicFormSubmissionSerializer
+from .stats import get_submission_totals, rebuild_submission_stats
+from .template_tree import clone_template_tree
+from .validation import get_validation_plan
+
+
+def create_submission(form_template, **kwargs):
+    return FormSubmission.objects.create(
+        form_template=form_template,
+        submitter_email='client@example.com',
+        submitter_name='Client',
+        **kwargs
+    )
+
+
+class SubmissionNumberTests(TestCase):
+    def setUp(self):
+        self.form_template = FormTemplate.objects.create(
+            name='ISO 9001 Assessment',
+            iso_standard=ISOStandard.ISO_9001,
+        )
+
+    def test_numbers_are_sequential_per_day(self):
+        day = date(2025, 1, 1)
+        self.assertEqual(SubmissionCounter.allocate(day), 1)
+        self.assertEqual(SubmissionCounter.allocate(day), 2)
+        self.assertEqual(SubmissionCounter.allocate(date(2025, 1, 2)), 1)
+
+    def test_submission_gets_number(self):
+        first = create_submission(self.form_template)
+        second = create_submission(self.form_template)
+
+        prefix = first.submission_number[:-5]
+        self.assertRegex(first.submission_number, r'^SUB-\d{8}-00001$')
+        self.assertEqual(second.submission_number, f'{prefix}00002')
+
+    def test_counter_continues_after_existing_numbers(self):
+        day = date(2025, 1, 1)
+        create_submission(self.form_template, submission_number='SUB-20250101-00007')
+
+        self.assertEqual(SubmissionCounter.allocate(day), 8)
+
+
+class PublicSubmissionTests(TestCase):
+    def create_form(self, question_count):
+        form_template = FormTemplate.objects.create(
+            name=f'Assessment with {question_count} questions',
+            iso_standard=ISOStandard.ISO_9001,
+        )
+        section = FormSection.objects.create(form_template=form_template, title='General')
+        questions = FormQuestion.objects.bulk_create([
+            FormQuestion(
+                section=section,
+                question_text=f'Question {order}',
+                question_type=QuestionType.TEXT,
+                order=order,
+            )
+            for order in range(question_count)
+        ])
+        return form_template, questions
+
+    def submit(self, form_template, answers):
+        serializer = PublicFormSubmissionSerializer(data={
+            'form_template_id': str(form_template.id),
+            'submitter_name': 'Client',
+            'email': 'client@example.com',
+            'answers': answers,
+        })
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with CaptureQueriesContext(connection) as queries:
+            submission = serializer.save()
+        return submission, len(queries)
+
+    def test_answers_are_saved(self):
+        form_template, questions = self.create_form(3)
+        other_template, other_questions = self.create_form(1)
+
+        submission, _ = self.submit(form_template, [
+            {'question_id': str(questions[0].id), 'answer_text': 'Yes'},
+            {'question_id': str(questions[1].id), 'answer_text': 'No'},
+            {'question_id': str(other_questions[0].id), 'answer_text': 'Not on this form'},
+        ])
+
+        answers = dict(FormAnswer.objects.filter(submission=submission).values_list('question_id', 'answer_text'))
+        self.assertEqual(answers, {questions[0].id: 'Yes', questions[1].id: 'No'})
+        self.assertEqual(submission.logs.count(), 1)
+
+    def test_query_count_does_not_grow_with_form_size(self):
+        # The first submission of the day also creates the day's counter row
+        SubmissionCounter.allocate(timezone.now().date())
+
+        counts = []
+        for question_count in (5, 80):
+            form_template, questions = self.create_form(question_count)
+            _, query_count = self.submit(form_template, [
+                {'question_id': str(question.id), 'answer_text': 'Yes'} for question in questions
+            ])
+            counts.append(query_count)
+
+        self.assertEqual(counts[0], counts[1])
+
+
+class ValidationPlanTests(TestCase):
+    def setUp(self):
+        self.form_template = FormTemplate.objects.create(
+            name='ISO 14001 Assessment',
+            iso_standard=ISOStandard.ISO_14001,
+        )
+        self.section = FormSection.objects.create(form_template=self.form_template, title='General')
+        self.has_sites = FormQuestion.objects.create(
+            section=self.section,
+            question_text='Do you have other sites?',
+            question_type=QuestionType.RADIO,
+            options=[{'value': 'yes', 'label': 'Yes'}, {'value': 'no', 'label': 'No'}],
+            order=1,
+        )
+        self.site_count = FormQuestion.objects.create(
+            section=self.section,
+            question_text='How many?',
+            question_type=QuestionType.NUMBER,
+            validation_rules={'min': 1, 'max': 50},
+            conditional_logic={'question_id': str(self.has_sites.id), 'operator': 'equals', 'value': 'yes'},
+            order=2,
+        )
+
+    def get_plan(self):
+        self.form_template.refresh_from_db()
+        return get_validation_plan(self.form_template)
+
+    def test_rules_are_checked(self):
+        errors, _ = self.get_plan().validate([
+            {'question_id': self.has_sites.id, 'answer_text': 'maybe'},
+        ])
+        self.assertEqual(errors, {str(self.has_sites.id): 'Invalid selection'})
+
+        errors, _ = self.get_plan().validate([
+            {'question_id': self.has_sites.id, 'answer_text': 'yes'},
+            {'question_id': self.site_count.id, 'answer_text': '80'},
+        ])
+        self.assertEqual(errors, {str(self.site_count.id): 'Value must be at most 50'})
+
+    def test_hidden_questions_are_skipped(self):
+        errors, accepted = self.get_plan().validate([
+            {'question_id': self.has_sites.id, 'answer_text': 'no'},
+            {'question_id': self.site_count.id, 'answer_text': '80'},
+        ])
+        self.assertEqual(errors, {})
+        self.assertEqual(list(accepted), [str(self.has_sites.id)])
+
+    def test_plan_is_reused_until_questions_change(self):
+        plan = self.get_plan()
+        with self.assertNumQueries(1):
+            self.assertIs(self.get_plan(), plan)
+
+        self.site_count.validation_rules = {'min': 1, 'max': 100}
+        self.site_count.save()
+
+        new_plan = self.get_plan()
+        self.assertIsNot(new_plan, plan)
+        errors, _ = new_plan.validate([
+            {'question_id': self.has_sites.id, 'answer_text': 'yes'},
+            {'question_id': self.site_count.id, 'answer_text': '80'},
+        ])
+        self.assertEqual(errors, {})
+
+
+class PublicFormSchemaTests(TestCase):
+    url = '/api/forms/public/forms/'
+
+    def setUp(self):
+        self.client = APIClient()
+        self.form_template = FormTemplate.objects.create(
+            name='ISO 9001 Assessment',
+            iso_standard=ISOStandard.ISO_9001,
+        )
+        self.section = FormSection.objects.create(form_template=self.form_template, title='General')
+        self.question = FormQuestion.objects.create(section=self.section, question_text='Scope?', order=1)
+
+    def test_schema_is_served_from_cache(self):
+        first = self.client.get(self.url, {'iso_standard': ISOStandard.ISO_9001})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.data['results'][0]['sections'][0]['questions'][0]['question_text'], 'Scope?')
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url, {'iso_standard': ISOStandard.ISO_9001})
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_unchanged_schema_is_not_modified(self):
+        etag = self.client.get(f'{self.url}{self.form_template.id}/')['ETag']
+
+        response = self.client.get(f'{self.url}{self.form_template.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_question_change_invalidates_schema(self):
+        first = self.client.get(f'{self.url}{self.form_template.id}/')
+
+        self.question.question_text = 'Scope of certification?'
+        self.question.save()
+
+        second = self.client.get(f'{self.url}{self.form_template.id}/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second['ETag'], first['ETag'])
+        self.assertEqual(second.data['sections'][0]['questions'][0]['question_text'], 'Scope of certification?')
+
+    def test_inactive_template_is_not_found(self):
+        url = f'{self.url}{self.form_template.id}/'
+        etag = self.client.get(url)['ETag']
+        FormTemplate.objects.filter(pk=self.form_template.pk).update(is_active=False)
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 404)
+        self.assertEqual(self.client.get(f'{self.url}not-a-uuid/').status_code, 404)
+
+    def test_every_query_param_names_the_list(self):
+        first = self.client.get(self.url, {'iso_standard': ISOStandard.ISO_9001})
+        second = self.client.get(self.url, {'iso_standard': ISOStandard.ISO_9001, 'page_size': 5})
+
+        self.assertNotEqual(second['ETag'], first['ETag'])
+
+
+class SubmissionExportTests(TestCase):
+    url = '/api/forms/admin/submissions/export/'
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user('admin', is_staff=True))
+        self.form_template = FormTemplate.objects.create(
+            name='ISO 9001 Assessment',
+            iso_standard=ISOStandard.ISO_9001,
+        )
+        section = FormSection.objects.create(form_template=self.form_template, title='General')
+        self.scope = FormQuestion.objects.create(section=section, question_text='Scope', order=1)
+        self.sites = FormQuestion.objects.create(
+            section=section, question_text='Sites', question_type=QuestionType.CHECKBOX, order=2
+        )
+
+        self.answered = create_submission(self.form_template, company_name='Acme')
+        FormAnswer.objects.create(submission=self.answered, question=self.sites, answer_json=['tirana', 'durres'])
+        FormAnswer.objects.create(submission=self.answered, question=self.scope, answer_text='Manufacturing')
+        self.unanswered = create_submission(self.form_template, company_name='Beta')
+
+    def export(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        content = b''.join(response.streaming_content).decode()
+        return list(csv.reader(content.splitlines()))
+
+    def test_summary_export(self):
+        rows = self.export(ordering='submitted_at')
+
+        self.assertEqual(rows[0][:2], ['Submission Number', 'Form Name'])
+        self.assertEqual([row[0] for row in rows[1:]], [
+            self.answered.submission_number, self.unanswered.submission_number
+        ])
+
+    def test_wide_export_pivots_answers(self):
+        rows = self.export(layout='wide', ordering='submitted_at')
+
+        self.assertEqual(rows[0][-2:], ['Scope', 'Sites'])
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[1][-2:], ['Manufacturing', 'tirana, durres'])
+        self.assertEqual(rows[2][-2:], ['', ''])
+
+    def test_unknown_layout_is_rejected(self):
+        response = self.client.get(self.url, {'layout': 'pivot'})
+        self.assertEqual(response.status_code, 400)
+
+
+class SubmissionStatsTests(TestCase):
+    def setUp(self):
+        self.quality = FormTemplate.objects.create(name='ISO 9001 Assessment', iso_standard=ISOStandard.ISO_9001)
+        self.safety = FormTemplate.objects.create(name='ISO 45001 Assessment', iso_standard=ISOStandard.ISO_45001)
+
+    def assertStatsMatchRebuild(self):
+        live = list(SubmissionStats.objects.filter(count__gt=0).values_list(
+            'form_template_id', 'iso_standard', 'status', 'day', 'count'
+        ).order_by('form_template_id', 'status'))
+        rebuild_submission_stats()
+        rebuilt = list(SubmissionStats.objects.values_list(
+            'form_template_id', 'iso_standard', 'status', 'day', 'count'
+        ).order_by('form_template_id', 'status'))
+        self.assertEqual(live, rebuilt)
+
+    def test_rollup_follows_submissions(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = create_submission(self.quality)
+            create_submission(self.quality)
+            create_submission(self.safety)
+
+            first.status = FormSubmission.SubmissionStatus.APPROVED
+            first.save()
+
+        totals = get_submission_totals()
+        self.assertEqual(totals['total_submissions'], 3)
+        self.assertEqual(totals['pending_submissions'], 2)
+        self.assertEqual(totals['submissions_by_standard'], [
+            {'form_template__iso_standard': ISOStandard.ISO_9001, 'count': 2},
+            {'form_template__iso_standard': ISOStandard.ISO_45001, 'count': 1},
+        ])
+        self.assertStatsMatchRebuild()
+
+    def test_deleted_submission_is_removed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            submission = create_submission(self.quality)
+            FormSubmission.objects.get(pk=submission.pk).delete()
+
+        self.assertEqual(get_submission_totals()['total_submissions'], 0)
+        self.assertStatsMatchRebuild()
+
+    def test_bucket_is_counted_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            create_submission(self.quality)
+            self.assertFalse(SubmissionStats.objects.exists())
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(get_submission_totals()['total_submissions'], 1)
+
+    def test_template_list_counts(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_submission(self.quality)
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create_user('admin', is_staff=True))
+
+        response = client.get('/api/forms/admin/templates/', {'iso_standard': ISOStandard.ISO_9001})
+        self.assertEqual(response.data['results'][0]['total_submissions'], 1)
+
+
+class CloneTemplateTreeTests(TestCase):
+    def create_form(self, question_count):
+        form_template = FormTemplate.objects.create(
+            name='ISO 27001 Assessment',
+            name_it='Valutazione ISO 27001',
+            iso_standard=ISOStandard.ISO_27001,
+        )
+        section = FormSection.objects.create(form_template=form_template, title='Context', title_it='Contesto')
+        questions = FormQuestion.objects.bulk_create([
+            FormQuestion(
+                section=section,
+                question_text=f'Question {order}',
+                question_text_it=f'Domanda {order}',
+                order=order,
+            )
+            for order in range(question_count)
+        ])
+        return form_template, questions
+
+    def test_clone_copies_tree_and_translations(self):
+        form_template, questions = self.create_form(2)
+        questions[1].conditional_logic = {'question_id': str(questions[0].id), 'operator': 'equals', 'value': 'yes'}
+        questions[1].save()
+
+        clone = clone_template_tree(form_template, name='Copy', is_active=False)
+
+        self.assertEqual((clone.name, clone.name_it, clone.is_active), ('Copy', 'Valutazione ISO 27001', False))
+        section = clone.sections.get()
+        self.assertEqual(section.title_it, 'Contesto')
+        copied = list(section.questions.order_by('order'))
+        self.assertEqual([q.question_text_it for q in copied], ['Domanda 0', 'Domanda 1'])
+        self.assertEqual(copied[1].conditional_logic['question_id'], str(copied[0].id))
+
+    def test_query_count_does_not_grow_with_form_size(self):
+        counts = []
+        for question_count in (3, 60):
+            form_template, _ = self.create_form(question_count)
+            with CaptureQueriesContext(connection) as queries:
+                clone_template_tree(form_template, name='Copy')
+            counts.append(len(queries))
+
+        self.assertEqual(counts[0], counts[1])
+
+
+class FixtureSyncTests(TestCase):
+    OPTIONS = [{'value': 'yes', 'label': 'Yes'}]
+
+    def fixture(self, question_text='Is there a policy?'):
+        return {
+            'ISO_9001': {
+                'name': 'ISO 9001 Checklist',
+                'name_sq': 'Lista ISO 9001',
+                'description': 'Quality',
+                'description_sq': 'Cilesia',
+                'sections': [{
+                    'title': 'Context',
+                    'title_sq': 'Konteksti',
+                    'questions': [
+                        {'q': question_text, 'q_sq': 'A ka politike?'},
+                        {'q': 'Are risks assessed?', 'q_sq': 'A vleresohen rreziqet?'},
+                    ],
+                }],
+            },
+        }
+
+    def test_second_sync_changes_nothing(self):
+        first = sync_forms(self.fixture(), self.OPTIONS)
+        self.assertEqual(first.counts['questions']['created'], 2)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = sync_forms(self.fixture(), self.OPTIONS)
+
+        self.assertFalse(second.changed)
+        self.assertEqual(second.counts['questions']['unchanged'], 2)
+        self.assertEqual(len(queries), 3)
+
+    def test_changed_fixture_value_is_updated_in_place(self):
+        sync_forms(self.fixture(), self.OPTIONS)
+        question_ids = set(FormQuestion.objects.values_list('id', flat=True))
+
+        report = sync_forms(self.fixture('Is there a quality policy?'), self.OPTIONS)
+
+        self.assertEqual(report.counts['questions']['updated'], 1)
+        self.assertEqual(report.counts['questions']['unchanged'], 1)
+        self.assertEqual(set(FormQuestion.objects.values_list('id', flat=True)), question_ids)
+        self.assertTrue(FormQuestion.objects.filter(question_text='Is there a quality policy?').exists())
+
+    def test_reordered_questions_keep_their_rows(self):
+        sync_forms(self.fixture(), self.OPTIONS)
+        first, second = FormQuestion.objects.order_by('order')
+        FormQuestion.objects.filter(pk=first.pk).update(order=2)
+        FormQuestion.objects.filter(pk=second.pk).update(order=1)
+
+        report = sync_forms(self.fixture(), self.OPTIONS)
+
+        self.assertFalse(report.changed)
+        self.assertEqual(FormQuestion.objects.get(pk=first.pk).question_text, 'Is there a policy?')
+
+    def test_answered_question_is_not_rewritten(self):
+        sync_forms(self.fixture(), self.OPTIONS)
+        question = FormQuestion.objects.get(order=1)
+        FormAnswer.objects.create(
+            submission=create_submission(question.section.form_template), question=question, answer_text='yes'
+        )
+
+        report = sync_forms(self.fixture('Is there a quality policy?'), self.OPTIONS)
+
+        self.assertEqual(report.counts['questions']['skipped'], 1)
+        self.assertFalse(report.changed)
+        question.refresh_from_db()
+        self.assertEqual(question.question_text, 'Is there a policy?')
+
+    def test_dry_run_writes_nothing(self):
+        report = sync_forms(self.fixture(), self.OPTIONS, dry_run=True)
+
+        self.assertTrue(report.changed)
+        self.assertFalse(FormTemplate.objects.exists())
+
+
+class UpdateItalianFormsTests(TestCase):
+    def test_second_run_writes_nothing(self):
+        form_template = FormTemplate.objects.create(
+            name='ISO 9001 Application', iso_standard=ISOStandard.ISO_9001, form_type='application'
+        )
+        section = FormSection.objects.create(form_template=form_template, title='Planning')
+        FormQuestion.objects.create(section=section, question_text='Is there a plan?', options=[{'value': 'yes'}])
+
+        call_command('update_italian_forms', stdout=StringIO())
+        form_template.refresh_from_db()
+        updated_at = form_template.updated_at
+        self.assertEqual(FormSection.objects.get().title_it, 'Pianificazione')
+
+        with CaptureQueriesContext(connection) as queries:
+            call_command('update_italian_forms', stdout=StringIO())
+
+        form_template.refresh_from_db()
+        self.assertEqual(form_template.updated_at, updated_at)
+        self.assertFalse([q for q in queries if not q['sql'].startswith('SELECT')])
+
+    def test_seeded_forms_converge(self):
+        call_command('seed_iso_forms', forms=['ISO_9001', 'HACCP'], stdout=StringIO())
+        updated_at = dict(FormTemplate.objects.values_list('pk', 'updated_at'))
+
+        call_command('update_italian_forms', stdout=StringIO())
+        out = StringIO()
+        call_command('seed_iso_forms', forms=['ISO_9001', 'HACCP'], stdout=out)
+
+        self.assertIn('Forms already match the fixture', out.getvalue())
+        self.assertEqual(dict(FormTemplate.objects.values_list('pk', 'updated_at')), updated_at)
+
+
+class ConcurrentSubmissionNumberTests(TransactionTestCase):
+    THREADS = 8
+    PER_THREAD = 10
+
+    def setUp(self):
+        self.form_template = FormTemplate.objects.create(
+            name='ISO 9001 Assessment',
+            iso_standard=ISOStandard.ISO_9001,
+        )
+
+    def run_in_parallel(self, target):
+        barrier = threading.Barrier(self.THREADS)
+        errors = []
+
+        def worker():
+            try:
+                barrier.wait()
+                for _ in range(self.PER_THREAD):
+                    target()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return errors
+
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_parallel_allocation_has_no_duplicates(self):
+        day = date(2025, 1, 1)
+        numbers = []
+
+        errors = self.run_in_parallel(lambda: numbers.append(SubmissionCounter.allocate(day)))
+
+        self.assertEqual(errors, [])
+        self.assertEqual(sorted(numbers), list(range(1, self.THREADS * self.PER_THREAD + 1)))
+
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_parallel_submissions_get_unique_numbers(self):
+        errors = self.run_in_parallel(lambda: create_submission(self.form_template))
+
+        self.assertEqual(errors, [])
+        numbers = list(FormSubmission.objects.values_list('submission_number', flat=True))
+        self.assertEqual(len(numbers), self.THREADS * self.PER_THREAD)
+        self.assertEqual(len(set(numbers)), len(numbers))
@@ -0,0 +1,220 @@
+"""
+Compiled Validation Plans
+
+A form template's active questions are compiled once into a ValidationPlan:
+one rule per question with its type check, option values and numeric or
+length bounds already worked out, plus the question's conditional_logic.
+Submissions then validate against the plan instead of re-reading every
+question's JSON settings.
+
+Plans are cached per process and keyed by the template's updated_at, which
+signals.py bumps whenever one of its sections or questions changes.
+"""
+
+import logging
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import validate_email
+
+from .models import FormQuestion, QuestionType
+
+logger = logging.getLogger(__name__)
+
+_plans = {}
+
+
+def get_validation_plan(form_template):
+    """Return the compiled plan for form_template, compiling it if stale"""
+    plan = _plans.get(form_template.pk)
+    if plan is None or plan.version != form_template.updated_at:
+        plan = ValidationPlan.compile(form_template)
+        _plans[form_template.pk] = plan
+    return plan
+
+
+def _answer_values(answer):
+    """Selected values of an answer as strings, for condition checks"""
+    if answer is None:
+        return []
+    value = answer.get('answer_json')
+    if value is None:
+        value = answer.get('answer_text', '')
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    if value in ('', None):
+        return []
+    return [str(value)]
+
+
+def _expected_values(expected):
+    if isinstance(expected, list):
+        return {str(v) for v in expected}
+    return {str(expected)}
+
+
+# Each operator gets the answer's values and the condition's "value"
+CONDITION_OPERATORS = {
+    'equals': lambda values, expected: values == [str(expected)],
+    'not_equals': lambda values, expected: values != [str(expected)],
+    'contains': lambda values, expected: any(str(expected) in value for value in values),
+    'not_contains': lambda values, expected: not any(str(expected) in value for value in values),
+    'in': lambda values, expected: bool(_expected_values(expected).intersection(values)),
+    'not_in': lambda values, expected: not _expected_values(expected).intersection(values),
+    'is_empty': lambda values, expected: not values,
+    'is_not_empty': lambda values, expected: bool(values),
+}
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _option_values(options):
+    if not isinstance(options, list):
+        return None
+    values = frozenset(
+        opt.get('value') for opt in options
+        if isinstance(opt, dict) and not isinstance(opt.get('value'), (list, dict))
+    )
+    return values or None
+
+
+class QuestionRule:
+    """Precomputed checks for one question"""
+
+    def __init__(self, question):
+        rules = question.validation_rules if isinstance(question.validation_rules, dict) else {}
+
+        self.question_id = str(question.id)
+        self.question_type = question.question_type
+        self.minimum = _number(rules.get('min'))
+        self.maximum = _number(rules.get('max'))
+        self.min_length = _number(rules.get('min_length'))
+        self.max_length = _number(rules.get('max_length'))
+        self.choices = _option_values(question.options)
+        self.condition = self._compile_condition(question.conditional_logic)
+
+    def _compile_condition(self, logic):
+        """(source question id, operator, value), or None if always shown"""
+        if not isinstance(logic, dict) or not logic.get('question_id'):
+            return None
+        operator = logic.get('operator', 'equals')
+        test = CONDITION_OPERATORS.get(operator)
+        if test is None:
+            logger.warning(f"Question {self.question_id} has unknown condition operator '{operator}'")
+            return None
+        return str(logic['question_id']), test, logic.get('value')
+
+    def check(self, answer):
+        """Return an error message for the answer, or None if it is valid"""
+        answer_text = answer.get('answer_text', '')
+        answer_json = answer.get('answer_json')
+
+        if self.question_type == QuestionType.EMAIL:
+            if answer_text:
+                try:
+                    validate_email(answer_text)
+                except DjangoValidationError:
+                    return 'Invalid email address'
+
+        elif self.question_type == QuestionType.NUMBER:
+            if answer_text:
+                num = _number(answer_text)
+                if num is None:
+                    return 'Must be a valid number'
+                if self.minimum is not None and num < self.minimum:
+                    return f'Value must be at least {self.minimum:g}'
+                if self.maximum is not None and num > self.maximum:
+                    return f'Value must be at most {self.maximum:g}'
+
+        elif self.question_type in (QuestionType.TEXT, QuestionType.TEXTAREA):
+            if answer_text:
+                if self.min_length is not None and len(answer_text) < self.min_length:
+                    return f'Must be at least {self.min_length:g} characters'
+                if self.max_length is not None and len(answer_text) > self.max_length:
+                    return f'Must be at most {self.max_length:g} characters'
+
+        elif self.question_type in (QuestionType.SELECT, QuestionType.RADIO):
+            if answer_text and self.choices and answer_text not in self.choices:
+                return 'Invalid selection'
+
+        elif self.question_type == QuestionType.CHECKBOX:
+            if answer_json and self.choices and isinstance(answer_json, list):
+                for val in answer_json:
+                    if isinstance(val, (list, dict)) or val not in self.choices:
+                        return f'Invalid selection: {val}'
+
+        return None
+
+
+class ValidationPlan:
+    """The compiled rules of every active question on a form template"""
+
+    def __init__(self, version, rules):
+        self.version = version
+        self.rules = rules
+
+    @classmethod
+    def compile(cls, form_template):
+        questions = FormQuestion.objects.filter(
+            section__form_template=form_template,
+            section__is_active=True,
+            is_active=True
+        ).only(
+            'id', 'question_type', 'options', 'validation_rules', 'conditional_logic'
+        ).order_by('section__order', 'order')
+
+        rules = {}
+        for question in questions:
+            rule = QuestionRule(question)
+            rules[rule.question_id] = rule
+        return cls(form_template.updated_at, rules)
+
+    def validate(self, answers):
+        """
+        Check a submission's answers against the plan.
+
+        Returns (errors, accepted): errors maps question IDs to messages, and
+        accepted maps question IDs to the answers to store. Answers to
+        questions that are not on the form, or are hidden by their
+        conditional_logic, are left out rather than validated.
+        """
+        # The last answer to a question wins
+        answer_map = {str(answer['question_id']): answer for answer in answers}
+        visibility = {}
+        errors = {}
+        accepted = {}
+
+        for question_id, answer in answer_map.items():
+            rule = self.rules.get(question_id)
+            if rule is None or not self._is_visible(question_id, answer_map, visibility):
+                continue
+            error = rule.check(answer)
+            if error:
+                errors[question_id] = error
+            else:
+                accepted[question_id] = answer
+
+        return errors, accepted
+
+    def _is_visible(self, question_id, answer_map, visibility, chain=()):
+        if question_id in visibility:
+            return visibility[question_id]
+
+        condition = self.rules[question_id].condition
+        visible = True
+        if condition is not None:
+            source_id, test, expected = condition
+            # Conditions on questions that are not on the form, or that loop
+            # back to this one, are ignored
+            if source_id in self.rules and source_id not in chain and source_id != question_id:
+                visible = (
+                    self._is_visible(source_id, answer_map, visibility, chain + (question_id,))
+                    and test(_answer_values(answer_map.get(source_id)), expected)
+                )
+
+        visibility[question_id] = visible
+        return visible
@@ -1,17 +1,25 @@
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser, AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.views import APIView
+from rest_framework.utils.encoders import JSONEncoder
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Prefetch
-from django.core.mail import send_mail
+from django.db.models import Prefetch
 from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
+from apps.outbox.mail import enqueue_mail
+import json
 import logging
 
+from .cache import get_schema_payload, schema_etag, schema_version
+from .export import LAYOUTS, submissions_csv_response
+from .stats import annotate_template_counts, get_submission_totals, get_template_totals
+from .template_tree import clone_template_tree
 from .models import (
     FormTemplate, FormSection, FormQuestion,
     FormSubmission, FormAnswer, FormSubmissionLog,
@@ -40,10 +48,7 @@ class FormTemplateViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
 
     def get_queryset(self):
-        return FormTemplate.objects.annotate(
-            questions_count=Count('sections__questions', distinct=True),
-            submissions_count=Count('submissions', distinct=True)
-        ).prefetch_related(
+        return annotate_template_counts(FormTemplate.objects.all()).prefetch_related(
             Prefetch(
                 'sections',
                 queryset=FormSection.objects.order_by('order').prefetch_related(
@@ -67,50 +72,14 @@ class FormTemplateViewSet(viewsets.ModelViewSet):
         """Duplicate a form template with all its sections and questions"""
         original = self.get_object()
 
-        # Create new template
-        new_template = FormTemplate.objects.create(
+        new_template = clone_template_tree(
+            original,
             name=f"{original.name} (Copy)",
             name_sq=f"{original.name_sq} (Kopje)" if original.name_sq else '',
-            description=original.description,
-            description_sq=original.description_sq,
-            iso_standard=original.iso_standard,
-            form_type=original.form_type,
+            name_it=f"{original.name_it} (Copia)" if original.name_it else '',
             is_active=False,  # Start as inactive
-            is_public=original.is_public,
-            requires_auth=original.requires_auth,
-            allow_multiple_submissions=original.allow_multiple_submissions,
-            send_confirmation_email=original.send_confirmation_email,
-            notification_emails=original.notification_emails
         )
 
-        # Duplicate sections and questions
-        for section in original.sections.all():
-            new_section = FormSection.objects.create(
-                form_template=new_template,
-                title=section.title,
-                title_sq=section.title_sq,
-                description=section.description,
-                description_sq=section.description_sq,
-                order=section.order,
-                is_active=section.is_active
-            )
-
-            for question in section.questions.all():
-                FormQuestion.objects.create(
-                    section=new_section,
-                    question_text=question.question_text,
-                    question_text_sq=question.question_text_sq,
-                    help_text=question.help_text,
-                    help_text_sq=question.help_text_sq,
-                    question_type=question.question_type,
-                    is_required=question.is_required,
-                    options=question.options,
-                    validation_rules=question.validation_rules,
-                    conditional_logic=question.conditional_logic,
-                    order=question.order,
-                    is_active=question.is_active
-                )
-
         serializer = FormTemplateDetailSerializer(new_template)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -125,26 +94,8 @@ class FormTemplateViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        """Get form statistics"""
-        total_forms = FormTemplate.objects.count()
-        active_forms = FormTemplate.objects.filter(is_active=True).count()
-        total_submissions = FormSubmission.objects.count()
-        pending_submissions = FormSubmission.objects.filter(
-            status=FormSubmission.SubmissionStatus.PENDING
-        ).count()
-
-        # Submissions by ISO standard
-        by_standard = FormSubmission.objects.values(
-            'form_template__iso_standard'
-        ).annotate(count=Count('id')).order_by('-count')
-
-        return Response({
-            'total_forms': total_forms,
-            'active_forms': active_forms,
-            'total_submissions': total_submissions,
-            'pending_submissions': pending_submissions,
-            'submissions_by_standard': list(by_standard)
-        })
+        """Get form statistics (submission counts come from the SubmissionStats rollup)"""
+        return Response({**get_template_totals(), **get_submission_totals()})
 
 
 class FormSectionViewSet(viewsets.ModelViewSet):
@@ -247,36 +198,26 @@ class FormSubmissionViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def export(self, request):
-        """Export submissions as CSV (basic implementation)"""
-        import csv
-        from django.http import HttpResponse
-
-        submissions = self.filter_queryset(self.get_queryset())
-
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="submissions.csv"'
-
-        writer = csv.writer(response)
-        writer.writerow([
-            'Submission Number', 'Form Name', 'ISO Standard',
-            'Submitter Name', 'Email', 'Company', 'Status',
-            'Submitted At', 'Language'
-        ])
-
-        for sub in submissions:
-            writer.writerow([
-                sub.submission_number,
-                sub.form_template.name,
-                sub.form_template.iso_standard,
-                sub.submitter_name,
-                sub.submitter_email,
-                sub.company_name,
-                sub.status,
-                sub.submitted_at.isoformat(),
-                sub.language
-            ])
+        """
+        Export submissions as CSV, streamed while it is generated
 
-        return response
+        GET /api/forms/admin/submissions/export/?layout=wide
+        Headers: Authorization: Token <admin_token>
+
+        Accepts the list filters, search and ordering. layout=wide adds a
+        column per question with each submission's answers.
+        """
+        layout = request.query_params.get('layout', 'summary')
+        if layout not in LAYOUTS:
+            return Response(
+                {'error': f"layout must be one of: {', '.join(LAYOUTS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Not get_queryset(): the export reads plain columns, not the
+        # prefetched answers and logs
+        submissions = self.filter_queryset(FormSubmission.objects.all())
+        return submissions_csv_response(submissions, layout)
 
 
 # ============================================
@@ -287,6 +228,9 @@ class PublicFormViewSet(viewsets.ReadOnlyModelViewSet):
     """
     Public ViewSet for retrieving available forms.
     No authentication required.
+
+    Responses are served from the schema cache (see cache.py) with an ETag
+    derived from the schema version, so repeat visits are answered with 304.
     """
     permission_classes = [AllowAny]
     serializer_class = PublicFormTemplateSerializer
@@ -309,6 +253,21 @@ class PublicFormViewSet(viewsets.ReadOnlyModelViewSet):
             )
         )
 
+    def list(self, request, *args, **kwargs):
+        # Pagination links are absolute, so the host is part of the name
+        params = sorted(request.query_params.lists())
+        name = f'list:{request.build_absolute_uri("/")}:{params}'
+        parent = super()
+        return self._schema_response(request, name, lambda: parent.list(request, *args, **kwargs).data)
+
+    def retrieve(self, request, *args, **kwargs):
+        # Resolve the template before the ETag, so an unknown or deactivated
+        # one is a 404 rather than a 304 to a client holding an old ETag
+        get_object_or_404(FormTemplate, pk=kwargs['pk'], is_active=True, is_public=True)
+        name = f"template:{kwargs['pk']}"
+        parent = super()
+        return self._schema_response(request, name, lambda: parent.retrieve(request, *args, **kwargs).data)
+
     @action(detail=False, methods=['get'])
     def by_standard(self, request):
         """Get forms grouped by ISO standard"""
@@ -319,9 +278,26 @@ class PublicFormViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        forms = self.get_queryset().filter(iso_standard=standard)
-        serializer = self.get_serializer(forms, many=True)
-        return Response(serializer.data)
+        def build():
+            forms = self.get_queryset().filter(iso_standard=standard)
+            return self.get_serializer(forms, many=True).data
+
+        return self._schema_response(request, f'standard:{standard}', build)
+
+    def _schema_response(self, request, name, build):
+        version = schema_version()
+        etag = schema_etag(version, name)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is None:
+            # Cached as plain JSON data rather than DRF's ReturnDict/ReturnList
+            payload = get_schema_payload(version, name, lambda: json.loads(json.dumps(build(), cls=JSONEncoder)))
+            response = Response(payload)
+        else:
+            response = not_modified
+
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, no_cache=True)
+        return response
 
 
 class PublicFormSubmissionView(viewsets.GenericViewSet):
@@ -389,7 +365,7 @@ class PublicFormSubmissionView(viewsets.GenericViewSet):
         return Response({'has_submitted': exists})
 
     def _send_confirmation_email(self, submission):
-        """Send confirmation email to submitter"""
+        """Queue confirmation email to submitter"""
         try:
             subject = f"Form Submission Received - {submission.submission_number}"
 
@@ -409,19 +385,17 @@ Best regards,
 MSC Certifications Team
             """
 
-            send_mail(
+            enqueue_mail(
                 subject=subject,
                 message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
                 recipient_list=[submission.submitter_email],
-                fail_silently=True
             )
-            logger.info(f"Confirmation email sent for submission {submission.submission_number}")
+            logger.info(f"Confirmation email queued for submission {submission.submission_number}")
         except Exception as e:
-            logger.error(f"Failed to send confirmation email: {str(e)}")
+            logger.error(f"Failed to queue confirmation email: {str(e)}")
 
     def _send_admin_notification(self, submission):
-        """Send notification email to admin"""
+        """Queue notification email to admin"""
         try:
             emails = [
                 e.strip()
@@ -452,16 +426,14 @@ Submitted at: {submission.submitted_at.strftime('%Y-%m-%d %H:%M:%S')}
 Please log in to the admin panel to review this submission.
             """
 
-            send_mail(
+            enqueue_mail(
                 subject=subject,
                 message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
                 recipient_list=emails,
-                fail_silently=True
             )
-            logger.info(f"Admin notification sent for submission {submission.submission_number}")
+            logger.info(f"Admin notification queued for submission {submission.submission_number}")
         except Exception as e:
-            logger.error(f"Failed to send admin notification: {str(e)}")
+            logger.error(f"Failed to queue admin notification: {str(e)}")
 
 
 class ApplyOnlineView(APIView):
@@ -545,12 +517,10 @@ Business Information:
 This application was submitted from the MSC Certifications website.
             """
 
-            send_mail(
+            enqueue_mail(
                 subject=admin_subject,
                 message=admin_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
                 recipient_list=['info@msc-cert.com'],
-                fail_silently=False
             )
 
             # Send confirmation to applicant
@@ -578,12 +548,10 @@ Email: info@msc-cert.com
 Phone: +355 67 206 3632
                 """
 
-                send_mail(
+                enqueue_mail(
                     subject=user_subject,
                     message=user_message,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
                     recipient_list=[applicant_email],
-                    fail_silently=True
                 )
 
             logger.info(f"Apply online form submitted by {applicant_email}")
@@ -672,12 +640,10 @@ This message was sent from the MSC Certifications website contact form.
             if isinstance(admin_emails, str):
                 admin_emails = [admin_emails]
 
-            send_mail(
+            enqueue_mail(
                 subject=admin_subject,
                 message=admin_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
                 recipient_list=admin_emails,
-                fail_silently=False
             )
 
             # Send confirmation to user
@@ -701,12 +667,10 @@ Email: info@msc-cert.com
 Phone: +355 67 206 3632
             """
 
-            send_mail(
+            enqueue_mail(
                 subject=user_subject,
                 message=user_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
                 recipient_list=[email],
-                fail_silently=True
             )
 
             logger.info(f"Contact form submitted by {email}")
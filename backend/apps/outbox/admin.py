@@ -0,0 +1,46 @@
+from django.contrib import admin
+from .mail import retry_emails
+from .models import OutboxEmail
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = [
+        'subject',
+        'recipient_list',
+        'status',
+        'attempts',
+        'run_after',
+        'sent_at',
+        'created_at'
+    ]
+    list_filter = ['status', 'created_at']
+    search_fields = ['subject', 'recipients', 'last_error']
+    readonly_fields = [
+        'subject',
+        'body',
+        'from_email',
+        'recipients',
+        'status',
+        'attempts',
+        'run_after',
+        'locked_at',
+        'last_error',
+        'sent_at',
+        'created_at',
+        'updated_at'
+    ]
+    actions = ['retry_emails_action']
+
+    def has_add_permission(self, request):
+        return False
+
+    def recipient_list(self, obj):
+        return ', '.join(obj.recipients)
+    recipient_list.short_description = 'Recipients'
+
+    def retry_emails_action(self, request, queryset):
+        """Admin action to requeue selected unsent emails immediately"""
+        count = retry_emails(queryset)
+        self.message_user(request, f'Requeued {count} email(s)')
+    retry_emails_action.short_description = 'Retry selected emails'
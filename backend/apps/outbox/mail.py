@@ -0,0 +1,144 @@
+"""
+Email Outbox
+
+enqueue_mail() is a drop-in replacement for send_mail() inside requests:
+it only stores the message, so the request does not wait on SMTP.
+`manage.py send_outbox` delivers queued messages in batches over a single
+reused backend connection, retrying failures with exponential backoff.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import OutboxEmail, OUTBOX_MAX_ATTEMPTS, OUTBOX_RETRY_DELAY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# SENDING rows older than this are assumed to belong to a dead worker
+OUTBOX_LOCK_TIMEOUT = timedelta(minutes=10)
+
+
+def enqueue_mail(subject, message, recipient_list, from_email=None):
+    """Queue an email for delivery by the outbox worker"""
+    recipients = [address for address in recipient_list if address]
+    if not recipients:
+        return None
+    return OutboxEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=recipients,
+    )
+
+
+def claim_emails(limit=50):
+    """Mark up to `limit` due emails as SENDING and return them"""
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=OutboxEmail.STATUS_PENDING, run_after__lte=now) |
+                Q(status=OutboxEmail.STATUS_SENDING, locked_at__lt=now - OUTBOX_LOCK_TIMEOUT)
+            )
+            .order_by('run_after')[:limit]
+        )
+        OutboxEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+            status=OutboxEmail.STATUS_SENDING,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+    for email in emails:
+        email.status = OutboxEmail.STATUS_SENDING
+        email.locked_at = now
+        email.attempts += 1
+    return emails
+
+
+def send_batch(limit=50):
+    """Claim and send one batch over a single connection; returns (sent, failed)"""
+    emails = claim_emails(limit)
+    if not emails:
+        return 0, 0
+
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        logger.error(f"Could not open email connection: {e}")
+        for email in emails:
+            _reschedule(email, e)
+        return 0, len(emails)
+
+    sent = failed = 0
+    try:
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                from_email=email.from_email,
+                to=email.recipients,
+                connection=connection,
+            )
+            try:
+                # A backend set to fail_silently reports a failure as 0 sent
+                if not message.send():
+                    raise RuntimeError('Email backend did not send the message')
+            except Exception as e:
+                logger.error(f"Failed to send outbox email {email.pk} to {email.recipients}: {e}")
+                _reschedule(email, e)
+                failed += 1
+                # The server may have dropped us; continue on a fresh connection
+                connection.close()
+                try:
+                    connection.open()
+                except Exception:
+                    pass  # send() will try to connect again for the next message
+                continue
+
+            email.status = OutboxEmail.STATUS_SENT
+            email.sent_at = timezone.now()
+            email.locked_at = None
+            email.last_error = ''
+            email.save(update_fields=['status', 'sent_at', 'locked_at', 'last_error', 'updated_at'])
+            sent += 1
+    finally:
+        connection.close()
+
+    logger.info(f"Outbox batch: {sent} sent, {failed} failed")
+    return sent, failed
+
+
+def purge_sent(days):
+    """Delete delivered emails older than `days` days"""
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = OutboxEmail.objects.filter(status=OutboxEmail.STATUS_SENT, sent_at__lt=cutoff).delete()
+    return deleted
+
+
+def retry_emails(queryset):
+    """Put failed emails back in the queue with a fresh attempt budget"""
+    return queryset.exclude(status=OutboxEmail.STATUS_SENT).update(
+        status=OutboxEmail.STATUS_PENDING,
+        attempts=0,
+        run_after=timezone.now(),
+        locked_at=None,
+    )
+
+
+def _reschedule(email, error):
+    email.last_error = str(error)
+    if email.attempts >= OUTBOX_MAX_ATTEMPTS:
+        email.status = OutboxEmail.STATUS_FAILED
+    else:
+        email.status = OutboxEmail.STATUS_PENDING
+        delay = OUTBOX_RETRY_DELAY_SECONDS * 2 ** (email.attempts - 1)
+        email.run_after = timezone.now() + timedelta(seconds=delay)
+    email.locked_at = None
+    email.save(update_fields=['status', 'run_after', 'locked_at', 'last_error', 'updated_at'])
@@ -0,0 +1,68 @@
+"""
+Management command to deliver queued outbox emails.
+Run with: python manage.py send_outbox
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from apps.outbox.mail import purge_sent, send_batch
+
+
+class Command(BaseCommand):
+    help = 'Sends queued emails in batches over a reused connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Send every email that is currently due, then exit',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Number of emails sent per connection (default: 50)',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=5,
+            help='Seconds to wait when the outbox is empty (default: 5)',
+        )
+        parser.add_argument(
+            '--purge-days',
+            type=int,
+            default=30,
+            help='Delete sent emails older than this many days (default: 30, 0 keeps them)',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        total_sent = total_failed = 0
+
+        if options['purge_days']:
+            purged = purge_sent(options['purge_days'])
+            if purged:
+                self.stdout.write(f'Purged {purged} sent email(s)')
+
+        if not options['once']:
+            self.stdout.write('Outbox worker started, waiting for emails...')
+
+        try:
+            while True:
+                sent, failed = send_batch(batch_size)
+                total_sent += sent
+                total_failed += failed
+
+                if sent or failed:
+                    self.stdout.write(f'  Sent {sent} email(s), {failed} failed')
+                elif options['once']:
+                    break
+                else:
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Sent {total_sent} email(s), {total_failed} failed'
+        ))
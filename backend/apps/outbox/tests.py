@@ -0,0 +1,77 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.db import transaction
+from django.test import TestCase
+from django.utils import timezone
+
+from .mail import OUTBOX_LOCK_TIMEOUT, claim_emails, enqueue_mail, send_batch
+from .models import OUTBOX_MAX_ATTEMPTS, OUTBOX_RETRY_DELAY_SECONDS, OutboxEmail
+
+
+class EnqueueMailTests(TestCase):
+    def test_blank_recipients_are_dropped(self):
+        email = enqueue_mail('Hello', 'Body', ['client@example.com', ''])
+
+        self.assertEqual(email.recipients, ['client@example.com'])
+        self.assertIsNone(enqueue_mail('Hello', 'Body', ['']))
+
+    def test_email_is_only_queued_if_the_request_commits(self):
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                enqueue_mail('Hello', 'Body', ['client@example.com'])
+                raise ValueError('submission failed')
+
+        self.assertFalse(OutboxEmail.objects.exists())
+        self.assertEqual(mail.outbox, [])
+
+
+class SendBatchTests(TestCase):
+    def setUp(self):
+        self.email = enqueue_mail('Hello', 'Body', ['client@example.com'])
+
+    def test_batch_is_delivered_and_marked_sent(self):
+        self.assertEqual(send_batch(), (1, 0))
+
+        self.assertEqual([message.to for message in mail.outbox], [['client@example.com']])
+        self.email.refresh_from_db()
+        self.assertEqual((self.email.status, self.email.attempts), (OutboxEmail.STATUS_SENT, 1))
+        self.assertEqual(send_batch(), (0, 0))
+
+    def test_claim_skips_future_and_live_rows(self):
+        now = timezone.now()
+        OutboxEmail.objects.filter(pk=self.email.pk).update(run_after=now + timedelta(minutes=5))
+        stale = OutboxEmail.objects.create(
+            subject='Stale', body='Body', from_email='info@example.com', recipients=['a@example.com'],
+            status=OutboxEmail.STATUS_SENDING, locked_at=now - OUTBOX_LOCK_TIMEOUT - timedelta(minutes=1),
+        )
+        OutboxEmail.objects.create(
+            subject='Live', body='Body', from_email='info@example.com', recipients=['b@example.com'],
+            status=OutboxEmail.STATUS_SENDING, locked_at=now,
+        )
+
+        self.assertEqual([email.pk for email in claim_emails()], [stale.pk])
+        self.assertEqual(claim_emails(), [])
+
+    def test_unsent_message_is_retried_with_backoff(self):
+        # What a backend configured with fail_silently returns on failure
+        with mock.patch.object(EmailMessage, 'send', return_value=0):
+            self.assertEqual(send_batch(), (0, 1))
+
+        self.email.refresh_from_db()
+        self.assertEqual((self.email.status, self.email.attempts), (OutboxEmail.STATUS_PENDING, 1))
+        self.assertTrue(self.email.last_error)
+        delay = (self.email.run_after - timezone.now()).total_seconds()
+        self.assertAlmostEqual(delay, OUTBOX_RETRY_DELAY_SECONDS, delta=5)
+
+    def test_email_fails_after_max_attempts(self):
+        OutboxEmail.objects.filter(pk=self.email.pk).update(attempts=OUTBOX_MAX_ATTEMPTS - 1)
+
+        with mock.patch.object(EmailMessage, 'send', side_effect=OSError('connection refused')):
+            send_batch()
+
+        self.email.refresh_from_db()
+        self.assertEqual(self.email.status, OutboxEmail.STATUS_FAILED)
+        self.assertEqual(self.email.last_error, 'connection refused')
@@ -46,6 +46,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Third-party apps
     'rest_framework',
@@ -59,6 +60,8 @@ INSTALLED_APPS = [
     'apps.accounts',
     'apps.forms',
     'apps.blog',
+    'apps.outbox',
+    'apps.analytics',
 ]
 
 MIDDLEWARE = [
@@ -163,6 +166,9 @@ MEDIA_ROOT.mkdir(exist_ok=True)
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Tests write media, cache entries and PDFs to a temporary directory
+TEST_RUNNER = 'backend.test_runner.TempDirTestRunner'
+
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
 
@@ -192,6 +198,61 @@ REST_FRAMEWORK = {
 # Frontend URL (used for QR code generation)
 FRONTEND_URL = os.environ.get('FRONTEND_URL', 'http://localhost:3000')
 
+# Cache configuration
+# The file-based cache is shared by all gunicorn workers on the host.
+# Point CACHE_BACKEND/CACHE_LOCATION at Redis or Memcached when available.
+CACHE_DIR = BASE_DIR / 'cache'
+CACHE_DIR.mkdir(exist_ok=True)
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', str(CACHE_DIR / 'django')),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 10000)),
+        },
+    }
+}
+
+# Public certificate verification cache (seconds)
+CERTIFICATE_VERIFY_CACHE_TIMEOUT = int(os.environ.get('CERTIFICATE_VERIFY_CACHE_TIMEOUT', 3600))
+
+# Rendered certificate PDF cache (on disk, LRU-trimmed to the size cap)
+CERTIFICATE_PDF_CACHE_DIR = CACHE_DIR / 'certificate_pdfs'
+CERTIFICATE_PDF_CACHE_MAX_BYTES = int(os.environ.get('CERTIFICATE_PDF_CACHE_MAX_MB', 500)) * 1024 * 1024
+
+# Processes in the PDF render pool; each web or command process starts at
+# most one pool, shared by all its large batches (exports, render_certificate_pdfs)
+CERTIFICATE_PDF_RENDER_WORKERS = int(os.environ.get('CERTIFICATE_PDF_RENDER_WORKERS', 2))
+
+# Generate QR codes and pre-render PDFs in `manage.py run_artifact_worker`
+# instead of during the request that saves the certificate
+CERTIFICATE_ARTIFACTS_ASYNC = os.environ.get('CERTIFICATE_ARTIFACTS_ASYNC', 'False') == 'True'
+
+# Largest file the bulk import endpoint accepts while QR codes are generated
+# in the request (CERTIFICATE_ARTIFACTS_ASYNC off); bigger files go through
+# `manage.py import_certificates`
+CERTIFICATE_IMPORT_SYNC_LIMIT = int(os.environ.get('CERTIFICATE_IMPORT_SYNC_LIMIT', 200))
+
+# Seconds between in-process certificate status sweeps (0 = disabled, use
+# `manage.py sweep_certificate_status` from cron instead)
+CERTIFICATE_STATUS_SWEEP_INTERVAL = int(os.environ.get('CERTIFICATE_STATUS_SWEEP_INTERVAL', 0))
+
+# Public form schema cache (seconds); entries are also dropped on every
+# template, section or question change
+FORMS_SCHEMA_CACHE_TIMEOUT = int(os.environ.get('FORMS_SCHEMA_CACHE_TIMEOUT', 86400))
+
+# Admin analytics results cache (seconds)
+ANALYTICS_CACHE_TIMEOUT = int(os.environ.get('ANALYTICS_CACHE_TIMEOUT', 300))
+
+# Seconds between in-process flushes of buffered blog view counts (0 = disabled,
+# use `manage.py flush_blog_views` from cron instead)
+BLOG_VIEW_FLUSH_INTERVAL = int(os.environ.get('BLOG_VIEW_FLUSH_INTERVAL', 60))
+
+# Public blog listing cache (seconds); entries are also dropped on every
+# post, category or tag change. Bounds how stale listed view counts get
+BLOG_CACHE_TIMEOUT = int(os.environ.get('BLOG_CACHE_TIMEOUT', 3600))
+
 # CORS settings - Configure specific origins in production
 CORS_ALLOWED_ORIGINS = os.environ.get(
     'CORS_ALLOWED_ORIGINS',
@@ -200,6 +261,9 @@ CORS_ALLOWED_ORIGINS = os.environ.get(
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Response headers the frontend may read
+CORS_EXPOSE_HEADERS = ['X-Canonical-Slug', 'X-Cache']
+
 # Email Configuration (SMTP)
 EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = os.environ.get('EMAIL_HOST', 'smtp.gmail.com')
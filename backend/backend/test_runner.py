@@ -0,0 +1,36 @@
+"""
+Test runner for backend project.
+
+Points MEDIA_ROOT, the cache and the certificate PDF cache at temporary
+directories for the duration of the run, so tests never write QR codes,
+PDFs or cache entries into the working tree.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TempDirTestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.temp_dir = Path(tempfile.mkdtemp(prefix='backend-tests-'))
+        self.temp_settings = override_settings(
+            MEDIA_ROOT=self.temp_dir / 'media',
+            CACHES={
+                'default': {
+                    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                    'LOCATION': str(self.temp_dir / 'cache'),
+                },
+            },
+            CERTIFICATE_PDF_CACHE_DIR=self.temp_dir / 'certificate_pdfs',
+        )
+        self.temp_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.temp_settings.disable()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
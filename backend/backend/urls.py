@@ -26,6 +26,7 @@ urlpatterns = [
     path('api/', include('apps.certificates.urls')),
     path('api/forms/', include('apps.forms.urls')),
     path('api/blog/', include('apps.blog.urls')),
+    path('api/analytics/', include('apps.analytics.urls')),
 ]
 
 # Serve media files - in production, use re_path for media serving
@@ -14,3 +14,13 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
 application = get_wsgi_application()
+
+# Optional periodic certificate status sweep (CERTIFICATE_STATUS_SWEEP_INTERVAL)
+from apps.certificates.status_sweep import start_scheduler  # noqa: E402
+
+start_scheduler()
+
+# Periodic flush of buffered blog view counts (BLOG_VIEW_FLUSH_INTERVAL)
+from apps.blog.view_counter import start_flusher  # noqa: E402
+
+start_flusher()
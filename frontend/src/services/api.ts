@@ -1,5 +1,5 @@
 import axios, { AxiosInstance } from 'axios';
-import type { Certificate } from '../types';
+import type { Certificate, CertificateSummary, PaginatedResponse } from '../types';
 
 // Use environment variable for API base URL
 // Falls back to relative /api path for production (nginx proxy)
@@ -32,6 +32,15 @@ export interface PublicCertificate {
   }>;
 }
 
+// Paging for dashboard lists: page numbers by default, or pagination: 'cursor'
+// and the cursor taken from the previous response's next/previous link
+interface DashboardListParams {
+  page?: number;
+  page_size?: number;
+  pagination?: 'cursor';
+  cursor?: string;
+}
+
 interface CertificateListResponse {
   results?: Certificate[];
   count?: number;
@@ -82,14 +91,24 @@ export const certificateService = {
   },
 
   // Get expiring soon
-  getExpiringSoon: async (): Promise<Certificate[]> => {
-    const response = await api.get<Certificate[]>('/certificates/expiring_soon/');
+  getExpiringSoon: async (
+    params?: DashboardListParams
+  ): Promise<PaginatedResponse<CertificateSummary>> => {
+    const response = await api.get<PaginatedResponse<CertificateSummary>>(
+      '/certificates/expiring_soon/',
+      { params }
+    );
     return response.data;
   },
 
   // Get maintenance due
-  getMaintenanceDue: async (): Promise<Certificate[]> => {
-    const response = await api.get<Certificate[]>('/certificates/maintenance_due/');
+  getMaintenanceDue: async (
+    params?: DashboardListParams
+  ): Promise<PaginatedResponse<CertificateSummary>> => {
+    const response = await api.get<PaginatedResponse<CertificateSummary>>(
+      '/certificates/maintenance_due/',
+      { params }
+    );
     return response.data;
   },
 
@@ -100,4 +119,52 @@ export const certificateService = {
   },
 };
 
+// Admin analytics: one count per bucket in every series array,
+// aligned with `buckets` (the start date of each day/week/month)
+export interface AnalyticsParams {
+  period?: 'day' | 'week' | 'month';
+  since?: string;
+  until?: string;
+}
+
+type AnalyticsSeries = Record<string, number[]>;
+
+export interface SubmissionAnalytics {
+  period: 'day' | 'week' | 'month';
+  since: string;
+  until: string;
+  buckets: string[];
+  total: number[];
+  by_iso_standard: AnalyticsSeries;
+  by_language: AnalyticsSeries;
+  by_status: AnalyticsSeries;
+  transitions: {
+    from: string[];
+    to: string[];
+    count: number[];
+    avg_seconds: number[];
+  };
+}
+
+export interface CertificateAnalytics {
+  period: 'day' | 'week' | 'month';
+  since: string;
+  until: string;
+  buckets: string[];
+  issued: AnalyticsSeries;
+  expiring: AnalyticsSeries;
+}
+
+export const analyticsService = {
+  getSubmissions: async (params?: AnalyticsParams): Promise<SubmissionAnalytics> => {
+    const response = await api.get<SubmissionAnalytics>('/analytics/submissions/', { params });
+    return response.data;
+  },
+
+  getCertificates: async (params?: AnalyticsParams): Promise<CertificateAnalytics> => {
+    const response = await api.get<CertificateAnalytics>('/analytics/certificates/', { params });
+    return response.data;
+  },
+};
+
 export default api;
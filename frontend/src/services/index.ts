@@ -1 +1 @@
-export { default as api, certificateService } from './api';
+export { default as api, analyticsService, certificateService } from './api';
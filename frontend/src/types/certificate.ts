@@ -19,6 +19,29 @@ export interface Certificate {
   is_maintenance_due: boolean;
 }
 
+// Lean certificate returned by dashboard lists (expiring_soon, maintenance_due)
+export interface CertificateSummary {
+  id: string | number;
+  certificate_number: string;
+  status: CertificateStatus;
+  status_display: string;
+  standard: string;
+  standard_display: string;
+  company_name: string;
+  expiry_date: string;
+  next_maintenance_date: string;
+  is_maintenance_due: boolean;
+  days_until_expiry: number | null;
+}
+
+// Paginated list response; count is omitted by cursor pagination
+export interface PaginatedResponse<T> {
+  count?: number;
+  next: string | null;
+  previous: string | null;
+  results: T[];
+}
+
 export type CertificateStatus = 'VALID' | 'EXPIRED' | 'SUSPENDED' | 'WITHDRAWN';
 
 export interface Site {
@@ -1 +1,8 @@
-export type { Certificate, CertificateStatus, Site, FAQ } from './certificate';
+export type {
+  Certificate,
+  CertificateSummary,
+  CertificateStatus,
+  PaginatedResponse,
+  Site,
+  FAQ,
+} from './certificate';